@@ -1,85 +1,50 @@
-from src.DMARTProject.components.data_ingestion_pipeline import DataIngestionPipeline
-from src.DMARTProject.components.data_validation import DataValidation
-from src.DMARTProject.components.data_cleaning import DataCleaning
-from src.DMARTProject.components.data_analysis import DataAnalysis
+from src.DMARTProject.pipelines.dag_pipeline import DAGPipeline, DAGPipelineConfig
+from src.DMARTProject.pipelines.etl_pipeline import ETLPipeline, ETLPipelineConfig
+from src.DMARTProject.pipelines.prediction_pipeline import PredictionPipeline
+from src.DMARTProject.pipelines.training_pipeline import TrainingPipeline
+from src.DMARTProject.utils.connection import build_database_url
+from src.DMARTProject.utils.instrumentation import InstrumentationConfig
 from src.DMARTProject.loggers.logger import logger
 from src.exception import CustomException
-from src.DMARTProject.components.datapersistence import DataPersistence
 
 
-from sqlalchemy import create_engine
-import pandas as pd
 import sys
-import os
-
-
-DATABASE_URL = (
-    "mssql+pyodbc://@DESKTOP-FS7EJOC\\SQLEXPRESS/DMART"
-    "?driver=ODBC+Driver+17+for+SQL+Server"
-    "&trusted_connection=yes"
-)
-
 
 
 if __name__ == "__main__":
     try:
         logger.info("DMART application started")
 
-        # ===============================
-        # STEP 1: DATA INGESTION
-        # ===============================
-        pipeline = DataIngestionPipeline()
-        raw_path, train_path, test_path = pipeline.initiate_data_ingestion()
-        logger.info("Data ingestion completed")
-
-        # ===============================
-        # STEP 2: DATA VALIDATION (CONFIG-DRIVEN)
-        # ===============================
-        validator = DataValidation()
-        validated_df = validator.validate()
-        logger.info("Data validation completed")
-
-        # ===============================
-        # STEP 3: DATA CLEANING
-        # ===============================
-        cleaner = DataCleaning(validated_df)
-        cleaned_df = cleaner.clean_data()
-        logger.info("Data cleaning completed")
-
-        # ===============================
-        # STEP 4: DATA ANALYSIS
-        # ===============================
-        analyzer = DataAnalysis(cleaned_df)
-        logger.info(f"EDA Metrics: {analyzer.basic_metrics()}")
-        analyzer.save_core_plots()
-        logger.info("EDA artifacts saved")
-
-        # ===============================
-        # STEP 5: SAVE CLEANED DATA
-        # ===============================
-        os.makedirs("artifacts", exist_ok=True)
-        cleaned_path = "artifacts/cleaned_data.csv"
-        cleaned_df.to_csv(cleaned_path, index=False)
-        logger.info(f"Cleaned data saved at {cleaned_path}")
-
-        
-        # 🔑 IMPORTANT: avoid PermissionError on Windows
-        if os.path.exists(cleaned_path):
-            os.remove(cleaned_path)
-
-        cleaned_df.to_csv(cleaned_path, index=False)
-        logger.info(f"Cleaned data saved at {cleaned_path}")
-
-        # ===============================
-        # STEP 6: WRITE TO SQL
-        # ===============================
-        persistence = DataPersistence(DATABASE_URL)
-        persistence.write_to_sql(cleaned_df, table_name="DMART_Cleaned")
-        
-        logger.info("Cleaned data written to SQL table")
-
-        persistence.call_stored_procedure("sp_InsertSalesData")
-        logger.info("Stored procedure executed successfully")
+        config = ETLPipelineConfig(
+            database_url=build_database_url(),
+            incremental="--incremental" in sys.argv,
+            export_csv="--export-csv" in sys.argv,
+            checkpoint="--checkpoint" in sys.argv,
+            persist_mode="merge" if "--merge" in sys.argv else "replace",
+            validation_on_error="quarantine" if "--quarantine" in sys.argv else "raise",
+            # One worker per core
+            parallel_workers=0 if "--parallel" in sys.argv else None,
+            deduplicate="--dedup" in sys.argv,
+            # Overlap EDA/KPI cube with the artifact and SQL writes
+            concurrent_branches="--concurrent" in sys.argv,
+            instrumentation=InstrumentationConfig(
+                prometheus_path="artifacts/metrics/dmart.prom" if "--prometheus" in sys.argv else None,
+                profile_dir="artifacts/metrics/profiles" if "--profile" in sys.argv else None,
+            ),
+        )
+        if "--train" in sys.argv:
+            # Loss-risk model from the train/test artifacts of the last ingestion
+            TrainingPipeline().run()
+        elif "--predict" in sys.argv:
+            # Batch-score the raw data artifact with the latest model
+            PredictionPipeline().run()
+        elif "--dag" in sys.argv:
+            # Stage graph: unchanged stages are skipped, failed runs resume
+            DAGPipeline(DAGPipelineConfig(etl=config)).run()
+        elif "--stream" in sys.argv:
+            ETLPipeline(config).run_streaming()
+        else:
+            ETLPipeline(config).run()
 
         logger.info("DMART application finished successfully")
     
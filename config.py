@@ -0,0 +1,74 @@
+"""
+Project configuration: schema registry for the DMART source tables.
+
+Each column declares its dtype, nullability, allowed values (domain) and
+valid range. Ingestion compiles these into explicit read-time dtypes
+(src/DMARTProject/utils/schema.py) and validation derives its rules from them.
+"""
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+
+@dataclass(frozen=True)
+class ColumnSpec:
+    name: str
+    # int32, int64, float32, float64, category, bool, datetime, string
+    dtype: str
+    nullable: bool = False
+    # Allowed values for category columns
+    domain: Optional[Tuple] = None
+    # Type of a category column's values (e.g. int64 for IDs), so they are
+    # the same whether read from SQL, Parquet/Arrow or parsed from CSV text;
+    # None: strings
+    value_dtype: Optional[str] = None
+    min_value: Optional[float] = None
+    max_value: Optional[float] = None
+    min_inclusive: bool = True
+    max_inclusive: bool = True
+    # Max characters of string/category values; sizes the SQL column
+    # (None: the domain's longest value, else an unbounded type)
+    max_length: Optional[int] = None
+
+
+@dataclass(frozen=True)
+class TableSchema:
+    name: str
+    columns: Tuple[ColumnSpec, ...]
+    key: Optional[str] = None
+
+    @property
+    def column_names(self) -> List[str]:
+        return [col.name for col in self.columns]
+
+    def column(self, name: str) -> ColumnSpec:
+        for col in self.columns:
+            if col.name == name:
+                return col
+        raise KeyError(f"Column {name} not in schema {self.name}")
+
+
+SALES_SCHEMA = TableSchema(
+    name="sales",
+    key="SalesID",
+    columns=(
+        ColumnSpec("SalesID", "int32"),
+        ColumnSpec("OrderID", "string"),
+        ColumnSpec("OrderDate", "datetime"),
+        ColumnSpec("ProductID", "category", value_dtype="int64"),
+        ColumnSpec("CustomerID", "category", value_dtype="int64"),
+        ColumnSpec("RegionID", "category", value_dtype="int64"),
+        ColumnSpec("ShipMode", "category", domain=("Economy", "Economy Plus", "Immediate", "Priority")),
+        ColumnSpec("Quantity", "int32", min_value=0, min_inclusive=False),
+        # Business-approved nulls: missing Discount = no discount applied
+        ColumnSpec("Discount", "float32", nullable=True, min_value=0, max_value=1),
+        ColumnSpec("SalesAmount", "float32", min_value=0, min_inclusive=False),
+        # Profit CAN be negative (losses allowed)
+        ColumnSpec("Profit", "float32", nullable=True),
+        ColumnSpec("LocationID", "category", value_dtype="int64"),
+        ColumnSpec("FeedbackProvided", "bool"),
+    ),
+)
+
+SCHEMA_REGISTRY: Dict[str, TableSchema] = {
+    SALES_SCHEMA.name: SALES_SCHEMA,
+}
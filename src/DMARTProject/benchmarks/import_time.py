@@ -0,0 +1,125 @@
+"""
+Import-time guard for the CLI entry points.
+
+    python -m src.DMARTProject.benchmarks.import_time
+    python -m src.DMARTProject.benchmarks.import_time --budget-ms 900 --modules app
+
+Each module is imported in a fresh interpreter under `python -X importtime`,
+from an empty working directory. The check fails (exit code 1) when an
+import pulls in a heavy optional dependency, writes anything to the working
+directory, or takes longer than the budget (median over --repeat runs).
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+# Loaded on first use only; importing any of them is a regression
+HEAVY_MODULES = ("sklearn", "scipy", "matplotlib", "seaborn", "sqlalchemy", "pyodbc", "dotenv")
+
+
+@dataclass
+class ImportTimeConfig:
+    modules: Tuple[str, ...] = ("app", "src.DMARTProject.pipelines.etl_pipeline")
+    # Median cumulative import time per module; pandas alone is ~0.4 s
+    budget_ms: float = 1000.0
+    repeat: int = 5
+    heavy_modules: Tuple[str, ...] = HEAVY_MODULES
+
+
+@dataclass
+class ImportTimeResult:
+    module: str
+    median_ms: float
+    # Top-level packages imported, with their cumulative time (ms)
+    packages: Dict[str, float] = field(default_factory=dict)
+    created_files: List[str] = field(default_factory=list)
+    errors: List[str] = field(default_factory=list)
+
+
+def _parse_importtime(stderr: str) -> Tuple[float, Dict[str, float]]:
+    """
+    Returns the cumulative time (ms) of the outermost import and the
+    cumulative time per top-level package.
+    """
+    total, packages = 0.0, {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        micros = int(cumulative)
+        name = name.rstrip()
+        # Nested imports are indented two spaces per level below the first
+        if len(name) - len(name.lstrip()) == 1:
+            total += micros / 1000
+        package = name.strip().split(".")[0]
+        packages[package] = max(packages.get(package, 0.0), micros / 1000)
+    return total, packages
+
+
+def measure(module: str, config: ImportTimeConfig = ImportTimeConfig()) -> ImportTimeResult:
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [REPO_ROOT, os.environ.get("PYTHONPATH")])))
+    timings, packages, created, errors = [], {}, [], []
+
+    for _ in range(config.repeat):
+        with tempfile.TemporaryDirectory() as cwd:
+            proc = subprocess.run(
+                [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                cwd=cwd, env=env, capture_output=True, text=True,
+            )
+            created = sorted(os.listdir(cwd))
+        if proc.returncode != 0:
+            errors.append(f"import failed: {proc.stderr.strip().splitlines()[-1]}")
+            break
+        total, packages = _parse_importtime(proc.stderr)
+        timings.append(total)
+
+    result = ImportTimeResult(
+        module=module,
+        median_ms=round(statistics.median(timings), 1) if timings else float("nan"),
+        packages=packages,
+        created_files=created,
+        errors=errors,
+    )
+    heavy = sorted(set(packages) & set(config.heavy_modules))
+    if heavy:
+        result.errors.append(f"imports heavy dependencies: {heavy}")
+    if created:
+        result.errors.append(f"creates files at import: {created}")
+    if timings and result.median_ms > config.budget_ms:
+        result.errors.append(f"median import time {result.median_ms} ms exceeds budget {config.budget_ms} ms")
+    return result
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Import-time regression check")
+    parser.add_argument("--modules", nargs="+", default=list(ImportTimeConfig.modules))
+    parser.add_argument("--budget-ms", type=float, default=ImportTimeConfig.budget_ms)
+    parser.add_argument("--repeat", type=int, default=ImportTimeConfig.repeat)
+    parser.add_argument("--top", type=int, default=8, help="slowest top-level packages to show")
+    args = parser.parse_args(argv)
+
+    config = ImportTimeConfig(modules=tuple(args.modules), budget_ms=args.budget_ms, repeat=args.repeat)
+    failed = False
+    for module in config.modules:
+        result = measure(module, config)
+        print(f"{module}: {result.median_ms} ms (median of {config.repeat}, budget {config.budget_ms} ms)")
+        slowest = sorted(result.packages.items(), key=lambda item: item[1], reverse=True)[:args.top]
+        for package, ms in slowest:
+            print(f"    {package:<24} {ms:>8.1f} ms")
+        for error in result.errors:
+            print(f"  FAIL {error}")
+        failed |= bool(result.errors)
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
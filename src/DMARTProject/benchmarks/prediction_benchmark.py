@@ -0,0 +1,190 @@
+"""
+Scoring benchmarks for the prediction pipeline on seeded synthetic data.
+
+    python -m src.DMARTProject.benchmarks.prediction_benchmark --rows 1e6
+    python -m src.DMARTProject.benchmarks.prediction_benchmark --batch-sizes 50000 250000 --latency-sizes 1 100
+
+Batch mode reports rows scored per second for each batch size (scoring
+only, and scoring plus the Parquet output); latency mode reports p50/p95/p99
+milliseconds per on-demand call for small batches. A model is trained on
+the synthetic data first when the benchmark model directory has none.
+Results are appended to artifacts/benchmarks/results.jsonl like the
+component benchmarks, so they can be compared across commits.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.DMARTProject.benchmarks.run_benchmarks import BenchmarkConfig, BenchmarkRunner, _git_revision
+from src.DMARTProject.components.model_trainer import ModelTrainer, ModelTrainerConfig, latest_model_info
+from src.DMARTProject.utils.artifacts import iter_artifact
+from src.DMARTProject.pipelines.prediction_pipeline import PredictionPipeline, PredictionPipelineConfig
+from src.DMARTProject.loggers.logger import logger
+from src.exception import CustomException
+
+
+@dataclass
+class PredictionBenchmarkConfig:
+    rows: int = 1_000_000
+    seed: int = 42
+    batch_sizes: Tuple[int, ...] = (10_000, 100_000, 250_000)
+    latency_sizes: Tuple[int, ...] = (1, 10, 100, 1000)
+    # Timed calls per latency batch size (after one warm-up call)
+    latency_repeat: int = 200
+    model_dir: str = "artifacts/benchmarks/model"
+    output_path: str = "artifacts/benchmarks/predictions.parquet"
+    results_path: str = BenchmarkConfig.results_path
+
+
+class PredictionBenchmark:
+    def __init__(self, config: PredictionBenchmarkConfig = PredictionBenchmarkConfig()):
+        self.config = config
+        self.runner = BenchmarkRunner(
+            BenchmarkConfig(rows=config.rows, seed=config.seed, results_path=config.results_path)
+        )
+        self.revision = _git_revision()
+
+    def prepare(self) -> str:
+        dataset = self.runner.prepare_dataset()
+        if latest_model_info(self.config.model_dir) is None:
+            # One quick candidate; the benchmark measures scoring, not accuracy
+            ModelTrainer(
+                ModelTrainerConfig(
+                    train_data_path=dataset,
+                    model_dir=self.config.model_dir,
+                    epochs=1,
+                    param_grid={"alpha": [1e-4], "penalty": ["l2"]},
+                    workers=1,
+                )
+            ).train()
+        return dataset
+
+    def _pipeline(self, dataset: str, batch_size: int, output_path: Optional[str]) -> PredictionPipeline:
+        return PredictionPipeline(
+            PredictionPipelineConfig(
+                model_dir=self.config.model_dir,
+                input_path=dataset,
+                batch_size=batch_size,
+                output_path=output_path,
+                instrumentation=self.runner.instrumentation.config,
+            )
+        )
+
+    def _record(self, component: str, **fields) -> Dict:
+        return {
+            **self.revision,
+            "recorded_at": datetime.now().isoformat(timespec="seconds"),
+            "component": component,
+            "rows": self.config.rows,
+            "seed": self.config.seed,
+            "python": sys.version.split()[0],
+            "pandas": pd.__version__,
+            "numpy": np.__version__,
+            "cpu_count": os.cpu_count(),
+            **fields,
+        }
+
+    def run_batch(self, dataset: str) -> List[Dict]:
+        results = []
+        for batch_size in self.config.batch_sizes:
+            for output_path in (None, self.config.output_path):
+                pipeline = self._pipeline(dataset, batch_size, output_path)
+                stats = pipeline.run()
+                metrics = pipeline.instrumentation.records[-1]
+                results.append(
+                    self._record(
+                        "prediction_write" if output_path else "prediction",
+                        mode="batch",
+                        batch_size=batch_size,
+                        wall_seconds=stats["seconds"],
+                        cpu_seconds=metrics.cpu_seconds,
+                        rows_per_sec=stats["rows_per_sec"],
+                        peak_rss_mb=metrics.peak_rss_mb,
+                    )
+                )
+        return results
+
+    def run_latency(self, dataset: str) -> List[Dict]:
+        pipeline = self._pipeline(dataset, max(self.config.latency_sizes), None)
+        sample = next(iter_artifact(dataset, chunksize=max(self.config.latency_sizes), schema=pipeline.schema))
+
+        results = []
+        for size in self.config.latency_sizes:
+            batch = sample.iloc[:size]
+            pipeline.predict(batch)
+            timings = np.empty(self.config.latency_repeat)
+            for i in range(self.config.latency_repeat):
+                started = time.perf_counter()
+                pipeline.predict(batch)
+                timings[i] = time.perf_counter() - started
+            p50, p95, p99 = np.percentile(timings * 1000, [50, 95, 99])
+            results.append(
+                self._record(
+                    "prediction_latency",
+                    mode="latency",
+                    batch_size=size,
+                    p50_ms=round(p50, 4),
+                    p95_ms=round(p95, 4),
+                    p99_ms=round(p99, 4),
+                    rows_per_sec=round(size / np.median(timings), 1),
+                )
+            )
+        return results
+
+    def run(self) -> List[Dict]:
+        try:
+            logger.info(f"Benchmarking prediction on {self.config.rows} rows")
+            dataset = self.prepare()
+            results = self.run_batch(dataset) + self.run_latency(dataset)
+
+            os.makedirs(os.path.dirname(self.config.results_path) or ".", exist_ok=True)
+            with open(self.config.results_path, "a") as fp:
+                for result in results:
+                    fp.write(json.dumps(result) + "\n")
+            logger.info(f"Prediction benchmark results appended to {self.config.results_path}")
+            return results
+
+        except Exception as e:
+            logger.exception("Prediction benchmark failed")
+            raise CustomException(e, sys)
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="DMART prediction throughput and latency benchmark")
+    parser.add_argument("--rows", type=float, default=PredictionBenchmarkConfig.rows)
+    parser.add_argument("--seed", type=int, default=PredictionBenchmarkConfig.seed)
+    parser.add_argument("--batch-sizes", nargs="+", type=int, default=list(PredictionBenchmarkConfig.batch_sizes))
+    parser.add_argument("--latency-sizes", nargs="+", type=int, default=list(PredictionBenchmarkConfig.latency_sizes))
+    parser.add_argument("--latency-repeat", type=int, default=PredictionBenchmarkConfig.latency_repeat)
+    args = parser.parse_args(argv)
+
+    config = PredictionBenchmarkConfig(
+        rows=int(args.rows),
+        seed=args.seed,
+        batch_sizes=tuple(args.batch_sizes),
+        latency_sizes=tuple(args.latency_sizes),
+        latency_repeat=args.latency_repeat,
+    )
+    for result in PredictionBenchmark(config).run():
+        if result["mode"] == "batch":
+            print(
+                f"{result['component']:<18} batch {result['batch_size']:>8} "
+                f"{result['rows_per_sec'] or 0:>14,.0f} rows/s {result['peak_rss_mb']:>9.1f} MB"
+            )
+        else:
+            print(
+                f"{result['component']:<18} batch {result['batch_size']:>8} "
+                f"p50 {result['p50_ms']:.3f} ms  p95 {result['p95_ms']:.3f} ms  p99 {result['p99_ms']:.3f} ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
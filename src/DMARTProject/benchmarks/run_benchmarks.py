@@ -0,0 +1,302 @@
+"""
+Component benchmarks on seeded synthetic sales data.
+
+    python -m src.DMARTProject.benchmarks.run_benchmarks --rows 1e6
+    python -m src.DMARTProject.benchmarks.run_benchmarks --rows 1e8 --components validation cleaning
+    python -m src.DMARTProject.benchmarks.run_benchmarks --compare
+
+Every run appends one JSON record per component (commit, rows, wall/CPU
+time, rows/s, peak RSS) to artifacts/benchmarks/results.jsonl, so the
+same benchmark can be compared across commits.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.DMARTProject.benchmarks.synthetic_data import SyntheticDataConfig, SyntheticSalesData
+from src.DMARTProject.components.analysis_stats import AnalysisStats
+from src.DMARTProject.components.data_analysis import DataAnalysis
+from src.DMARTProject.components.data_cleaning import DataCleaning
+from src.DMARTProject.components.data_validation import DataValidation
+from src.DMARTProject.components.datapersistence import DataPersistence
+from src.DMARTProject.components.plot_rendering import PlotConfig
+from src.DMARTProject.loggers.logger import logger
+from src.DMARTProject.utils.instrumentation import Instrumentation, InstrumentationConfig, StageMetrics
+from src.DMARTProject.utils.schema import apply_schema, get_schema
+from src.exception import CustomException
+
+
+COMPONENTS = ("validation", "cleaning", "analysis", "persistence")
+
+
+@dataclass
+class BenchmarkConfig:
+    rows: int = 100_000
+    seed: int = 42
+    chunksize: int = 1_000_000
+    components: Tuple[str, ...] = COMPONENTS
+    # Larger datasets are benchmarked chunk by chunk through the streaming
+    # APIs instead of as one in-memory frame
+    max_in_memory_rows: int = 10_000_000
+    # Render the EDA figures as part of the in-memory analysis benchmark
+    plots: bool = True
+    data_dir: str = "artifacts/benchmarks/data"
+    eda_dir: str = "artifacts/benchmarks/eda"
+    database_path: str = "artifacts/benchmarks/benchmark.db"
+    table_name: str = "DMART_Benchmark"
+    results_path: str = "artifacts/benchmarks/results.jsonl"
+
+
+def _git_revision() -> Dict[str, Optional[object]]:
+    # Revision of the code under test, wherever the benchmark is run from
+    repo = os.path.dirname(os.path.abspath(__file__))
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True, cwd=repo
+        ).stdout.strip()
+        status = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"], capture_output=True, text=True, check=True, cwd=repo
+        ).stdout
+        return {"commit": commit, "dirty": bool(status.strip())}
+    except (OSError, subprocess.CalledProcessError):
+        return {"commit": None, "dirty": None}
+
+
+class BenchmarkRunner:
+    """
+    Times each pipeline component on a synthetic dataset of `rows` rows
+    with utils/instrumentation.py (wall, CPU, peak RSS, bytes read/written).
+
+    The dataset is generated once per (rows, seed, chunksize) and kept as a
+    Parquet artifact. Up to max_in_memory_rows it is loaded once and every
+    component runs on the whole frame; beyond that each component streams
+    the file chunk by chunk, and a "read" baseline records the share of
+    the time spent reading chunks. The synthetic rows are valid and
+    duplicate-free, so every component can run on the raw chunks.
+    """
+
+    def __init__(self, config: BenchmarkConfig = BenchmarkConfig()):
+        self.config = config
+        self.data_config = SyntheticDataConfig(rows=config.rows, seed=config.seed, chunksize=config.chunksize)
+        self.schema = get_schema(self.data_config.schema_name)
+        self.streaming = config.rows > config.max_in_memory_rows
+        self.instrumentation = Instrumentation(
+            InstrumentationConfig(metrics_path=os.path.join(os.path.dirname(config.results_path), "stage_metrics.jsonl"))
+        )
+        self.database_url = f"sqlite:///{config.database_path}"
+
+    # ==========================
+    # DATASET
+    # ==========================
+    @property
+    def dataset_path(self) -> str:
+        name = f"sales_{self.config.rows}_{self.config.seed}_{self.config.chunksize}.parquet"
+        return os.path.join(self.config.data_dir, name)
+
+    def prepare_dataset(self) -> str:
+        if os.path.exists(self.dataset_path):
+            logger.info(f"Reusing synthetic dataset {self.dataset_path}")
+            return self.dataset_path
+        with self.instrumentation.stage("generate", rows_in=self.config.rows) as metrics:
+            SyntheticSalesData(self.data_config).write(self.dataset_path)
+            metrics.rows_out = self.config.rows
+        return self.dataset_path
+
+    def _read_chunks(self) -> Iterator[pd.DataFrame]:
+        import pyarrow.parquet as pq
+
+        parquet_file = pq.ParquetFile(self.dataset_path, memory_map=True)
+        for batch in parquet_file.iter_batches(batch_size=self.config.chunksize):
+            yield apply_schema(batch.to_pandas(), self.schema)
+
+    # ==========================
+    # COMPONENTS (IN MEMORY)
+    # ==========================
+    def _validation(self, df: pd.DataFrame) -> pd.DataFrame:
+        return DataValidation().validate_frame(df)
+
+    def _cleaning(self, df: pd.DataFrame) -> pd.DataFrame:
+        return DataCleaning(df).clean_data()
+
+    def _analysis(self, df: pd.DataFrame) -> pd.DataFrame:
+        analysis = DataAnalysis(
+            df, artifact_path=self.config.eda_dir, stats=AnalysisStats.from_frame(df), plot_config=PlotConfig()
+        )
+        analysis.basic_metrics()
+        analysis.numerical_summary()
+        analysis.categorical_summary()
+        analysis.correlation_matrix()
+        analysis.discount_bucket_profit()
+        if self.config.plots:
+            analysis.save_core_plots()
+        return df
+
+    def _persistence(self, df: pd.DataFrame) -> pd.DataFrame:
+        DataPersistence(self.database_url).write_to_sql(df, self.config.table_name)
+        return df
+
+    def _run_in_memory(self):
+        with self.instrumentation.stage("load") as metrics:
+            df = apply_schema(pd.read_parquet(self.dataset_path, engine="pyarrow"), self.schema)
+            metrics.rows_out = len(df)
+
+        for component in self.config.components:
+            with self.instrumentation.stage(component, rows_in=len(df)) as metrics:
+                out = getattr(self, f"_{component}")(df)
+                metrics.rows_out = len(out)
+            # Each stage feeds the next, as in ETLPipeline.run
+            df = out
+
+    # ==========================
+    # COMPONENTS (STREAMING)
+    # ==========================
+    def _stream(self, component: str) -> Iterator[pd.DataFrame]:
+        chunks = self._read_chunks()
+        if component == "validation":
+            return DataValidation().validate_chunks(chunks)
+        if component == "cleaning":
+            return DataCleaning.clean_chunks(chunks)
+        if component == "analysis":
+            return self._stream_analysis(chunks)
+        return chunks
+
+    @staticmethod
+    def _stream_analysis(chunks: Iterator[pd.DataFrame]) -> Iterator[pd.DataFrame]:
+        stats = AnalysisStats()
+        yield from stats.add_chunks(chunks)
+        stats.basic_metrics()
+        stats.numerical_summary()
+        stats.correlation_matrix()
+        stats.discount_bucket_profit()
+
+    def _run_streaming(self):
+        for component in ("read",) + tuple(self.config.components):
+            with self.instrumentation.stage(component, rows_in=self.config.rows) as metrics:
+                if component == "persistence":
+                    stats = DataPersistence(self.database_url).write_chunks(self._read_chunks(), self.config.table_name)
+                    metrics.rows_out = stats["rows"]
+                else:
+                    metrics.rows_out = sum(len(chunk) for chunk in self._stream(component))
+
+    # ==========================
+    # RUN / RESULTS
+    # ==========================
+    def _result(self, metrics: StageMetrics, revision: Dict) -> Dict:
+        rows = metrics.rows_in or metrics.rows_out or 0
+        return {
+            **revision,
+            "recorded_at": datetime.now().isoformat(timespec="seconds"),
+            "run_id": metrics.run_id,
+            "component": metrics.stage,
+            "mode": "streaming" if self.streaming else "in_memory",
+            "rows": self.config.rows,
+            "seed": self.config.seed,
+            "chunksize": self.config.chunksize,
+            "wall_seconds": metrics.wall_seconds,
+            "cpu_seconds": metrics.cpu_seconds,
+            "rows_per_sec": round(rows / metrics.wall_seconds, 1) if metrics.wall_seconds > 0 else None,
+            "peak_rss_mb": metrics.peak_rss_mb,
+            "bytes_read": metrics.bytes_read,
+            "bytes_written": metrics.bytes_written,
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+            "numpy": np.__version__,
+            "cpu_count": os.cpu_count(),
+        }
+
+    def run(self) -> List[Dict]:
+        """
+        Runs the configured component benchmarks and appends one result
+        record per component to results_path.
+        """
+        try:
+            unknown = set(self.config.components) - set(COMPONENTS)
+            if unknown:
+                raise ValueError(f"Unknown benchmark components: {sorted(unknown)}")
+
+            logger.info(
+                f"Benchmarking {list(self.config.components)} on {self.config.rows} rows "
+                f"({'streaming' if self.streaming else 'in memory'})"
+            )
+            os.makedirs(os.path.dirname(self.config.database_path) or ".", exist_ok=True)
+            self.prepare_dataset()
+
+            if self.streaming:
+                self._run_streaming()
+            else:
+                self._run_in_memory()
+
+            revision = _git_revision()
+            results = [self._result(metrics, revision) for metrics in self.instrumentation.records]
+            os.makedirs(os.path.dirname(self.config.results_path) or ".", exist_ok=True)
+            with open(self.config.results_path, "a") as fp:
+                for result in results:
+                    fp.write(json.dumps(result) + "\n")
+
+            logger.info(f"Benchmark results appended to {self.config.results_path}")
+            return results
+
+        except Exception as e:
+            logger.exception("Benchmark run failed")
+            raise CustomException(e, sys)
+
+
+def load_results(path: str = BenchmarkConfig.results_path) -> pd.DataFrame:
+    with open(path) as fp:
+        return pd.DataFrame([json.loads(line) for line in fp if line.strip()])
+
+
+def compare_commits(path: str = BenchmarkConfig.results_path, rows: Optional[int] = None) -> pd.DataFrame:
+    """
+    Median rows/s per component (rows) and commit (columns), in the order
+    the commits were first benchmarked; restricted to one dataset size
+    with `rows`, otherwise the largest one benchmarked.
+    """
+    results = load_results(path)
+    results = results[results["rows"] == (rows or results["rows"].max())]
+    commits = results["commit"].fillna("unknown").drop_duplicates().tolist()
+    table = results.pivot_table(
+        index="component", columns=results["commit"].fillna("unknown"), values="rows_per_sec", aggfunc="median"
+    )
+    return table.reindex(columns=commits)
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="DMART component benchmarks on synthetic data")
+    parser.add_argument("--rows", type=float, help=f"dataset size, e.g. 1e6 (default {BenchmarkConfig.rows})")
+    parser.add_argument("--seed", type=int, default=BenchmarkConfig.seed)
+    parser.add_argument("--chunksize", type=int, default=BenchmarkConfig.chunksize)
+    parser.add_argument("--components", nargs="+", choices=COMPONENTS, default=list(COMPONENTS))
+    parser.add_argument("--no-plots", action="store_true", help="skip rendering the EDA figures")
+    parser.add_argument("--compare", action="store_true", help="print rows/s per commit and exit")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        print(compare_commits(rows=int(args.rows) if args.rows else None).to_string())
+        return
+
+    config = BenchmarkConfig(
+        rows=int(args.rows or BenchmarkConfig.rows),
+        seed=args.seed,
+        chunksize=args.chunksize,
+        components=tuple(args.components),
+        plots=not args.no_plots,
+    )
+    for result in BenchmarkRunner(config).run():
+        print(
+            f"{result['component']:<12} {result['wall_seconds']:>9.3f}s "
+            f"{result['rows_per_sec'] or 0:>14,.0f} rows/s {result['peak_rss_mb']:>9.1f} MB"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+import os
+from dataclasses import dataclass
+from typing import Iterator
+
+import numpy as np
+import pandas as pd
+
+from src.DMARTProject.loggers.logger import logger
+from src.DMARTProject.utils.artifacts import open_artifact_writer
+from src.DMARTProject.utils.parallel import concat_partitions
+from src.DMARTProject.utils.schema import apply_schema, get_schema
+
+
+@dataclass
+class SyntheticDataConfig:
+    rows: int = 100_000
+    seed: int = 42
+    # Rows generated per chunk; bounds memory for 1e8-row datasets
+    chunksize: int = 1_000_000
+    schema_name: str = "sales"
+
+
+# ==========================
+# DISTRIBUTIONS
+# ==========================
+# Fitted to artifacts/raw_data.csv (8k rows, 2011-2014)
+FIRST_SALES_ID = 104_715
+DATE_RANGE = ("2011-01-01", "2014-12-31")
+ROWS_PER_ORDER = 2
+
+PRODUCT_IDS = (1, 1810)
+CUSTOMER_IDS = (1, 792)
+REGION_IDS = (1, 3)
+LOCATION_IDS = (1002, 2002)
+
+SHIP_MODES = {"Economy": 0.604, "Economy Plus": 0.198, "Priority": 0.145, "Immediate": 0.053}
+ORDER_PREFIXES = {"AZ": 0.773, "BN": 0.227}
+QUANTITIES = {
+    1: 0.085, 2: 0.245, 3: 0.246, 4: 0.124, 5: 0.117, 6: 0.059, 7: 0.058,
+    8: 0.026, 9: 0.022, 10: 0.005, 11: 0.005, 12: 0.003, 13: 0.002, 14: 0.002,
+}
+
+DISCOUNT_NULL_RATE = 0.61
+DISCOUNTS = {0.1: 0.419, 0.2: 0.127, 0.3: 0.013, 0.4: 0.090, 0.5: 0.314, 0.6: 0.031, 0.7: 0.006, 0.8: 0.001}
+PROFIT_NULL_RATE = 0.029
+FEEDBACK_RATE = 0.481
+
+# log(SalesAmount) ~ N(mu, sigma); profit margin falls with the discount
+SALES_LOG_MEAN, SALES_LOG_STD, SALES_MIN = 4.84, 1.29, 3.0
+MARGIN_BASE, MARGIN_PER_DISCOUNT, MARGIN_STD = 0.30, -0.90, 0.15
+
+
+def _choice(rng: np.random.Generator, weights: dict, size: int) -> np.ndarray:
+    values = np.array(list(weights))
+    p = np.array(list(weights.values()), dtype="float64")
+    return rng.choice(values, size=size, p=p / p.sum())
+
+
+def _with_nulls(rng: np.random.Generator, values: np.ndarray, null_rate: float) -> np.ndarray:
+    values = values.astype("float64")
+    values[rng.random(len(values)) < null_rate] = np.nan
+    return values
+
+
+class SyntheticSalesData:
+    """
+    Seeded generator of sales rows matching the 13-column sales schema,
+    with the null rates, cardinalities and value distributions of the
+    shipped sample. Each chunk is drawn from its own (seed, index) stream,
+    so a chunk can be regenerated on its own and a dataset is fully
+    determined by (rows, seed, chunksize).
+    """
+
+    def __init__(self, config: SyntheticDataConfig = SyntheticDataConfig()):
+        self.config = config
+        self.schema = get_schema(config.schema_name)
+        start, end = (np.datetime64(d, "D") for d in DATE_RANGE)
+        self._start_day = start
+        self._n_days = int((end - start).astype(int)) + 1
+
+    @property
+    def n_chunks(self) -> int:
+        return -(-self.config.rows // self.config.chunksize)
+
+    def chunk(self, index: int) -> pd.DataFrame:
+        """
+        Generates chunk `index` (0-based) as a schema-typed DataFrame.
+        """
+        offset = index * self.config.chunksize
+        n = min(self.config.chunksize, self.config.rows - offset)
+        rng = np.random.default_rng([self.config.seed, index])
+
+        sales_id = FIRST_SALES_ID + offset + np.arange(n)
+        order_date = self._start_day + rng.integers(0, self._n_days, n)
+        # Consecutive rows share an order (same date, same prefix)
+        first_row = np.arange(n) // ROWS_PER_ORDER * ROWS_PER_ORDER
+        order_no = (offset + first_row) // ROWS_PER_ORDER
+        order_date = order_date[first_row]
+        prefix = _choice(rng, ORDER_PREFIXES, n)[first_row]
+        year = order_date.astype("datetime64[Y]").astype(int) + 1970
+        order_id = pd.Series(prefix, dtype="string") + "-" + pd.Series(year).astype("string") + "-" + \
+            pd.Series(4_000_000 + order_no).astype("string")
+
+        discount_raw = _choice(rng, DISCOUNTS, n)
+        discount = _with_nulls(rng, discount_raw, DISCOUNT_NULL_RATE)
+        sales = np.maximum(np.round(np.exp(rng.normal(SALES_LOG_MEAN, SALES_LOG_STD, n))), SALES_MIN)
+        margin = MARGIN_BASE + MARGIN_PER_DISCOUNT * np.nan_to_num(discount) + rng.normal(0, MARGIN_STD, n)
+        profit = _with_nulls(rng, np.round(sales * margin), PROFIT_NULL_RATE)
+
+        df = pd.DataFrame({
+            "SalesID": sales_id,
+            "OrderID": order_id,
+            "OrderDate": order_date.astype("datetime64[ns]"),
+            "ProductID": rng.integers(PRODUCT_IDS[0], PRODUCT_IDS[1] + 1, n),
+            "CustomerID": rng.integers(CUSTOMER_IDS[0], CUSTOMER_IDS[1] + 1, n),
+            "RegionID": rng.integers(REGION_IDS[0], REGION_IDS[1] + 1, n),
+            "ShipMode": _choice(rng, SHIP_MODES, n),
+            "Quantity": _choice(rng, QUANTITIES, n),
+            "Discount": discount,
+            "SalesAmount": sales,
+            "Profit": profit,
+            "LocationID": rng.integers(LOCATION_IDS[0], LOCATION_IDS[1] + 1, n),
+            "FeedbackProvided": rng.random(n) < FEEDBACK_RATE,
+        })
+        return apply_schema(df, self.schema)
+
+    def chunks(self) -> Iterator[pd.DataFrame]:
+        for index in range(self.n_chunks):
+            yield self.chunk(index)
+
+    def frame(self) -> pd.DataFrame:
+        """
+        The whole dataset in memory; use chunks() beyond ~1e7 rows.
+        """
+        return concat_partitions(list(self.chunks())).reset_index(drop=True)
+
+    def write(self, path: str) -> str:
+        """
+        Streams the dataset chunk by chunk to an artifact file (format
+        from the extension).
+        """
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open_artifact_writer(path) as writer:
+            for chunk in self.chunks():
+                writer.write(chunk)
+        logger.info(f"Synthetic dataset written to {path} ({writer.rows_written} rows, seed {self.config.seed})")
+        return path
@@ -0,0 +1,338 @@
+import hashlib
+import json
+import math
+import os
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+
+
+NUMERIC_COLS = ["Quantity", "Discount", "SalesAmount", "Profit"]
+
+DISCOUNT_BINS = [0, 0.1, 0.3, 0.5, 0.75, 1.0]
+DISCOUNT_LABELS = ["Low", "Medium", "High", "Very_High", "Extreme"]
+
+
+@dataclass
+class AnalysisStatsConfig:
+    stats_path: str = "artifacts/analysis/running_stats.json"
+    # Relative accuracy of the quantile sketches
+    quantile_accuracy: float = 0.01
+
+
+class QuantileSketch:
+    """
+    Mergeable quantile sketch with relative error `accuracy` (DDSketch):
+    values are counted in logarithmic buckets, separately for positive and
+    negative values, so merging two sketches is adding bucket counts.
+    """
+
+    def __init__(self, accuracy: float = 0.01):
+        self.accuracy = accuracy
+        self.gamma = (1 + accuracy) / (1 - accuracy)
+        self.positive: Dict[int, int] = {}
+        self.negative: Dict[int, int] = {}
+        self.zero = 0
+
+    @property
+    def count(self) -> int:
+        return self.zero + sum(self.positive.values()) + sum(self.negative.values())
+
+    def _add_buckets(self, buckets: Dict[int, int], values: np.ndarray):
+        if not len(values):
+            return
+        keys, counts = np.unique(np.ceil(np.log(values) / math.log(self.gamma)).astype(np.int64), return_counts=True)
+        for key, count in zip(keys.tolist(), counts.tolist()):
+            buckets[key] = buckets.get(key, 0) + count
+
+    def add(self, values: np.ndarray):
+        values = values[~np.isnan(values)]
+        self._add_buckets(self.positive, values[values > 0])
+        self._add_buckets(self.negative, -values[values < 0])
+        self.zero += int((values == 0).sum())
+
+    def merge(self, other: "QuantileSketch"):
+        for mine, theirs in ((self.positive, other.positive), (self.negative, other.negative)):
+            for key, count in theirs.items():
+                mine[key] = mine.get(key, 0) + count
+        self.zero += other.zero
+
+    def _value(self, key: int) -> float:
+        return 2 * self.gamma ** key / (self.gamma + 1)
+
+    def quantile(self, q: float) -> float:
+        total = self.count
+        if not total:
+            return float("nan")
+        rank = q * (total - 1)
+
+        # Ascending value order: most negative first, then zero, then positives
+        seen = 0
+        for key in sorted(self.negative, reverse=True):
+            seen += self.negative[key]
+            if seen > rank:
+                return -self._value(key)
+        seen += self.zero
+        if seen > rank:
+            return 0.0
+        for key in sorted(self.positive):
+            seen += self.positive[key]
+            if seen > rank:
+                return self._value(key)
+        return self._value(max(self.positive)) if self.positive else 0.0
+
+    def to_dict(self) -> Dict:
+        return {
+            "accuracy": self.accuracy,
+            "positive": {str(k): v for k, v in self.positive.items()},
+            "negative": {str(k): v for k, v in self.negative.items()},
+            "zero": self.zero,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "QuantileSketch":
+        sketch = cls(data["accuracy"])
+        sketch.positive = {int(k): v for k, v in data["positive"].items()}
+        sketch.negative = {int(k): v for k, v in data["negative"].items()}
+        sketch.zero = data["zero"]
+        return sketch
+
+
+class AnalysisStats:
+    """
+    Mergeable running statistics behind the DataAnalysis metrics.
+
+    Per column: non-null count, mean and M2 (sum of squared deviations),
+    min, max and a quantile sketch. Jointly over rows where all numeric
+    columns are present: mean vector and co-moment matrix for correlation.
+    Plus row/loss counts and per-discount-bucket profit sums and counts.
+    Chunks are combined with Chan's parallel update, so stats built per
+    chunk and merged equal stats built over the whole frame.
+    """
+
+    def __init__(self, columns: List[str] = NUMERIC_COLS, accuracy: float = 0.01):
+        k = len(columns)
+        self.columns = list(columns)
+        self.row_count = 0
+        self.column_count = 0
+        self.loss_count = 0
+        self.count = np.zeros(k, dtype=np.int64)
+        self.mean = np.zeros(k)
+        self.m2 = np.zeros(k)
+        self.min = np.full(k, np.inf)
+        self.max = np.full(k, -np.inf)
+        self.joint_count = 0
+        self.joint_mean = np.zeros(k)
+        self.comoment = np.zeros((k, k))
+        self.bucket_count = np.zeros(len(DISCOUNT_LABELS), dtype=np.int64)
+        self.bucket_profit = np.zeros(len(DISCOUNT_LABELS))
+        self.sketches = [QuantileSketch(accuracy) for _ in columns]
+
+    # ==========================
+    # BUILD / MERGE
+    # ==========================
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, columns: List[str] = NUMERIC_COLS, accuracy: float = 0.01) -> "AnalysisStats":
+        stats = cls(columns, accuracy)
+        values = df[columns].to_numpy(dtype="float64", na_value=np.nan)
+        present = ~np.isnan(values)
+
+        stats.row_count = len(df)
+        stats.column_count = df.shape[1]
+        stats.loss_count = int((df["Profit"] < 0).sum())
+        stats.count = present.sum(axis=0)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            stats.mean = np.where(stats.count > 0, np.nansum(values, axis=0) / stats.count, 0.0)
+            stats.m2 = np.nansum((values - stats.mean) ** 2, axis=0)
+        if len(df):
+            stats.min = np.nanmin(np.where(present, values, np.inf), axis=0)
+            stats.max = np.nanmax(np.where(present, values, -np.inf), axis=0)
+
+        complete = values[present.all(axis=1)]
+        stats.joint_count = len(complete)
+        if len(complete):
+            stats.joint_mean = complete.mean(axis=0)
+            centered = complete - stats.joint_mean
+            stats.comoment = centered.T @ centered
+
+        for sketch, column in zip(stats.sketches, values.T):
+            sketch.add(column)
+
+        discount = df["Discount"].to_numpy(dtype="float64", na_value=np.nan)
+        profit = df["Profit"].to_numpy(dtype="float64", na_value=np.nan)
+        # Same buckets as pd.cut(right=True): (0, 0.1], (0.1, 0.3], ...
+        bucket = np.searchsorted(DISCOUNT_BINS, discount, side="left") - 1
+        in_bucket = (bucket >= 0) & (bucket < len(DISCOUNT_LABELS)) & ~np.isnan(profit)
+        stats.bucket_count = np.bincount(bucket[in_bucket], minlength=len(DISCOUNT_LABELS))
+        stats.bucket_profit = np.bincount(bucket[in_bucket], weights=profit[in_bucket], minlength=len(DISCOUNT_LABELS))
+        return stats
+
+    def merge(self, other: "AnalysisStats") -> "AnalysisStats":
+        """
+        Folds `other` (stats of different rows) into these stats in place.
+        """
+        n = self.count + other.count
+        delta = other.mean - self.mean
+        with np.errstate(invalid="ignore", divide="ignore"):
+            weight = np.where(n > 0, other.count / np.maximum(n, 1), 0.0)
+            self.m2 = self.m2 + other.m2 + delta ** 2 * self.count * weight
+        self.mean = self.mean + delta * weight
+        self.count = n
+        self.min = np.minimum(self.min, other.min)
+        self.max = np.maximum(self.max, other.max)
+
+        joint_n = self.joint_count + other.joint_count
+        if joint_n:
+            joint_delta = other.joint_mean - self.joint_mean
+            self.comoment = (
+                self.comoment
+                + other.comoment
+                + np.outer(joint_delta, joint_delta) * self.joint_count * other.joint_count / joint_n
+            )
+            self.joint_mean = self.joint_mean + joint_delta * other.joint_count / joint_n
+        self.joint_count = joint_n
+
+        for sketch, other_sketch in zip(self.sketches, other.sketches):
+            sketch.merge(other_sketch)
+
+        self.row_count += other.row_count
+        self.column_count = max(self.column_count, other.column_count)
+        self.loss_count += other.loss_count
+        self.bucket_count = self.bucket_count + other.bucket_count
+        self.bucket_profit = self.bucket_profit + other.bucket_profit
+        return self
+
+    def update(self, df: pd.DataFrame) -> int:
+        """
+        Folds every row of `df` into the stats and returns how many were
+        added. The caller passes only rows not counted yet, e.g. the cleaned
+        rows of an incremental delta; stats cannot take rows back out.
+        """
+        if len(df):
+            self.merge(AnalysisStats.from_frame(df, self.columns, self.sketches[0].accuracy))
+        return len(df)
+
+    def add_chunks(self, chunks: Iterable[pd.DataFrame]) -> Iterator[pd.DataFrame]:
+        """
+        Updates the stats with each chunk of a stream and passes it through.
+        """
+        for chunk in chunks:
+            self.update(chunk)
+            yield chunk
+
+    # ==========================
+    # METRICS
+    # ==========================
+    def _index(self, column: str) -> int:
+        return self.columns.index(column)
+
+    def column_sum(self, column: str) -> float:
+        i = self._index(column)
+        return float(self.mean[i] * self.count[i])
+
+    def basic_metrics(self) -> Dict:
+        discount, profit = self._index("Discount"), self._index("Profit")
+        return {
+            "row_count": self.row_count,
+            "column_count": self.column_count,
+            "loss_rate": round(self.loss_count / self.row_count, 4) if self.row_count else float("nan"),
+            "avg_discount": round(float(self.mean[discount]), 4),
+            "avg_profit": round(float(self.mean[profit]), 2),
+            "total_profit": round(self.column_sum("Profit"), 2),
+        }
+
+    def numerical_summary(self) -> pd.DataFrame:
+        """
+        describe()-shaped summary; quartiles come from the quantile sketches.
+        """
+        with np.errstate(invalid="ignore", divide="ignore"):
+            std = np.sqrt(self.m2 / (self.count - 1))
+        return pd.DataFrame(
+            {
+                "count": self.count.astype("float64"),
+                "mean": self.mean,
+                "std": std,
+                "min": self.min,
+                "25%": [s.quantile(0.25) for s in self.sketches],
+                "50%": [s.quantile(0.5) for s in self.sketches],
+                "75%": [s.quantile(0.75) for s in self.sketches],
+                "max": self.max,
+            },
+            index=self.columns,
+        )
+
+    def correlation_matrix(self) -> pd.DataFrame:
+        with np.errstate(invalid="ignore", divide="ignore"):
+            scale = np.sqrt(np.diag(self.comoment))
+            corr = self.comoment / np.outer(scale, scale)
+        return pd.DataFrame(corr, index=self.columns, columns=self.columns)
+
+    def discount_bucket_profit(self) -> pd.DataFrame:
+        observed = self.bucket_count > 0
+        labels = pd.Categorical(np.array(DISCOUNT_LABELS)[observed], categories=DISCOUNT_LABELS, ordered=True)
+        return pd.DataFrame(
+            {
+                "Discount_Bucket": labels,
+                "Profit": self.bucket_profit[observed] / self.bucket_count[observed],
+            }
+        )
+
+    # ==========================
+    # PERSISTENCE
+    # ==========================
+    def to_dict(self) -> Dict:
+        return {
+            "columns": self.columns,
+            "row_count": self.row_count,
+            "column_count": self.column_count,
+            "loss_count": self.loss_count,
+            "count": self.count.tolist(),
+            "mean": self.mean.tolist(),
+            "m2": self.m2.tolist(),
+            "min": self.min.tolist(),
+            "max": self.max.tolist(),
+            "joint_count": self.joint_count,
+            "joint_mean": self.joint_mean.tolist(),
+            "comoment": self.comoment.tolist(),
+            "bucket_count": self.bucket_count.tolist(),
+            "bucket_profit": self.bucket_profit.tolist(),
+            "sketches": [sketch.to_dict() for sketch in self.sketches],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "AnalysisStats":
+        stats = cls(data["columns"])
+        stats.row_count = data["row_count"]
+        stats.column_count = data["column_count"]
+        stats.loss_count = data["loss_count"]
+        stats.count = np.array(data["count"], dtype=np.int64)
+        for name in ("mean", "m2", "min", "max", "joint_mean", "comoment", "bucket_profit"):
+            setattr(stats, name, np.array(data[name], dtype="float64"))
+        stats.joint_count = data["joint_count"]
+        stats.bucket_count = np.array(data["bucket_count"], dtype=np.int64)
+        stats.sketches = [QuantileSketch.from_dict(sketch) for sketch in data["sketches"]]
+        return stats
+
+    def digest(self) -> str:
+        """
+        Hash of the full stats state; changes whenever any merged row does.
+        """
+        payload = json.dumps(self.to_dict(), sort_keys=True).encode()
+        return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+    def save(self, path: str) -> str:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as fp:
+            json.dump(self.to_dict(), fp)
+        os.replace(tmp_path, path)
+        return path
+
+    @classmethod
+    def load(cls, path: str) -> Optional["AnalysisStats"]:
+        if not os.path.exists(path):
+            return None
+        with open(path, "r") as fp:
+            return cls.from_dict(json.load(fp))
@@ -1,8 +1,55 @@
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
+import functools
+import hashlib
 import os
-from typing import Dict
+from typing import Dict, List, Optional, Sequence
+
+from src.DMARTProject.components.analysis_stats import (
+    DISCOUNT_BINS,
+    DISCOUNT_LABELS,
+    NUMERIC_COLS,
+    AnalysisStats,
+)
+from src.DMARTProject.components.plot_rendering import PlotConfig, core_figure_specs, render_figures
+from src.DMARTProject.loggers.logger import logger
+from src.DMARTProject.utils.result_cache import ResultCache
+
+
+# Bump when a cached method's output changes for the same input
+CACHE_VERSION = 1
+
+
+def _cached(columns: Sequence[str]):
+    """
+    Memoizes a DataAnalysis method on the instance and, with a ResultCache,
+    on disk. The key is the method, its arguments, a fingerprint of the
+    `columns` it reads (row count + data version or content hash) and the
+    digest of the running stats it may read instead, so a result is reused
+    for as long as both are unchanged.
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            if self.df is None:
+                return method(self, *args, **kwargs)
+
+            key = ResultCache.make_key(
+                CACHE_VERSION, method.__name__, self._fingerprint(columns), args, sorted(kwargs.items()),
+                self._stats_digest(),
+            )
+            if key in self._memo:
+                return self._memo[key]
+
+            hit, value = self.cache.lookup(key) if self.cache is not None else (False, None)
+            if not hit:
+                value = method(self, *args, **kwargs)
+                if self.cache is not None:
+                    self.cache.put(key, value)
+
+            self._memo[key] = value
+            return value
+        return wrapper
+    return decorator
 
 
 class DataAnalysis:
@@ -10,12 +57,38 @@ class DataAnalysis:
     Enterprise-grade Data Analysis component.
     Performs headless EDA: metrics, summaries, correlations.
     Visualization is optional and saved as artifacts.
-    """
 
-    NUMERIC_COLS = ["Quantity", "Discount", "SalesAmount", "Profit"]
+    With `stats` (running statistics maintained per chunk or per daily
+    delta, see analysis_stats.py) the metrics, summaries and correlations
+    are read from the stats instead of rescanning `df`; `df` is then only
+    needed for the plots and categorical summary.
 
-    def __init__(self, df: pd.DataFrame, artifact_path: str = "artifacts/eda"):
-        self.df = df.copy()
+    `data_version` identifies the contents of `df` (e.g. the raw data
+    version from ingestion, see DataIngestionPipeline._next_version); cache
+    keys then use it instead of hashing the columns.
+    """
+
+    NUMERIC_COLS = NUMERIC_COLS
+
+    def __init__(
+        self,
+        df: Optional[pd.DataFrame] = None,
+        artifact_path: str = "artifacts/eda",
+        stats: Optional[AnalysisStats] = None,
+        cache: Optional[ResultCache] = None,
+        plot_config: PlotConfig = PlotConfig(),
+        data_version: Optional[str] = None,
+    ):
+        # Read-only use: keep a reference instead of copying the frame
+        self.df = df
+        self.stats = stats
+        self.data_version = data_version
+        # Results are memoized per instance, and across runs with `cache`
+        self.cache = cache
+        self._memo: Dict[str, object] = {}
+        self._column_hashes: Dict[str, str] = {}
+        self._stats_hash: Optional[str] = None
+        self.plot_config = plot_config
         self.artifact_path = artifact_path
         os.makedirs(self.artifact_path, exist_ok=True)
 
@@ -27,10 +100,36 @@ class DataAnalysis:
         if missing:
             raise ValueError(f"Missing required columns: {missing}")
 
+    # ==========================
+    # RESULT CACHING
+    # ==========================
+    def _fingerprint(self, cols: Sequence[str]) -> tuple:
+        """
+        Row count plus the data version, or else a content hash per column,
+        each column hashed at most once per instance.
+        """
+        self._check_columns(cols)
+        if self.data_version is not None:
+            return (len(self.df), self.data_version)
+        for col in cols:
+            if col not in self._column_hashes:
+                hashes = pd.util.hash_pandas_object(self.df[col], index=False).to_numpy()
+                self._column_hashes[col] = hashlib.blake2b(hashes.tobytes(), digest_size=16).hexdigest()
+        return (len(self.df),) + tuple((col, self._column_hashes[col]) for col in cols)
+
+    def _stats_digest(self) -> Optional[str]:
+        # Computed once; the stats are not updated while they are analyzed
+        if self.stats is not None and self._stats_hash is None:
+            self._stats_hash = self.stats.digest()
+        return self._stats_hash
+
     # ==========================
     # BASIC BUSINESS METRICS
     # ==========================
+    @_cached(["Profit", "Discount"])
     def basic_metrics(self) -> Dict:
+        if self.stats is not None:
+            return self.stats.basic_metrics()
         self._check_columns(["Profit", "Discount"])
 
         return {
@@ -45,13 +144,17 @@ class DataAnalysis:
     # ==========================
     # NUMERICAL SUMMARY
     # ==========================
+    @_cached(NUMERIC_COLS)
     def numerical_summary(self) -> pd.DataFrame:
+        if self.stats is not None:
+            return self.stats.numerical_summary()
         self._check_columns(self.NUMERIC_COLS)
         return self.df[self.NUMERIC_COLS].describe().T
 
     # ==========================
     # CATEGORICAL DISTRIBUTIONS
     # ==========================
+    @_cached(["ShipMode", "FeedbackProvided"])
     def categorical_summary(self) -> Dict:
         return {
             "ShipMode": self.df["ShipMode"].value_counts(),
@@ -61,26 +164,31 @@ class DataAnalysis:
     # ==========================
     # CORRELATION ANALYSIS
     # ==========================
+    @_cached(NUMERIC_COLS)
     def correlation_matrix(self) -> pd.DataFrame:
+        if self.stats is not None:
+            return self.stats.correlation_matrix()
         self._check_columns(self.NUMERIC_COLS)
         return self.df[self.NUMERIC_COLS].corr()
 
     # ==========================
     # DISCOUNT IMPACT ANALYSIS
     # ==========================
+    @_cached(["Discount", "Profit"])
     def discount_bucket_profit(self) -> pd.DataFrame:
+        if self.stats is not None:
+            return self.stats.discount_bucket_profit()
         self._check_columns(["Discount", "Profit"])
 
-        df_temp = self.df.copy()
-        df_temp["Discount_Bucket"] = pd.cut(
-            df_temp["Discount"],
-            bins=[0, 0.1, 0.3, 0.5, 0.75, 1.0],
-            labels=["Low", "Medium", "High", "Very_High", "Extreme"]
-        )
+        discount_bucket = pd.cut(
+            self.df["Discount"],
+            bins=DISCOUNT_BINS,
+            labels=DISCOUNT_LABELS
+        ).rename("Discount_Bucket")
 
         return (
-            df_temp
-            .groupby("Discount_Bucket", observed=True)["Profit"]
+            self.df["Profit"]
+            .groupby(discount_bucket, observed=True)
             .mean()
             .reset_index()
         )
@@ -88,41 +196,47 @@ class DataAnalysis:
     # ==========================
     # SAVE EDA PLOTS (OPTIONAL)
     # ==========================
-    def save_core_plots(self):
-        # Count plots
-        fig, axes = plt.subplots(1, 2, figsize=(12, 4))
-        sns.countplot(x="ShipMode", data=self.df, ax=axes[0])
-        axes[0].set_title("Ship Mode Counts")
-
-        sns.countplot(x="FeedbackProvided", data=self.df, ax=axes[1])
-        axes[1].set_title("Feedback Provided Counts")
-
-        plt.tight_layout()
-        plt.savefig(f"{self.artifact_path}/univariate_countplots.png", dpi=300)
-        plt.close()
-
-        # Distribution plots
-        fig, axes = plt.subplots(1, 3, figsize=(15, 4))
-        sns.histplot(self.df["SalesAmount"], bins=30, kde=True, ax=axes[0])
-        axes[0].set_title("Sales Distribution")
-
-        sns.histplot(self.df["Profit"], bins=30, kde=True, ax=axes[1])
-        axes[1].set_title("Profit Distribution")
-
-        sns.histplot(self.df["Discount"], bins=30, kde=True, ax=axes[2])
-        axes[2].set_title("Discount Distribution")
-
-        plt.tight_layout()
-        plt.savefig(f"{self.artifact_path}/univariate_distributions.png", dpi=300)
-        plt.close()
-
-        # Correlation heatmap
-        plt.figure(figsize=(8, 6))
-        sns.heatmap(self.correlation_matrix(), annot=True, cmap="coolwarm")
-        plt.title("Correlation Matrix")
-        plt.savefig(f"{self.artifact_path}/correlation_matrix.png", dpi=300)
-        plt.close()
+    def _plots_key(self) -> str:
+        columns = ["ShipMode", "FeedbackProvided"] + NUMERIC_COLS
+        return ResultCache.make_key(
+            CACHE_VERSION, "save_core_plots", self._fingerprint(columns), self._stats_digest(), self.plot_config
+        )
 
+    def save_core_plots(self) -> List[str]:
+        """
+        Renders the core plots into `artifact_path` and returns their paths.
+        With a cache, plots of unchanged data are restored from the cache
+        instead of re-rendered.
+        """
+        if self.cache is None:
+            return self._render_core_plots()
+
+        key = self._plots_key()
+        hit, images = self.cache.lookup(key)
+        if hit:
+            paths = []
+            for name, image in images.items():
+                path = os.path.join(self.artifact_path, name)
+                if not os.path.exists(path) or os.path.getsize(path) != len(image):
+                    with open(path, "wb") as fp:
+                        fp.write(image)
+                paths.append(path)
+            logger.info("Data unchanged: core plots restored from cache")
+            return paths
+
+        paths = self._render_core_plots()
+        images = {}
+        for path in paths:
+            with open(path, "rb") as fp:
+                images[os.path.basename(path)] = fp.read()
+        self.cache.put(key, images)
+        return paths
+
+    def _render_core_plots(self) -> List[str]:
+        # Binned/aggregated here with NumPy; only the aggregates go to the
+        # rendering workers, so plot time does not grow with row count
+        specs = core_figure_specs(self.df, self.correlation_matrix(), self.plot_config)
+        return render_figures(specs, self.artifact_path, self.plot_config)
 
     # ==========================
 
@@ -1,8 +1,27 @@
 import pandas as pd
+from typing import Iterable, Iterator, Tuple
+
+import numpy as np
+
+from src.DMARTProject.components.deduplication import row_hashes
+from src.DMARTProject.loggers.logger import logger
+from src.DMARTProject.utils.parallel import ParallelConfig, concat_partitions, partition_frame, run_partitioned
+
+
+def _clean_partition(df: pd.DataFrame) -> Tuple[pd.DataFrame, np.ndarray]:
+    # Runs in a worker process (see DataCleaning.clean_parallel): every
+    # row-local step, plus the row hashes used for the global dedup pass
+    df = DataCleaning._normalize(df.copy(deep=False))
+    df = df[DataCleaning._sanity_mask(df)]
+    hashes = row_hashes(df)
+    return DataCleaning._enforce_dtypes(df), hashes
+
 
 class DataCleaning:
     def __init__(self, df: pd.DataFrame):
-        self.df = df.copy()
+        # Shallow copy: whole-column assignments below never write into the
+        # caller's frame, so the data itself is not duplicated
+        self.df = df.copy(deep=False)
 
     def clean_data(self) -> pd.DataFrame:
         """
@@ -10,50 +29,100 @@ class DataCleaning:
         No outlier handling or feature engineering here.
         """
         ## Checking the no of rows and columns
-        print(f"Initial data shape: {self.df.shape}")
+        logger.info(f"Initial data shape: {self.df.shape}")
+        self.df = self._normalize(self.df)
+
         # -------------------------
-        # Missing Value Handling
+        # Remove duplicates + business sanity rules
         # -------------------------
-        # Discount missing → no discount applied
-        self.df["Discount"] = self.df["Discount"].fillna(0)
+        # Combined into one boolean mask so the frame is filtered only once
+        # (duplicate rows share the same sanity result, so order is irrelevant)
+        keep = ~self.df.duplicated()
+        keep &= self._sanity_mask(self.df)
+        self.df = self.df[keep]
 
-        # Profit missing → calculation missing / no profit recorded
-        self.df["Profit"] = self.df["Profit"].fillna(0)
+        self.df = self._enforce_dtypes(self.df)
 
         # -------------------------
-        # Date Handling
+        # Reset index
         # -------------------------
-        if "OrderDate" in self.df.columns:
-            self.df["OrderDate"] = pd.to_datetime(
-                self.df["OrderDate"], errors="coerce"
-            )
+        self.df = self.df.reset_index(drop=True)
 
-        # -------------------------
-        # Remove duplicates
-        # -------------------------
-        self.df = self.df.drop_duplicates()
+        return self.df
+
+    def clean_parallel(self, parallel: ParallelConfig = ParallelConfig()) -> pd.DataFrame:
+        """
+        Same result as clean_data, with the row-local steps run on a process
+        pool over row-range or OrderDate-month partitions.
+
+        Duplicates can span partitions, so each worker also returns a 64-bit
+        hash per row. Only rows whose hash occurs more than once across all
+        partitions can be duplicates; those few rows are compared in full
+        here, which keeps the global pass exact without a second shuffle.
+        """
+        partitions = partition_frame(self.df, parallel)
+        results = run_partitioned(_clean_partition, partitions, parallel)
+        logger.info(f"Cleaned {len(self.df)} rows in {len(partitions)} partitions")
+
+        df = concat_partitions([part for part, _ in results])
+        hashes = pd.Series(np.concatenate([h for _, h in results]))
+
+        # Month partitions interleave rows; dedup must keep the first
+        # occurrence in input order
+        order = np.argsort(df.index.to_numpy(), kind="stable")
+        df, hashes = df.iloc[order], hashes.iloc[order]
+
+        candidates = hashes.duplicated(keep=False).to_numpy()
+        keep = np.ones(len(df), dtype=bool)
+        if candidates.any():
+            keep[np.flatnonzero(candidates)] = ~df[candidates].duplicated().to_numpy()
+
+        self.df = df[keep].reset_index(drop=True)
+        return self.df
 
+    @staticmethod
+    def _normalize(df: pd.DataFrame) -> pd.DataFrame:
         # -------------------------
-        # Business sanity rules
+        # Missing Value Handling
         # -------------------------
-        self.df = self.df[self.df["Quantity"] > 0]
-        self.df = self.df[self.df["SalesAmount"] > 0]
-        self.df = self.df[
-            (self.df["Discount"] >= 0) & (self.df["Discount"] <= 1)
-        ]
+        # Discount missing → no discount applied
+        df["Discount"] = df["Discount"].fillna(0)
+
+        # Profit missing → calculation missing / no profit recorded
+        df["Profit"] = df["Profit"].fillna(0)
 
         # -------------------------
-        # Data type enforcement
+        # Date Handling
         # -------------------------
-        id_columns = [col for col in self.df.columns if "ID" in col]
-        for col in id_columns:
-            self.df[col] = self.df[col].astype("category")
+        if "OrderDate" in df.columns:
+            df["OrderDate"] = pd.to_datetime(
+                df["OrderDate"], errors="coerce"
+            )
+        return df
 
-        self.df["ShipMode"] = self.df["ShipMode"].astype("category")
+    @staticmethod
+    def _sanity_mask(df: pd.DataFrame) -> pd.Series:
+        keep = df["Quantity"] > 0
+        keep &= df["SalesAmount"] > 0
+        keep &= (df["Discount"] >= 0) & (df["Discount"] <= 1)
+        return keep
 
+    @staticmethod
+    def _enforce_dtypes(df: pd.DataFrame) -> pd.DataFrame:
         # -------------------------
-        # Reset index
+        # Data type enforcement
         # -------------------------
-        self.df = self.df.reset_index(drop=True)
+        id_columns = [col for col in df.columns if "ID" in col]
+        for col in id_columns + ["ShipMode"]:
+            if not isinstance(df[col].dtype, pd.CategoricalDtype):
+                df[col] = df[col].astype("category")
+        return df
 
-        return self.df
+    @classmethod
+    def clean_chunks(cls, chunks: Iterable[pd.DataFrame]) -> Iterator[pd.DataFrame]:
+        """
+        Cleans a stream of DataFrame chunks one at a time.
+        Duplicates are only dropped within each chunk.
+        """
+        for chunk in chunks:
+            yield cls(chunk).clean_data()
@@ -1,34 +1,41 @@
 import os
 import sys
+from datetime import date
+from typing import Dict, Iterator, List, Optional, Tuple
+
 import pandas as pd
-from sqlalchemy import create_engine
-from dotenv import load_dotenv
 
 from src.DMARTProject.loggers.logger import logger
+from src.DMARTProject.utils.connection import build_database_url, get_engine
+from src.DMARTProject.utils.schema import apply_schema, get_schema
 from src.exception import CustomException
 
-load_dotenv()
+
+DEFAULT_CHUNKSIZE = 100_000
 
 
 class DataIngestion:
-    def __init__(self):
+    def __init__(
+        self,
+        columns: Optional[List[str]] = None,
+        chunksize: int = DEFAULT_CHUNKSIZE,
+        schema_name: str = "sales",
+    ):
         try:
-            self.db_server = os.getenv("DB_SERVER")
-            self.db_database = os.getenv("DB_DATABASE")
-            self.db_driver = os.getenv("DB_DRIVER")
+            # .env is read here rather than at import time
+            from dotenv import load_dotenv
+
+            load_dotenv()
             self.table_name = os.getenv("TABLE_NAME")
+            # Explicit projection of the registry columns instead of SELECT *
+            self.schema = get_schema(schema_name)
+            self.columns = columns or self.schema.column_names
+            self.chunksize = chunksize
 
-            if not all([self.db_server, self.db_database, self.db_driver, self.table_name]):
-                raise ValueError(
-                    "Missing DB environment variables. "
-                    "Check DB_SERVER, DB_DATABASE, DB_DRIVER, TABLE_NAME in .env"
-                )
+            if not self.table_name:
+                raise ValueError("Missing TABLE_NAME environment variable. Check .env")
 
-            self.database_url = (
-                f"mssql+pyodbc://@{self.db_server}/{self.db_database}"
-                f"?driver={self.db_driver.replace(' ', '+')}"
-                f"&trusted_connection=yes"
-            )
+            self.database_url = build_database_url()
 
             logger.info("Database connection initialized")
 
@@ -36,11 +43,37 @@ class DataIngestion:
             logger.exception("Error initializing DataIngestion")
             raise CustomException(e, sys)
 
+    def _build_query(self, where: Optional[str] = None) -> str:
+        query = f"SELECT {', '.join(self.columns)} FROM {self.table_name}"
+        if where:
+            query += f" WHERE {where}"
+        return query
+
+    @staticmethod
+    def _watermark_filter(watermark: Dict) -> Tuple[str, Dict]:
+        """
+        Builds the WHERE clause for rows past the watermark: new SalesIDs, plus
+        every row on or after the last OrderDate so late edits to the most
+        recent day are picked up again.
+        """
+        conditions, params = [], {}
+        if "SalesID" in watermark:
+            conditions.append("SalesID > :last_sales_id")
+            params["last_sales_id"] = int(watermark["SalesID"])
+        if "OrderDate" in watermark:
+            conditions.append("OrderDate >= :last_order_date")
+            params["last_order_date"] = date.fromisoformat(watermark["OrderDate"])
+
+        if not conditions:
+            raise ValueError(f"Watermark has no SalesID/OrderDate entry: {watermark}")
+
+        return " OR ".join(conditions), params
+
     def load_data(self) -> pd.DataFrame:
         try:
-            engine = create_engine(self.database_url)
-            query = f"SELECT * FROM {self.table_name}"
-            df = pd.read_sql(query, engine)
+            engine = get_engine(self.database_url)
+            query = self._build_query()
+            df = apply_schema(pd.read_sql(query, engine), self.schema)
 
             logger.info("Data loaded successfully from MSSQL")
             return df
@@ -48,3 +81,48 @@ class DataIngestion:
         except Exception as e:
             logger.exception("Error loading data from MSSQL")
             raise CustomException(e, sys)
+
+    def load_incremental(self, watermark: Dict) -> pd.DataFrame:
+        """
+        Loads only the rows past `watermark` (see WatermarkStore).
+        """
+        from sqlalchemy import text
+
+        try:
+            engine = get_engine(self.database_url)
+            where, params = self._watermark_filter(watermark)
+            df = pd.read_sql(text(self._build_query(where)), engine, params=params)
+            df = apply_schema(df, self.schema)
+
+            logger.info(f"Incremental load fetched {len(df)} rows past watermark {watermark}")
+            return df
+
+        except Exception as e:
+            logger.exception("Error loading incremental data from MSSQL")
+            raise CustomException(e, sys)
+
+    def stream_data(self, chunksize: Optional[int] = None) -> Iterator[pd.DataFrame]:
+        """
+        Yields the sales table in DataFrame chunks of at most `chunksize` rows.
+        Uses a server-side cursor so only one chunk is held in memory at a time;
+        every chunk is cast to the registry dtypes (int32/float32/category...).
+        """
+        from sqlalchemy import text
+
+        chunksize = chunksize or self.chunksize
+        try:
+            engine = get_engine(self.database_url)
+            query = text(self._build_query())
+
+            total_rows = 0
+            with engine.connect().execution_options(stream_results=True) as conn:
+                for chunk in pd.read_sql(query, conn, chunksize=chunksize):
+                    total_rows += len(chunk)
+                    logger.debug("Chunk fetched", extra={"rows": len(chunk), "total_rows": total_rows})
+                    yield apply_schema(chunk, self.schema)
+
+            logger.info(f"Streamed {total_rows} rows from MSSQL in chunks of {chunksize}")
+
+        except Exception as e:
+            logger.exception("Error streaming data from MSSQL")
+            raise CustomException(e, sys)
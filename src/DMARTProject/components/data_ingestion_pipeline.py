@@ -1,50 +1,239 @@
+import hashlib
 import os
 import sys
 from src.DMARTProject.components.data_ingestion import DataIngestion
+from src.DMARTProject.components.data_split import DataSplitConfig, DataSplitter
+from src.DMARTProject.components.deduplication import row_hashes
 from src.DMARTProject.utils.common import create_directories
+from src.DMARTProject.utils.dag import content_hash
+from src.DMARTProject.utils.watermark import WatermarkStore
+from src.DMARTProject.utils.artifacts import (
+    artifact_path,
+    open_artifact_writer,
+    read_artifact,
+    write_artifact,
+)
 from src.DMARTProject.loggers.logger import logger
 from src.exception import CustomException
-from sklearn.model_selection import train_test_split
+from typing import Dict, Iterator, List, Optional, Tuple
+import pandas as pd
 
 
 class DataIngestionPipeline:
-    def initiate_data_ingestion(self):
+    def __init__(
+        self,
+        watermark_store: Optional[WatermarkStore] = None,
+        artifact_format: Optional[str] = None,
+        export_csv: bool = False,
+        split_config: DataSplitConfig = DataSplitConfig(),
+    ):
+        self.watermark_store = watermark_store or WatermarkStore()
+        self.artifact_format = artifact_format
+        self.export_csv = export_csv
+        self.split_config = split_config
+        # Rows new or changed by the last extract() call (the delta when
+        # incremental, re-extracted unchanged rows left out)
+        self.last_delta: Optional[pd.DataFrame] = None
+        # How many of those rows replaced a stored row with the same SalesID
+        self.last_replaced = 0
+        # (table, extracted rows) whose watermark commit_watermark() records
+        self._pending_watermark: Optional[Tuple[str, pd.DataFrame]] = None
+        # Identity of the raw data after the last extract() call, see _next_version
+        self.last_version: Optional[str] = None
+
+    def _artifact_path(self, name: str) -> str:
+        return artifact_path("artifacts", name, self.artifact_format)
+
+    def _save(self, df: pd.DataFrame, name: str) -> str:
+        path = write_artifact(df, self._artifact_path(name))
+        if self.export_csv:
+            write_artifact(df, artifact_path("artifacts", name, "csv"))
+        return path
+
+    def _version_path(self) -> str:
+        return f"{self._artifact_path('raw_data')}.version"
+
+    def _read_version(self) -> Optional[str]:
+        path = self._version_path()
+        if not os.path.exists(path):
+            return None
+        with open(path) as fp:
+            return fp.read().strip() or None
+
+    def _next_version(self, df: pd.DataFrame, changes: Optional[pd.DataFrame]) -> str:
+        """
+        Identity of the raw data: a hash of the whole frame after a full
+        load; after an incremental one, the stored version chained with a
+        hash of the changed rows, so it changes whenever the raw data does
+        without rehashing every row.
+        """
+        previous = self._read_version() if changes is not None else None
+        if previous is None:
+            return content_hash(df)
+        if changes.empty:
+            return previous
+        return hashlib.blake2b(f"{previous}:{content_hash(changes)}".encode(), digest_size=16).hexdigest()
+
+    def _merge_delta(self, raw_path: str, delta_df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        Merges newly extracted rows into the existing raw artifact and
+        returns the merged frame and the delta rows that changed it.
+        Rows re-extracted for an existing SalesID replace the stored version;
+        the watermark re-reads the last OrderDate, so re-extracted rows that
+        are identical to the stored version are not part of the changes.
+        """
+        existing_df = read_artifact(raw_path)
+
+        stored = existing_df[existing_df["SalesID"].isin(delta_df["SalesID"])]
+        delta_rows = pd.DataFrame({"SalesID": delta_df["SalesID"].to_numpy(), "hash": row_hashes(delta_df)})
+        # Nullable, so new SalesIDs (no stored hash) do not turn the hashes into floats
+        stored_rows = pd.DataFrame(
+            {"SalesID": stored["SalesID"].to_numpy(), "hash": pd.array(row_hashes(stored), dtype="UInt64")}
+        )
+        matched = delta_rows.merge(stored_rows, how="left", on="SalesID", suffixes=("", "_stored"))
+        unchanged = (matched["hash"] == matched["hash_stored"]).fillna(False).to_numpy(dtype=bool)
+        changes = delta_df[~unchanged]
+        self.last_replaced = int(changes["SalesID"].isin(stored["SalesID"]).sum())
+
+        merged = pd.concat([existing_df, changes], ignore_index=True)
+        merged["OrderDate"] = pd.to_datetime(merged["OrderDate"])
+        merged = merged.drop_duplicates(subset="SalesID", keep="last")
+        return merged.sort_values("SalesID", ignore_index=True), changes
+
+    def extract(self, incremental: bool = False) -> pd.DataFrame:
+        """
+        Extracts the source table, saves the raw data artifact and returns
+        the raw frame for in-process hand-off to the next stage.
+        With `incremental=True`, only rows past the stored watermark are
+        extracted and merged into the existing raw artifact; the first run
+        (no watermark or no artifact yet) falls back to a full load.
+        The watermark is only advanced by commit_watermark(), once the
+        caller has persisted the rows, so a run that fails downstream
+        extracts them again.
+        """
         try:
             logger.info("Starting Data Ingestion Pipeline")
 
             # Call your DataIngestion class
             ingestion = DataIngestion()
-            df = ingestion.load_data()
-            print(df.head())
 
             # Create artifacts folder
             create_directories("artifacts")
+            raw_path = self._artifact_path("raw_data")
 
-            # Save raw data
-            raw_path = os.path.join("artifacts", "raw_data.csv")
-            df.to_csv(raw_path, index=False)
+            watermark = self.watermark_store.get(ingestion.table_name) if incremental else None
+
+            if watermark and os.path.exists(raw_path):
+                delta_df = ingestion.load_incremental(watermark)
+                df, changes = self._merge_delta(raw_path, delta_df)
+                version = self._next_version(df, changes)
+                logger.info(
+                    f"Merged {len(changes)} of {len(delta_df)} delta rows into raw data "
+                    f"({self.last_replaced} replaced, {len(df)} rows)"
+                )
+            else:
+                delta_df = changes = df = ingestion.load_data()
+                self.last_replaced = 0
+                version = self._next_version(df, None)
+            logger.debug(f"Raw data sample:\n{df.head()}")
+
+            # Save raw data; the old version goes first, so a failed save
+            # leaves no version rather than a stale one
+            if os.path.exists(self._version_path()):
+                os.remove(self._version_path())
+            self._save(df, "raw_data")
+            with open(self._version_path(), "w") as fp:
+                fp.write(version)
+            self.last_version = version
 
             logger.info(f"Raw data saved at {raw_path}")
+
+            self.last_delta = changes
+            self._pending_watermark = (ingestion.table_name, delta_df)
+
             logger.info("Data Ingestion Pipeline completed successfully")
+            return df
+
+        except Exception as e:
+            logger.exception("Data Ingestion Pipeline failed")
+            raise CustomException(e, sys)
 
+    def commit_watermark(self) -> Optional[Dict]:
+        """
+        Advances the watermark to the rows of the last extract() call.
+        Call it once those rows are persisted downstream.
+        """
+        if self._pending_watermark is None:
+            return None
+        table_name, delta_df = self._pending_watermark
+        watermark = self.watermark_store.update(table_name, delta_df)
+        self._pending_watermark = None
+        logger.info(f"Watermark for {table_name} set to {watermark}")
+        return watermark
+
+    def _split_paths(self, name: str) -> List[str]:
+        paths = [self._artifact_path(name)]
+        if self.export_csv:
+            paths.append(artifact_path("artifacts", name, "csv"))
+        return paths
+
+    def split(self, df: pd.DataFrame) -> Tuple[str, str]:
+        """
+        Splits the raw frame into train/test artifacts and returns their paths.
+        By default rows are assigned by a hash of SalesID (see
+        components/data_split.py), so a row stays in the same split when
+        incremental loads add new rows.
+        """
+        try:
             ## Split DAta
-            train_df, test_df = train_test_split(
-                df,
-                test_size=0.2,
-                random_state=42
-            )
+            splitter = DataSplitter(self.split_config)
+            train_df, test_df = splitter.split_frame(df)
             # Save train and test data
-            train_path= os.path.join("artifacts", "train_data.csv")
-            test_path= os.path.join("artifacts", "test_data.csv")
-            
-            train_df.to_csv(train_path, index=False)
-            test_df.to_csv(test_path, index=False)
+            train_path = self._save(train_df, "train_data")
+            test_path = self._save(test_df, "test_data")
 
             logger.info("Train-test split completed successfully")
             logger.info(f"Train data saved at {train_path}")
             logger.info(f"Test data saved at {test_path}")
-            return (raw_path, train_path, test_path)
-        
+            return (train_path, test_path)
+
         except Exception as e:
-            logger.exception("Data Ingestion Pipeline failed")
+            logger.exception("Train-test split failed")
+            raise CustomException(e, sys)
+
+    def initiate_data_ingestion(self, incremental: bool = False):
+        df = self.extract(incremental)
+        train_path, test_path = self.split(df)
+        # The artifacts are the output here
+        self.commit_watermark()
+        return (self._artifact_path("raw_data"), train_path, test_path)
+
+    def initiate_streaming_ingestion(self, chunksize: Optional[int] = None) -> Iterator[pd.DataFrame]:
+        """
+        Streams the source table chunk by chunk, appending each chunk to the
+        raw data artifact and yielding it to the next stage. The hash-based
+        train/test artifacts are written in the same pass.
+        """
+        try:
+            logger.info("Starting streaming Data Ingestion Pipeline")
+
+            ingestion = DataIngestion()
+            create_directories("artifacts")
+            raw_path = self._artifact_path("raw_data")
+
+            splitter = DataSplitter(self.split_config)
+            with open_artifact_writer(raw_path) as writer:
+                chunks = splitter.split_chunks(
+                    ingestion.stream_data(chunksize),
+                    train_paths=self._split_paths("train_data"),
+                    test_paths=self._split_paths("test_data"),
+                )
+                for chunk in chunks:
+                    writer.write(chunk)
+                    yield chunk
+
+            logger.info(f"Raw data streamed to {raw_path} ({writer.rows_written} rows)")
+
+        except Exception as e:
+            logger.exception("Streaming Data Ingestion Pipeline failed")
             raise CustomException(e, sys)
@@ -0,0 +1,248 @@
+import hashlib
+import sys
+from contextlib import ExitStack
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.DMARTProject.loggers.logger import logger
+from src.DMARTProject.utils.artifacts import open_artifact_writer
+from src.exception import CustomException
+
+
+@dataclass
+class DataSplitConfig:
+    # "hash": each row is assigned from a hash of `key` (stable, streamable);
+    # "random": sklearn train_test_split on the whole frame
+    method: str = "hash"
+    key: str = "SalesID"
+    test_size: float = 0.2
+    # Mixed into the hash; changing it reshuffles every row
+    salt: str = "dmart-split-v1"
+    # Columns the realized test share is reported by, e.g. ("ShipMode",);
+    # "Year" and "Month" are derived from OrderDate. Reporting only;
+    # defaults to the stratify columns
+    report_by: Tuple[str, ...] = ()
+    # Warn when a group's test share is further than this from test_size
+    # (checked for groups with at least min_group_rows rows)
+    max_group_deviation: float = 0.05
+    min_group_rows: int = 500
+    # Columns the split is stratified by (same derived columns as
+    # report_by): sklearn's stratify for method="random", a salt per
+    # stratum for method="hash"
+    stratify: Tuple[str, ...] = ()
+    # Seed of method="random"
+    random_state: int = 42
+
+
+@dataclass
+class SplitReport:
+    """
+    Row counts per split, overall and per report_by group; mergeable
+    across chunks.
+    """
+
+    train_rows: int = 0
+    test_rows: int = 0
+    # group -> [train rows, test rows]
+    groups: Dict[Tuple, List[int]] = field(default_factory=dict)
+
+    def add(self, is_test: np.ndarray, groups: Optional[pd.DataFrame] = None):
+        n_test = int(is_test.sum())
+        self.test_rows += n_test
+        self.train_rows += len(is_test) - n_test
+        if groups is not None and len(groups):
+            counts = (
+                groups.assign(_test=is_test)
+                .groupby(list(groups.columns), observed=True, dropna=False)["_test"]
+                .agg(["size", "sum"])
+            )
+            for group, (size, test) in counts.iterrows():
+                group = group if isinstance(group, tuple) else (group,)
+                entry = self.groups.setdefault(group, [0, 0])
+                entry[0] += int(size - test)
+                entry[1] += int(test)
+
+    @property
+    def test_share(self) -> float:
+        total = self.train_rows + self.test_rows
+        return self.test_rows / total if total else 0.0
+
+    def group_shares(self) -> pd.DataFrame:
+        rows = [
+            {"group": group, "train_rows": train, "test_rows": test, "test_share": test / (train + test)}
+            for group, (train, test) in self.groups.items()
+        ]
+        return pd.DataFrame(rows, columns=["group", "train_rows", "test_rows", "test_share"])
+
+
+def _mix64(values: np.ndarray) -> np.ndarray:
+    """
+    SplitMix64 finalizer: a fixed, platform-independent 64-bit mix, so a
+    key always lands in the same split regardless of pandas version.
+    """
+    z = values.astype(np.uint64, copy=True)
+    z ^= z >> np.uint64(30)
+    z *= np.uint64(0xBF58476D1CE4E5B9)
+    z ^= z >> np.uint64(27)
+    z *= np.uint64(0x94D049BB133111EB)
+    z ^= z >> np.uint64(31)
+    return z
+
+
+class DataSplitter:
+    """
+    Train/test split that assigns each row on its own: a row goes to test
+    when hash(salt, key) maps below test_size. The assignment depends only
+    on the key, so it is the same chunk by chunk, in any order, and across
+    incremental loads (rows already split never move).
+
+    With `stratify`, the threshold is applied within each stratum: the
+    salt is mixed with the row's stratum values, so every stratum is split
+    on its own and the assignment still needs nothing but the row itself.
+    A row moves only if its stratum values change. Each stratum's test
+    share matches test_size in expectation; an exact per-stratum quota
+    would need the whole stratum up front and would move rows as new ones
+    arrive. The realized shares are reported per stratum (or per
+    `report_by` group) and large deviations are logged.
+    """
+
+    def __init__(self, config: DataSplitConfig = DataSplitConfig()):
+        if not 0 < config.test_size < 1:
+            raise ValueError(f"test_size must be between 0 and 1, got {config.test_size}")
+        self.config = config
+        self._salt = np.uint64(int.from_bytes(hashlib.blake2b(config.salt.encode(), digest_size=8).digest(), "little"))
+        self._threshold = np.uint64(int(config.test_size * 2 ** 64) - 1)
+        self.report = SplitReport()
+
+    # ==========================
+    # ASSIGNMENT
+    # ==========================
+    def _stratum_salts(self, strata: pd.DataFrame) -> np.ndarray:
+        # One salt per distinct stratum, from the salt and the stratum's values
+        codes, uniques = pd.factorize(pd.MultiIndex.from_frame(strata), use_na_sentinel=False)
+        salts = np.array(
+            [
+                int.from_bytes(
+                    hashlib.blake2b("|".join([self.config.salt, *map(str, values)]).encode(), digest_size=8).digest(),
+                    "little",
+                )
+                for values in uniques
+            ],
+            dtype=np.uint64,
+        )
+        return salts[codes]
+
+    def _key_hashes(self, keys: pd.Series, salts: Optional[np.ndarray] = None) -> np.ndarray:
+        if pd.api.types.is_integer_dtype(keys.dtype):
+            if keys.isna().any():
+                raise ValueError(f"Split key {self.config.key} has nulls")
+            values = keys.to_numpy(dtype="int64").view(np.uint64)
+        else:
+            # Non-integer keys (e.g. OrderID): keyed hash of the string form
+            values = pd.util.hash_array(keys.astype(str).to_numpy(dtype=object), hash_key=self.config.salt[:16].ljust(16, "0"))
+        return _mix64(values ^ (self._salt if salts is None else salts))
+
+    def is_test(self, df: pd.DataFrame) -> np.ndarray:
+        """
+        Boolean mask of the rows of `df` assigned to the test split.
+        """
+        if self.config.key not in df.columns:
+            raise KeyError(f"Split key {self.config.key} not in columns")
+        strata = self._groups(df, self.config.stratify)
+        salts = self._stratum_salts(strata) if strata is not None else None
+        return self._key_hashes(df[self.config.key], salts) < self._threshold
+
+    @staticmethod
+    def _groups(df: pd.DataFrame, names: Sequence[str]) -> Optional[pd.DataFrame]:
+        if not names:
+            return None
+        columns = {}
+        for name in names:
+            if name in df.columns:
+                columns[name] = df[name]
+            elif name in ("Year", "Month"):
+                order_date = pd.to_datetime(df["OrderDate"])
+                columns[name] = order_date.dt.year if name == "Year" else order_date.dt.month
+            else:
+                raise KeyError(f"Split group column {name} not in columns")
+        return pd.DataFrame(columns, index=df.index)
+
+    def _assign(self, df: pd.DataFrame) -> np.ndarray:
+        is_test = self.is_test(df)
+        self.report.add(is_test, self._groups(df, self.config.report_by or self.config.stratify))
+        return is_test
+
+    # ==========================
+    # PUBLIC API
+    # ==========================
+    def split_frame(self, df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        (train, test) for an in-memory frame.
+        """
+        if self.config.method == "random":
+            from sklearn.model_selection import train_test_split
+
+            stratify = self._groups(df, self.config.stratify)
+            if stratify is not None:
+                stratify = stratify.astype(str).agg("|".join, axis=1)
+            return train_test_split(
+                df, test_size=self.config.test_size, random_state=self.config.random_state, stratify=stratify
+            )
+        if self.config.method != "hash":
+            raise ValueError(f"Unknown split method: {self.config.method}")
+
+        is_test = self._assign(df)
+        self.log_report()
+        return df[~is_test], df[is_test]
+
+    def split_chunks(
+        self,
+        chunks: Iterable[pd.DataFrame],
+        train_paths: Sequence[str],
+        test_paths: Sequence[str],
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Writes every chunk's train and test rows to all `train_paths` /
+        `test_paths` artifacts as the chunks pass through, so both outputs
+        are produced in the same single pass that feeds the next stage.
+        Yields the chunks unchanged.
+        """
+        if self.config.method != "hash":
+            raise ValueError("Streaming split requires method='hash'")
+        try:
+            with ExitStack() as stack:
+                train_writers = [stack.enter_context(open_artifact_writer(path)) for path in train_paths]
+                test_writers = [stack.enter_context(open_artifact_writer(path)) for path in test_paths]
+                for chunk in chunks:
+                    is_test = self._assign(chunk)
+                    train, test = chunk[~is_test], chunk[is_test]
+                    for writer in train_writers:
+                        writer.write(train)
+                    for writer in test_writers:
+                        writer.write(test)
+                    yield chunk
+            self.log_report()
+
+        except Exception as e:
+            logger.exception("Streaming train-test split failed")
+            raise CustomException(e, sys)
+
+    def log_report(self):
+        report = self.report
+        logger.info(
+            f"Split {report.train_rows} train / {report.test_rows} test rows "
+            f"(test share {report.test_share:.4f}, target {self.config.test_size})",
+            extra={"train_rows": report.train_rows, "test_rows": report.test_rows},
+        )
+        if not report.groups:
+            return
+        shares = report.group_shares()
+        sized = shares[shares["train_rows"] + shares["test_rows"] >= self.config.min_group_rows]
+        off = sized[(sized["test_share"] - self.config.test_size).abs() > self.config.max_group_deviation]
+        for row in off.itertuples():
+            logger.warning(
+                f"Group {row.group} test share {row.test_share:.4f} deviates from {self.config.test_size}"
+            )
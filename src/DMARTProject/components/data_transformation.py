@@ -2,34 +2,48 @@ import os
 import sys
 import pandas as pd
 from dataclasses import dataclass
+from typing import Optional
 
 from src.DMARTProject.loggers.logger import logger
+from src.DMARTProject.utils.artifacts import read_artifact, write_artifact
+from src.DMARTProject.utils.common import as_dataframe
+from src.DMARTProject.utils.schema import get_schema
 from src.exception import CustomException
 
 
 @dataclass
 class DataTransformationConfig:
-    validated_data_path: str = "artifacts/validated/validated_data.csv"
+    validated_data_path: str = "artifacts/validated/validated_data.parquet"
     transformed_data_dir: str = "artifacts/transformed"
-    transformed_data_path: str = "artifacts/transformed/transformed_data.csv"
+    transformed_data_path: str = "artifacts/transformed/transformed_data.parquet"
 
 
 class DataTransformation:
     def __init__(self, config: DataTransformationConfig = DataTransformationConfig()):
         self.config = config
 
-    def transform(self) -> pd.DataFrame:
+    def transform(self, df: Optional[pd.DataFrame] = None, checkpoint: bool = False) -> pd.DataFrame:
+        """
+        Transforms validated data passed in memory (DataFrame or Arrow table),
+        or read from the validated artifact when `df` is omitted.
+        The transformed artifact is only written when `checkpoint` is True.
+        """
         try:
             logger.info("Starting data transformation")
 
             # Read validated data
-            df = pd.read_csv(self.config.validated_data_path)
-            logger.info(f"Validated data loaded. Shape: {df.shape}")
+            if df is None:
+                # Registry dtypes, as the validation stage hands them over in memory
+                df = read_artifact(self.config.validated_data_path, schema=get_schema())
+                logger.info(f"Validated data loaded. Shape: {df.shape}")
+            else:
+                # Shallow copy: column assignments below stay out of the caller's frame
+                df = as_dataframe(df).copy(deep=False)
+                logger.info(f"Validated data received in memory. Shape: {df.shape}")
 
             # -------------------------
             # 1. Handle missing values
             # -------------------------
-            df.isnable().sum()
             df["Discount"] = df["Discount"].fillna(0)
             df["Profit"] = df["Profit"].fillna(0)
             logger.info("Missing values handled")
@@ -52,12 +66,13 @@ class DataTransformation:
             # -------------------------
             # Save transformed data
             # -------------------------
-            os.makedirs(self.config.transformed_data_dir, exist_ok=True)
-            df.to_csv(self.config.transformed_data_path, index=False)
+            if checkpoint:
+                os.makedirs(self.config.transformed_data_dir, exist_ok=True)
+                write_artifact(df, self.config.transformed_data_path)
 
-            logger.info(
-                f"Transformed data saved at {self.config.transformed_data_path}"
-            )
+                logger.info(
+                    f"Transformed data saved at {self.config.transformed_data_path}"
+                )
 
             return df
 
@@ -1,29 +1,61 @@
 import os
 import sys
+import numpy as np
 import pandas as pd
 from dataclasses import dataclass
+from functools import reduce
+from typing import Iterable, Iterator, Optional, Tuple
 
+from src.DMARTProject.components.validation_rules import RuleEngine, ValidationReport
 from src.DMARTProject.loggers.logger import logger
+from src.DMARTProject.utils.artifacts import open_artifact_writer, read_artifact, write_artifact
+from src.DMARTProject.utils.common import as_dataframe
+from src.DMARTProject.utils.parallel import ParallelConfig, concat_partitions, partition_frame, run_partitioned
+from src.DMARTProject.utils.schema import apply_schema, get_schema
 from src.exception import CustomException
 
-print(">>> RUNNING LATEST DATA_VALIDATION.PY <<<")
-
 
 @dataclass
 class DataValidationConfig:
-    raw_data_path: str = "artifacts/raw_data.csv"
+    raw_data_path: str = "artifacts/raw_data.parquet"
     validated_data_dir: str = "artifacts/validated"
-    validated_data_path: str = "artifacts/validated/validated_data.csv"
+    validated_data_path: str = "artifacts/validated/validated_data.parquet"
+    # "raise" fails on any invalid row, "quarantine" sets invalid rows aside
+    on_error: str = "raise"
+    quarantine_data_path: str = "artifacts/validated/quarantine_data.parquet"
+    # Schema registry entry (config.py) the rules are derived from
+    schema_name: str = "sales"
+
+
+def _evaluate_partition(df: pd.DataFrame, schema_name: str) -> Tuple[pd.DataFrame, ValidationReport]:
+    # Runs in a worker process (see DataValidation.validate_parallel)
+    schema = get_schema(schema_name)
+    df = apply_schema(df, schema)
+    return df, RuleEngine.from_schema(schema).evaluate(df)
 
 
 class DataValidation:
     def __init__(self, config: DataValidationConfig = DataValidationConfig()):
         self.config = config
-
-    def validate(self) -> pd.DataFrame:
+        self.schema = get_schema(config.schema_name)
+        self.rule_engine = RuleEngine.from_schema(self.schema)
+        self.last_report: Optional[ValidationReport] = None
+        self.quarantined: Optional[pd.DataFrame] = None
+
+    def validate(
+        self,
+        df: Optional[pd.DataFrame] = None,
+        checkpoint: bool = False,
+        parallel: Optional[ParallelConfig] = None,
+    ) -> pd.DataFrame:
         """
-        Runs data validation checks.
+        Runs data validation checks against the schema registry (config.py).
         Allows business-approved nulls in Discount & Profit.
+
+        `df` may be an in-memory DataFrame or Arrow table handed over by the
+        ingestion stage; when omitted, the raw data artifact is read from disk.
+        The validated artifact is only written when `checkpoint` is True.
+        With a `parallel` config the rules run partitioned on a process pool.
         """
         try:
             logger.info("Starting data validation")
@@ -31,110 +63,132 @@ class DataValidation:
             # -----------------------------
             # Read raw data
             # -----------------------------
-            if not os.path.exists(self.config.raw_data_path):
-                raise FileNotFoundError("Raw data file not found")
-
-            df = pd.read_csv(self.config.raw_data_path)
-            logger.info(f"Raw data loaded. Shape: {df.shape}")
+            if df is None:
+                if not os.path.exists(self.config.raw_data_path):
+                    raise FileNotFoundError("Raw data file not found")
+
+                df = read_artifact(self.config.raw_data_path, schema=self.schema)
+                logger.info(f"Raw data loaded. Shape: {df.shape}")
+            else:
+                # Shallow copy: column assignments below stay out of the caller's frame
+                df = as_dataframe(df).copy(deep=False)
+                logger.info(f"Raw data received in memory. Shape: {df.shape}")
+
+            if parallel is not None:
+                df = self.validate_parallel(df, parallel)
+            else:
+                df = self.validate_frame(df)
+
+            if self.quarantined is not None:
+                write_artifact(self.quarantined, self.config.quarantine_data_path)
+                logger.info(f"Quarantined rows saved at {self.config.quarantine_data_path}")
 
             # -----------------------------
-            # 1. Schema validation
-            # -----------------------------
-            expected_columns = {
-                "SalesID",
-                "OrderID",
-                "OrderDate",
-                "ProductID",
-                "CustomerID",
-                "RegionID",
-                "ShipMode",
-                "Quantity",
-                "Discount",
-                "SalesAmount",
-                "Profit",
-                "LocationID",
-                "FeedbackProvided"
-            }
-
-            actual_columns = set(df.columns)
-
-            missing_cols = expected_columns - actual_columns
-            extra_cols = actual_columns - expected_columns
-
-            if missing_cols:
-                raise ValueError(f"Missing columns: {missing_cols}")
-
-            if extra_cols:
-                raise ValueError(f"Unexpected columns: {extra_cols}")
-
-            logger.info("Schema validation passed")
-
-            # -----------------------------
-            # 2. Null validation (BUSINESS-AWARE)
-            # -----------------------------
-            allowed_nulls = {"Discount", "Profit"}
-
-            null_counts = df.isna().sum()
-
-            invalid_nulls = {
-                col: cnt for col, cnt in null_counts.items()
-                if cnt > 0 and col not in allowed_nulls
-            }
-
-            if invalid_nulls:
-                raise ValueError(f"Unexpected nulls found: {invalid_nulls}")
-
-            logger.info("Null validation passed (business-aware)")
-
-            # -----------------------------
-            # 3. Datatype validation
+            # Save validated data
             # -----------------------------
-            df["OrderDate"] = pd.to_datetime(df["OrderDate"], errors="raise")
-
-            numeric_columns = [
-                "Quantity",
-                "Discount",
-                "SalesAmount",
-                "Profit"
-            ]
-
-            for col in numeric_columns:
-                if not pd.api.types.is_numeric_dtype(df[col]):
-                    raise TypeError(f"{col} must be numeric")
+            if checkpoint:
+                os.makedirs(self.config.validated_data_dir, exist_ok=True)
+                write_artifact(df, self.config.validated_data_path)
 
-            if not pd.api.types.is_bool_dtype(df["FeedbackProvided"]):
-                raise TypeError("FeedbackProvided must be boolean")
+                logger.info(
+                    f"Validated data saved at {self.config.validated_data_path}"
+                )
 
-            logger.info("Datatype validation passed")
+            logger.info("Data validation completed successfully")
+            return df
 
-            # -----------------------------
-            # 4. Business rule validation
-            # -----------------------------
-            if (df["Quantity"] <= 0).any():
-                raise ValueError("Quantity must be greater than 0")
+        except Exception as e:
+            logger.exception("Data validation failed")
+            raise CustomException(e, sys)
 
-            if not ((df["Discount"].dropna() >= 0) & (df["Discount"].dropna() <= 1)).all():
-                raise ValueError("Discount must be between 0 and 1")
+    def validate_frame(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Casts `df` to the registry dtypes, then applies schema, null,
+        datatype and business rule checks in a single pass (see RuleEngine).
 
-            if (df["SalesAmount"] <= 0).any():
-                raise ValueError("SalesAmount must be greater than 0")
+        Schema and dtype failures always raise. Row-level violations raise
+        with the count for every failed rule, or, with on_error="quarantine",
+        the offending rows are set aside in `self.quarantined` and the
+        remaining rows are returned.
+        """
+        df = apply_schema(df, self.schema)
+        return self._apply_report(df, self.rule_engine.evaluate(df))
 
-            # Profit CAN be negative (losses allowed)
-            logger.info("Business rule validation passed")
+    def validate_parallel(self, df: pd.DataFrame, parallel: ParallelConfig = ParallelConfig()) -> pd.DataFrame:
+        """
+        Same as validate_frame, but the frame is split into row-range or
+        OrderDate-month partitions that are cast and evaluated on a process
+        pool. Every rule is row-local, so the per-partition reports are
+        merged into one report for the whole frame.
+        """
+        partitions = partition_frame(df, parallel)
+        results = run_partitioned(_evaluate_partition, partitions, parallel, self.config.schema_name)
+        logger.info(f"Validated {len(df)} rows in {len(partitions)} partitions")
+
+        df = concat_partitions([part for part, _ in results])
+        report = reduce(ValidationReport.merge, [report for _, report in results])
+
+        # Month partitions interleave rows; restore the input order, also
+        # for the quarantined rows
+        if not df.index.is_monotonic_increasing:
+            order = np.argsort(df.index.to_numpy(), kind="stable")
+            df = df.iloc[order]
+            report.row_mask = report.row_mask[order]
+        return self._apply_report(df, report)
+
+    def _apply_report(self, df: pd.DataFrame, report: ValidationReport) -> pd.DataFrame:
+        self.last_report = report
+        self.quarantined = None
+
+        if report.errors:
+            raise ValueError(report.summary())
+        logger.info("Schema and datatype validation passed")
+
+        if report.invalid_rows:
+            if self.config.on_error != "quarantine":
+                raise ValueError(f"Validation failed: {report.summary()}")
+
+            self.quarantined = df[report.row_mask]
+            # Columns left uncast because of the quarantined rows (e.g. a
+            # null in a bool column) get their schema dtype now
+            df = apply_schema(df[~report.row_mask], self.schema)
+            logger.warning(
+                f"Quarantined {report.invalid_rows} of {report.row_count} rows: {report.summary()}"
+            )
 
-            # -----------------------------
-            # Save validated data
-            # -----------------------------
-            os.makedirs(self.config.validated_data_dir, exist_ok=True)
-            df.to_csv(self.config.validated_data_path, index=False)
+        # Profit CAN be negative (losses allowed)
+        logger.info("Null and business rule validation passed")
 
-            logger.info(
-                f"Validated data saved at {self.config.validated_data_path}"
-            )
+        return df
 
-            logger.info("Data validation completed successfully")
-            return df
+    def validate_chunks(self, chunks: Iterable[pd.DataFrame]) -> Iterator[pd.DataFrame]:
+        """
+        Validates a stream of DataFrame chunks (e.g. from
+        DataIngestion.stream_data) and yields each validated chunk.
+        """
+        quarantine_writer = None
+        try:
+            total_rows = 0
+            for chunk in chunks:
+                chunk = self.validate_frame(chunk)
+                if self.quarantined is not None:
+                    if quarantine_writer is None:
+                        quarantine_writer = open_artifact_writer(self.config.quarantine_data_path)
+                    quarantine_writer.write(self.quarantined)
+                total_rows += len(chunk)
+                yield chunk
+
+            logger.info(f"Streaming validation passed for {total_rows} rows")
+            if quarantine_writer is not None:
+                logger.info(
+                    f"{quarantine_writer.rows_written} quarantined rows saved at "
+                    f"{self.config.quarantine_data_path}"
+                )
 
         except Exception as e:
-            logger.exception("Data validation failed")
+            logger.exception("Streaming data validation failed")
             raise CustomException(e, sys)
+
+        finally:
+            if quarantine_writer is not None:
+                quarantine_writer.close()
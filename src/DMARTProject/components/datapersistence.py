@@ -1,17 +1,296 @@
-from sqlalchemy import create_engine, text
 import pandas as pd
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional
+
+from config import TableSchema
+from src.DMARTProject.loggers.logger import logger
+from src.DMARTProject.utils.connection import get_engine
+from src.DMARTProject.utils.schema import get_schema
+
+# SQLAlchemy is imported inside the methods, on the first database call
+if TYPE_CHECKING:
+    from sqlalchemy.types import TypeEngine
+
+
+# Max bind parameters per statement, used to size multi-row VALUES batches
+MAX_BIND_PARAMS = {
+    "mssql": 2100,
+    "sqlite": 999,
+}
+
+
+@dataclass
+class BulkLoadConfig:
+    batch_size: int = 50_000
+    # None: executemany (fast_executemany on MSSQL), "multi": multi-row VALUES
+    method: Optional[str] = None
+    # Load `mode="replace"` writes into a staging table, then swap it in
+    use_staging: bool = True
+    staging_suffix: str = "_staging"
+
+
+def _string_length(col: str, schema: TableSchema) -> Optional[int]:
+    if col not in schema.column_names:
+        return None
+    spec = schema.column(col)
+    if spec.max_length:
+        return spec.max_length
+    if spec.domain:
+        return max(len(str(value)) for value in spec.domain)
+    return None
+
+
+def sql_types_for(df: pd.DataFrame, schema: Optional[TableSchema] = None) -> Dict[str, "TypeEngine"]:
+    """
+    Explicit SQL column types for `df`, so to_sql does not infer them
+    from the data. Category columns are typed by their categories.
+    String widths come from the schema, never from the values at hand:
+    the types are fixed by the first chunk or load and later chunks and
+    merges may carry longer values. Columns without a declared width get
+    an unbounded type (VARCHAR(max) on MSSQL).
+    """
+    from sqlalchemy import types as sqltypes
+
+    schema = schema or get_schema()
+    dtypes = {}
+    for col, dtype in df.dtypes.items():
+        if isinstance(dtype, pd.CategoricalDtype):
+            dtype = dtype.categories.dtype
+
+        if pd.api.types.is_bool_dtype(dtype):
+            dtypes[col] = sqltypes.Boolean()
+        elif pd.api.types.is_integer_dtype(dtype):
+            dtypes[col] = sqltypes.Integer() if dtype.itemsize <= 4 else sqltypes.BigInteger()
+        elif pd.api.types.is_float_dtype(dtype):
+            dtypes[col] = sqltypes.Float()
+        elif pd.api.types.is_datetime64_any_dtype(dtype):
+            dtypes[col] = sqltypes.DateTime()
+        else:
+            dtypes[col] = sqltypes.String(length=_string_length(col, schema))
+    return dtypes
+
 
 class DataPersistence:
-    def __init__(self, connection_string: str):
-        self.engine = create_engine(connection_string)
+    def __init__(self, connection_string: Optional[str] = None, config: BulkLoadConfig = BulkLoadConfig()):
+        self.config = config
+        # Shared pooled engine (fast_executemany on MSSQL), see utils/connection.py
+        self.engine = get_engine(connection_string)
+        self.dialect = self.engine.dialect.name
+
+    # ==========================
+    # BULK LOAD HELPERS
+    # ==========================
+    def _quote(self, name: str) -> str:
+        return self.engine.dialect.identifier_preparer.quote(name)
 
-    def write_to_sql(self, df, table_name, mode="replace"):
+    def _chunksize(self, n_columns: int) -> int:
+        if self.config.method != "multi":
+            return self.config.batch_size
+        max_params = MAX_BIND_PARAMS.get(self.dialect, 32_766)
+        return max(1, min(self.config.batch_size, max_params // max(n_columns, 1) - 1))
+
+    def _load(self, df: pd.DataFrame, table_name: str, if_exists: str, dtype: Dict):
         df.to_sql(
-        name=table_name,
-        con=self.engine,
-        if_exists=mode,
-        index=False
-    )
+            name=table_name,
+            con=self.engine,
+            if_exists=if_exists,
+            index=False,
+            chunksize=self._chunksize(df.shape[1]),
+            method=self.config.method,
+            dtype=dtype,
+        )
+
+    def _create_key_index(self, conn, table_name: str, key: str):
+        # Merges and the stored procedure join on the key
+        from sqlalchemy import text
+
+        conn.execute(text(
+            f"CREATE INDEX {self._quote(f'ix_{table_name}_{key}')} "
+            f"ON {self._quote(table_name)} ({self._quote(key)})"
+        ))
+
+    def _swap(self, staging_table: str, table_name: str, key: Optional[str] = None):
+        """
+        Replaces `table_name` with `staging_table` in one transaction,
+        indexed on `key` when given.
+        """
+        from sqlalchemy import inspect, text
+
+        with self.engine.begin() as conn:
+            if inspect(conn).has_table(table_name):
+                conn.execute(text(f"DROP TABLE {self._quote(table_name)}"))
+            if self.dialect == "mssql":
+                conn.execute(text(f"EXEC sp_rename '{staging_table}', '{table_name}'"))
+            else:
+                conn.execute(
+                    text(f"ALTER TABLE {self._quote(staging_table)} RENAME TO {self._quote(table_name)}")
+                )
+            # Named after the live table, so it does not clash with the
+            # index of a later merge's staging table
+            if key is not None:
+                self._create_key_index(conn, table_name, key)
+
+    def _apply_merge(self, conn, staging_table: str, table_name: str, columns: List[str], key: str) -> Dict:
+        """
+        Set-based merge of `staging_table` into `table_name` on `key`.
+        Rows identical to the live table are dropped from staging first, so
+        only changed rows are written. Returns inserted/updated/unchanged counts.
+        """
+        from sqlalchemy import text
+
+        t, s, k = self._quote(table_name), self._quote(staging_table), self._quote(key)
+        cols = [self._quote(c) for c in columns]
+        value_cols = [c for c in cols if c != k]
+
+        conn.execute(text(f"CREATE INDEX {self._quote(f'ix_{staging_table}_{key}')} ON {s} ({k})"))
+
+        # Null-safe comparison of every non-key column
+        same_row = " AND ".join(
+            f"(t.{c} = {s}.{c} OR (t.{c} IS NULL AND {s}.{c} IS NULL))" for c in value_cols
+        ) or "1 = 1"
+        unchanged = conn.execute(text(
+            f"DELETE FROM {s} WHERE EXISTS "
+            f"(SELECT 1 FROM {t} t WHERE t.{k} = {s}.{k} AND {same_row})"
+        )).rowcount
+
+        changed = conn.execute(text(f"SELECT COUNT(*) FROM {s}")).scalar()
+        updated = conn.execute(text(
+            f"SELECT COUNT(*) FROM {s} WHERE EXISTS (SELECT 1 FROM {t} t WHERE t.{k} = {s}.{k})"
+        )).scalar()
+
+        if self.dialect == "mssql":
+            conn.execute(text(
+                f"MERGE {t} AS t USING {s} AS s ON t.{k} = s.{k} "
+                f"WHEN MATCHED THEN UPDATE SET {', '.join(f't.{c} = s.{c}' for c in value_cols)} "
+                f"WHEN NOT MATCHED BY TARGET THEN INSERT ({', '.join(cols)}) "
+                f"VALUES ({', '.join(f's.{c}' for c in cols)});"
+            ))
+        else:
+            if value_cols:
+                assignments = ", ".join(
+                    f"{c} = (SELECT s.{c} FROM {s} s WHERE s.{k} = {t}.{k})" for c in value_cols
+                )
+                conn.execute(text(f"UPDATE {t} SET {assignments} WHERE {t}.{k} IN (SELECT {k} FROM {s})"))
+            conn.execute(text(
+                f"INSERT INTO {t} ({', '.join(cols)}) SELECT {', '.join(cols)} FROM {s} s "
+                f"WHERE NOT EXISTS (SELECT 1 FROM {t} t WHERE t.{k} = s.{k})"
+            ))
+
+        return {"inserted": changed - updated, "updated": updated, "unchanged": unchanged}
+
+    def _report(self, table_name: str, rows: int, started: float) -> Dict:
+        seconds = time.perf_counter() - started
+        stats = {
+            "table": table_name,
+            "rows": rows,
+            "seconds": round(seconds, 3),
+            "rows_per_sec": round(rows / seconds, 1) if seconds > 0 else float(rows),
+        }
+        logger.info(f"Bulk load into {table_name}: {stats}")
+        return stats
+
+    # ==========================
+    # PUBLIC API
+    # ==========================
+    def write_to_sql(self, df, table_name, mode="replace", key: str = "SalesID") -> Dict:
+        """
+        Bulk-loads `df` into `table_name` and returns throughput stats.
+        With staging enabled, `mode="replace"` loads into a staging table
+        first, so the live table is only swapped out once the load succeeded.
+        `mode="merge"` upserts on `key` instead (see merge_into).
+        """
+        if mode == "merge":
+            return self.merge_into(df, table_name, key=key)
+        return self.write_chunks([df], table_name, mode=mode, key=key)
+
+    def merge_into(self, df: pd.DataFrame, table_name: str, key: str = "SalesID") -> Dict:
+        """
+        Upserts `df` into `table_name` keyed on `key`: new keys are inserted,
+        changed rows updated and identical rows left untouched.
+        Returns throughput stats plus inserted/updated/unchanged counts.
+        """
+        from sqlalchemy import inspect, text
+
+        started = time.perf_counter()
+        dtype = sql_types_for(df)
+
+        if not inspect(self.engine).has_table(table_name):
+            self._load(df, table_name, if_exists="replace", dtype=dtype)
+            with self.engine.begin() as conn:
+                self._create_key_index(conn, table_name, key)
+            counts = {"inserted": len(df), "updated": 0, "unchanged": 0}
+        else:
+            staging_table = f"{table_name}{self.config.staging_suffix}"
+            self._load(df, staging_table, if_exists="replace", dtype=dtype)
+            with self.engine.begin() as conn:
+                counts = self._apply_merge(conn, staging_table, table_name, list(df.columns), key)
+                conn.execute(text(f"DROP TABLE {self._quote(staging_table)}"))
+
+        stats = self._report(table_name, len(df), started)
+        stats.update(counts)
+        logger.info(f"Merge into {table_name} on {key}: {counts}")
+        return stats
+
+    def write_chunks(
+        self, chunks: Iterable[pd.DataFrame], table_name: str, mode: str = "replace", key: str = "SalesID"
+    ) -> Dict:
+        """
+        Writes a stream of DataFrame chunks to a SQL table.
+        `mode` applies to the first chunk; later chunks are appended.
+        With `mode="merge"`, every chunk is upserted on `key`.
+        A table built by `mode="replace"` is indexed on `key`. An empty
+        stream cannot replace the table and raises ValueError.
+        Returns throughput stats (rows, seconds, rows_per_sec).
+        """
+        started = time.perf_counter()
+
+        if mode == "merge":
+            totals = {"inserted": 0, "updated": 0, "unchanged": 0}
+            rows_written = 0
+            for chunk in chunks:
+                counts = self.merge_into(chunk, table_name, key=key)
+                rows_written += counts["rows"]
+                for name in totals:
+                    totals[name] += counts[name]
+            stats = self._report(table_name, rows_written, started)
+            stats.update(totals)
+            return stats
+
+        staged = mode == "replace" and self.config.use_staging
+        target = f"{table_name}{self.config.staging_suffix}" if staged else table_name
+
+        rows_written = 0
+        dtype = None
+        for i, chunk in enumerate(chunks):
+            if dtype is None:
+                dtype = sql_types_for(chunk)
+                index_key = key if mode == "replace" and key in chunk.columns else None
+            chunk_started = time.perf_counter()
+            self._load(chunk, target, if_exists=mode if i == 0 else "append", dtype=dtype)
+            rows_written += len(chunk)
+            # Per-chunk detail; sampled/rate-limited by the logging backend
+            logger.debug(
+                f"Chunk {i} loaded into {target}",
+                extra={"chunk": i, "rows": len(chunk), "seconds": round(time.perf_counter() - chunk_started, 4)},
+            )
+
+        if dtype is None:
+            if mode == "replace":
+                # Nothing to build the table from; the old one stays as it was
+                raise ValueError(f"Replace of {table_name} received no chunks; the existing table is unchanged")
+        elif staged:
+            self._swap(target, table_name, index_key)
+        elif index_key is not None:
+            with self.engine.begin() as conn:
+                self._create_key_index(conn, table_name, index_key)
+        if mode == "replace" and rows_written == 0:
+            logger.warning(f"Replace of {table_name} wrote 0 rows; the table is now empty")
+
+        return self._report(table_name, rows_written, started)
+
     def call_stored_procedure(self, sp_name: str):
+        from sqlalchemy import text
+
         with self.engine.begin() as conn:
             conn.execute(text(f"EXEC {sp_name}"))
@@ -0,0 +1,195 @@
+import os
+import sys
+from dataclasses import dataclass
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from src.DMARTProject.components.datapersistence import DataPersistence
+from src.DMARTProject.loggers.logger import logger
+from src.DMARTProject.utils.artifacts import read_artifact, write_artifact
+from src.exception import CustomException
+
+
+@dataclass
+class KPICubeConfig:
+    cube_path: str = "artifacts/kpi/kpi_cube.parquet"
+    # SQL table the dashboard reads; None keeps the cube as an artifact only
+    table_name: Optional[str] = "DMART_KPI_Cube"
+    dimensions: Tuple[str, ...] = ("Year", "Month", "ProductID", "RegionID", "ShipMode")
+
+
+# Additive measures only, so cube slices can be summed and rolled up;
+# ratios are derived from them in KPICube.rollup
+MEASURES = {
+    "OrderCount": ("SalesID", "count"),
+    "TotalSales": ("SalesAmount", "sum"),
+    "TotalProfit": ("Profit", "sum"),
+    "TotalQuantity": ("Quantity", "sum"),
+    "DiscountSum": ("Discount", "sum"),
+    "LossCount": ("IsLoss", "sum"),
+}
+
+PERIOD = ["Year", "Month"]
+
+
+class KPICube:
+    """
+    Materialized dashboard aggregates: one row per observed
+    (Year, Month, ProductID, RegionID, ShipMode) with additive measures,
+    built in a single groupby over the cleaned data.
+    """
+
+    def __init__(self, config: KPICubeConfig = KPICubeConfig(), database_url: Optional[str] = None):
+        self.config = config
+        self.database_url = database_url
+        self.cube: Optional[pd.DataFrame] = None
+
+    # ==========================
+    # AGGREGATION
+    # ==========================
+    def aggregate(self, df: pd.DataFrame) -> pd.DataFrame:
+        order_date = pd.to_datetime(df["OrderDate"])
+        keys = {
+            "Year": order_date.dt.year.astype("int16"),
+            "Month": order_date.dt.month.astype("int8"),
+        }
+        # Sum in float64: float32 totals drift over millions of rows
+        measures = {col: df[col].astype("float64") for col in ("SalesAmount", "Profit", "Discount")}
+        facts = df.assign(**keys, **measures, IsLoss=df["Profit"] < 0)
+
+        cube = facts.groupby(list(self.config.dimensions), observed=True, sort=False).agg(**MEASURES)
+        return self._finalize(cube.reset_index())
+
+    def _finalize(self, cube: pd.DataFrame) -> pd.DataFrame:
+        # Plain (non-category) dimensions so cubes from different runs concat cleanly
+        for col in self.config.dimensions:
+            if isinstance(cube[col].dtype, pd.CategoricalDtype):
+                cube[col] = cube[col].astype(cube[col].cat.categories.dtype)
+        for col in ("OrderCount", "TotalQuantity", "LossCount"):
+            cube[col] = cube[col].astype("int64")
+        return cube.sort_values(list(self.config.dimensions), ignore_index=True)
+
+    def _combine(self, cubes: Iterable[pd.DataFrame]) -> pd.DataFrame:
+        cube = pd.concat(cubes, ignore_index=True)
+        cube = cube.groupby(list(self.config.dimensions), sort=False).sum().reset_index()
+        return self._finalize(cube)
+
+    # ==========================
+    # BUILD / UPDATE
+    # ==========================
+    def build(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Rebuilds the whole cube from `df`.
+        """
+        self.cube = self.aggregate(df)
+        return self.cube
+
+    def refresh(self, df: pd.DataFrame, periods: Iterable[Tuple[int, int]]) -> pd.DataFrame:
+        """
+        Incremental update: recomputes only the (Year, Month) slices in
+        `periods` from the rows of `df` in those months and keeps every
+        other slice of the stored cube. `df` must hold all rows of those
+        months (e.g. the merged raw data), so re-extracted rows are not
+        counted twice. Months whose stored order count no longer matches
+        `df` (e.g. a delta that never reached the cube) are recomputed too.
+        """
+        existing = self.load()
+        if existing is None:
+            return self.build(df)
+
+        drifted = set(self._drifted_periods(df, existing)) - set(periods)
+        if drifted:
+            logger.warning(f"KPI cube out of date for {len(drifted)} months outside the delta; recomputing them")
+        periods = sorted(set(periods) | drifted)
+        if not periods:
+            self.cube = existing
+            return self.cube
+        periods = pd.MultiIndex.from_tuples(periods, names=PERIOD)
+
+        order_date = pd.to_datetime(df["OrderDate"])
+        in_periods = pd.MultiIndex.from_arrays([order_date.dt.year, order_date.dt.month]).isin(periods)
+        stale = pd.MultiIndex.from_frame(existing[PERIOD]).isin(periods)
+
+        self.cube = self._combine([existing[~stale], self.aggregate(df[in_periods])])
+        logger.info(f"KPI cube refreshed for {len(periods)} months")
+        return self.cube
+
+    def _drifted_periods(self, df: pd.DataFrame, cube: pd.DataFrame) -> List[Tuple[int, int]]:
+        # Rows the groupby counts: a SalesID and every dimension present
+        order_date = pd.to_datetime(df["OrderDate"])
+        counted = order_date.notna() & df["SalesID"].notna()
+        for col in self.config.dimensions:
+            if col not in PERIOD:
+                counted &= df[col].notna()
+        expected = pd.DataFrame(
+            {"Year": order_date.dt.year[counted].astype("int64"), "Month": order_date.dt.month[counted].astype("int64")}
+        ).value_counts()
+        stored = cube.astype({"Year": "int64", "Month": "int64"}).groupby(PERIOD)["OrderCount"].sum()
+
+        diff = expected.sub(stored, fill_value=0)
+        return [(int(year), int(month)) for year, month in diff.index[diff != 0]]
+
+    def add(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Adds rows that are new to the cube (e.g. streamed chunks of one load).
+        """
+        chunk_cube = self.aggregate(df)
+        self.cube = chunk_cube if self.cube is None else self._combine([self.cube, chunk_cube])
+        return self.cube
+
+    def add_chunks(self, chunks: Iterable[pd.DataFrame]) -> Iterator[pd.DataFrame]:
+        """
+        Adds each chunk of a stream to the cube and passes it through.
+        """
+        for chunk in chunks:
+            self.add(chunk)
+            yield chunk
+
+    @staticmethod
+    def periods_of(df: pd.DataFrame) -> List[Tuple[int, int]]:
+        """
+        (Year, Month) pairs present in `df`, e.g. in a daily delta.
+        """
+        order_date = pd.to_datetime(df["OrderDate"]).dropna()
+        return list(zip(order_date.dt.year, order_date.dt.month))
+
+    # ==========================
+    # PERSISTENCE
+    # ==========================
+    def load(self) -> Optional[pd.DataFrame]:
+        if not os.path.exists(self.config.cube_path):
+            return None
+        return read_artifact(self.config.cube_path)
+
+    def save(self) -> str:
+        try:
+            path = write_artifact(self.cube, self.config.cube_path)
+            logger.info(f"KPI cube saved at {path} ({len(self.cube)} rows)")
+
+            if self.config.table_name:
+                DataPersistence(self.database_url).write_to_sql(self.cube, self.config.table_name)
+                logger.info(f"KPI cube written to SQL table {self.config.table_name}")
+            return path
+
+        except Exception as e:
+            logger.exception("Saving KPI cube failed")
+            raise CustomException(e, sys)
+
+    # ==========================
+    # DASHBOARD QUERIES
+    # ==========================
+    def rollup(self, by: Sequence[str] = ("Year", "Month")) -> pd.DataFrame:
+        """
+        Dashboard KPIs sliced by any subset of the cube dimensions:
+        total sales, profit and quantity, discount % and profit margin %.
+        """
+        cube = self.cube if self.cube is not None else self.load()
+        if cube is None:
+            raise FileNotFoundError(f"KPI cube not found: {self.config.cube_path}")
+
+        kpis = cube.groupby(list(by), sort=True)[list(MEASURES)].sum()
+        kpis["AvgDiscountPct"] = (100 * kpis["DiscountSum"] / kpis["OrderCount"]).round(2)
+        kpis["ProfitMarginPct"] = (100 * kpis["TotalProfit"] / kpis["TotalSales"]).round(2)
+        kpis["LossRate"] = (kpis["LossCount"] / kpis["OrderCount"]).round(4)
+        return kpis.drop(columns=["DiscountSum", "LossCount"]).reset_index()
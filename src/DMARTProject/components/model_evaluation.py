@@ -0,0 +1,158 @@
+import json
+import os
+import sys
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Dict, Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.DMARTProject.loggers.logger import logger
+from src.DMARTProject.utils.artifacts import iter_artifact
+from src.DMARTProject.utils.schema import get_schema
+from src.exception import CustomException
+
+if TYPE_CHECKING:
+    from src.DMARTProject.components.model_trainer import LossRiskModel
+
+
+@dataclass
+class ModelEvaluationConfig:
+    test_data_path: str = "artifacts/test_data.parquet"
+    metrics_path: str = "artifacts/model/evaluation.json"
+    chunksize: int = 100_000
+    threshold: float = 0.5
+    # Resolution of the score histograms behind ROC AUC / average precision
+    score_bins: int = 1000
+
+
+class BinaryMetrics:
+    """
+    Binary classification metrics accumulated batch by batch: confusion
+    counts, log loss and Brier sums, and per-class histograms of the
+    predicted probability (for ROC AUC and average precision without
+    keeping the scores). Every update is a handful of vectorized NumPy
+    reductions; accumulators from different batches or workers merge.
+    """
+
+    def __init__(self, threshold: float = 0.5, bins: int = 1000):
+        self.threshold = threshold
+        self.bins = bins
+        self.tp = self.fp = self.tn = self.fn = 0
+        self.log_loss_sum = 0.0
+        self.brier_sum = 0.0
+        self.pos_hist = np.zeros(bins, dtype="int64")
+        self.neg_hist = np.zeros(bins, dtype="int64")
+
+    @property
+    def count(self) -> int:
+        return self.tp + self.fp + self.tn + self.fn
+
+    def update(self, y_true: np.ndarray, proba: np.ndarray):
+        y_true = np.asarray(y_true, dtype=bool)
+        proba = np.asarray(proba, dtype="float64")
+        predicted = proba >= self.threshold
+
+        self.tp += int(np.count_nonzero(predicted & y_true))
+        self.fp += int(np.count_nonzero(predicted & ~y_true))
+        self.fn += int(np.count_nonzero(~predicted & y_true))
+        self.tn += int(np.count_nonzero(~predicted & ~y_true))
+
+        clipped = np.clip(proba, 1e-15, 1 - 1e-15)
+        self.log_loss_sum += float(-np.where(y_true, np.log(clipped), np.log1p(-clipped)).sum())
+        self.brier_sum += float(((proba - y_true) ** 2).sum())
+
+        bins = np.minimum((proba * self.bins).astype("int64"), self.bins - 1)
+        self.pos_hist += np.bincount(bins[y_true], minlength=self.bins)
+        self.neg_hist += np.bincount(bins[~y_true], minlength=self.bins)
+
+    def merge(self, other: "BinaryMetrics") -> "BinaryMetrics":
+        self.tp += other.tp
+        self.fp += other.fp
+        self.tn += other.tn
+        self.fn += other.fn
+        self.log_loss_sum += other.log_loss_sum
+        self.brier_sum += other.brier_sum
+        self.pos_hist += other.pos_hist
+        self.neg_hist += other.neg_hist
+        return self
+
+    def _roc_auc(self) -> float:
+        positives, negatives = self.pos_hist.sum(), self.neg_hist.sum()
+        if not positives or not negatives:
+            return float("nan")
+        # P(score_pos > score_neg), ties within a bin counted as half
+        negatives_below = np.cumsum(self.neg_hist) - self.neg_hist
+        return float((self.pos_hist * (negatives_below + 0.5 * self.neg_hist)).sum() / (positives * negatives))
+
+    def _average_precision(self) -> float:
+        positives = self.pos_hist.sum()
+        if not positives:
+            return float("nan")
+        # Thresholds from the highest score bin down
+        tp = np.cumsum(self.pos_hist[::-1])
+        fp = np.cumsum(self.neg_hist[::-1])
+        precision = np.divide(tp, tp + fp, out=np.zeros(self.bins), where=(tp + fp) > 0)
+        return float((precision * self.pos_hist[::-1]).sum() / positives)
+
+    def result(self) -> Dict:
+        n = self.count
+        precision = self.tp / (self.tp + self.fp) if self.tp + self.fp else 0.0
+        recall = self.tp / (self.tp + self.fn) if self.tp + self.fn else 0.0
+        return {
+            "rows": n,
+            "positive_rate": (self.tp + self.fn) / n if n else float("nan"),
+            "accuracy": (self.tp + self.tn) / n if n else float("nan"),
+            "precision": precision,
+            "recall": recall,
+            "f1": 2 * precision * recall / (precision + recall) if precision + recall else 0.0,
+            "roc_auc": self._roc_auc(),
+            "average_precision": self._average_precision(),
+            "log_loss": self.log_loss_sum / n if n else float("nan"),
+            "brier": self.brier_sum / n if n else float("nan"),
+            "confusion": {"tp": self.tp, "fp": self.fp, "tn": self.tn, "fn": self.fn},
+        }
+
+
+class ModelEvaluation:
+    """
+    Scores the held-out test artifact chunk by chunk with a trained
+    LossRiskModel and reports the metrics of BinaryMetrics.
+    """
+
+    def __init__(self, config: ModelEvaluationConfig = ModelEvaluationConfig()):
+        self.config = config
+
+    def evaluate(self, model: "LossRiskModel", chunks: Optional[Iterable[pd.DataFrame]] = None) -> Dict:
+        try:
+            logger.info("Starting model evaluation")
+            if chunks is None:
+                chunks = iter_artifact(
+                    self.config.test_data_path,
+                    chunksize=self.config.chunksize,
+                    columns=model.input_columns,
+                    schema=get_schema(),
+                )
+
+            metrics = BinaryMetrics(self.config.threshold, self.config.score_bins)
+            for chunk in chunks:
+                X, y = model.labelled(chunk)
+                if len(y):
+                    metrics.update(y, model.estimator.predict_proba(X)[:, 1])
+
+            result = {"model_version": model.version, **metrics.result()}
+            self.save(result)
+            logger.info(f"Model evaluation: {result}")
+            return result
+
+        except Exception as e:
+            logger.exception("Model evaluation failed")
+            raise CustomException(e, sys)
+
+    def save(self, result: Dict) -> str:
+        os.makedirs(os.path.dirname(self.config.metrics_path) or ".", exist_ok=True)
+        tmp_path = f"{self.config.metrics_path}.tmp"
+        with open(tmp_path, "w") as fp:
+            json.dump(result, fp, indent=2, default=float)
+        os.replace(tmp_path, self.config.metrics_path)
+        return self.config.metrics_path
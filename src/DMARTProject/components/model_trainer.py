@@ -0,0 +1,397 @@
+import hashlib
+import itertools
+import json
+import os
+import pickle
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.DMARTProject.components.data_split import DataSplitConfig, DataSplitter
+from src.DMARTProject.components.model_evaluation import BinaryMetrics
+from src.DMARTProject.loggers.logger import logger, worker_logging
+from src.DMARTProject.utils.artifacts import iter_artifact
+from src.DMARTProject.utils.instrumentation import max_rss_mb
+from src.DMARTProject.utils.schema import get_schema
+from src.exception import CustomException
+
+
+NUMERIC_FEATURES = ["Discount", "Quantity", "SalesAmount"]
+CATEGORICAL_FEATURES = ["ShipMode", "RegionID"]
+# IsLoss = Profit < 0; rows without a Profit are not labelled
+TARGET_SOURCE = "Profit"
+
+
+@dataclass
+class ModelTrainerConfig:
+    train_data_path: str = "artifacts/train_data.parquet"
+    # model_<version>.pkl files and latest.json (the current version)
+    model_dir: str = "artifacts/model"
+    chunksize: int = 100_000
+    # Passes over the training data per candidate
+    epochs: int = 5
+    # Share of the training rows held out (by SalesID hash) to pick the
+    # best candidate; the test artifact is left to ModelEvaluation
+    validation_size: float = 0.2
+    validation_salt: str = "dmart-validation-v1"
+    # SGDClassifier settings searched over, one candidate per combination
+    param_grid: Dict[str, list] = field(
+        default_factory=lambda: {"alpha": [1e-5, 1e-4, 1e-3], "penalty": ["l2", "elasticnet"]}
+    )
+    # A BinaryMetrics result key; higher is better except for the losses
+    selection_metric: str = "roc_auc"
+    # Candidates trained in parallel; None: one process per CPU core
+    workers: Optional[int] = None
+    random_state: int = 42
+
+
+# ==========================
+# FEATURES
+# ==========================
+def _numeric_values(df: pd.DataFrame) -> np.ndarray:
+    """
+    Raw numeric feature matrix: missing discount is no discount, and sales
+    amounts are log-scaled (they span several orders of magnitude).
+    """
+    return np.column_stack([
+        df["Discount"].fillna(0).to_numpy(dtype="float64"),
+        df["Quantity"].to_numpy(dtype="float64"),
+        np.log1p(df["SalesAmount"].to_numpy(dtype="float64")),
+    ])
+
+
+class FeatureEncoder:
+    """
+    Standardizes the numeric features and one-hot encodes the categorical
+    ones. Fitted incrementally (partial_fit per chunk, with Chan's parallel
+    mean/variance update), so it never needs the whole training set.
+    Categories not seen during fitting encode as all zeros.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.mean = np.zeros(len(NUMERIC_FEATURES))
+        self.m2 = np.zeros(len(NUMERIC_FEATURES))
+        self.categories: Dict[str, list] = {col: [] for col in CATEGORICAL_FEATURES}
+
+    def partial_fit(self, df: pd.DataFrame) -> "FeatureEncoder":
+        values = _numeric_values(df)
+        n = len(values)
+        if n:
+            mean = values.mean(axis=0)
+            m2 = ((values - mean) ** 2).sum(axis=0)
+            delta = mean - self.mean
+            total = self.count + n
+            self.mean = self.mean + delta * n / total
+            self.m2 = self.m2 + m2 + delta ** 2 * self.count * n / total
+            self.count = total
+
+        for col in CATEGORICAL_FEATURES:
+            seen = {str(value) for value in df[col].dropna().unique()} - set(self.categories[col])
+            if seen:
+                self.categories[col] = sorted(self.categories[col] + list(seen))
+                self.__dict__.pop("_indexes", None)
+        return self
+
+    @property
+    def scale(self) -> np.ndarray:
+        std = np.sqrt(self.m2 / max(self.count, 1))
+        return np.where(std > 0, std, 1.0)
+
+    @property
+    def feature_names(self) -> List[str]:
+        return NUMERIC_FEATURES + [f"{col}={value}" for col in CATEGORICAL_FEATURES for value in self.categories[col]]
+
+    def transform(self, df: pd.DataFrame) -> np.ndarray:
+        n = len(df)
+        X = np.zeros((n, len(self.feature_names)), dtype="float32")
+        X[:, : len(NUMERIC_FEATURES)] = (_numeric_values(df) - self.mean) / self.scale
+
+        offset = len(NUMERIC_FEATURES)
+        rows = np.arange(n)
+        for col in CATEGORICAL_FEATURES:
+            codes = self._codes(col, df[col])
+            known = codes >= 0
+            X[rows[known], offset + codes[known]] = 1.0
+            offset += len(self.categories[col])
+        return X
+
+    def _codes(self, col: str, values: pd.Series) -> np.ndarray:
+        """
+        Position of every value in self.categories[col], -1 when unknown.
+        """
+        # Built on first use; not kept by pickle
+        indexes = self.__dict__.setdefault("_indexes", {})
+        if col not in indexes:
+            indexes[col] = pd.Index(self.categories[col])
+        index = indexes[col]
+
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            # Look up the few distinct categories once, then take per row;
+            # the appended -1 is where null codes (-1) land
+            lookup = np.append(index.get_indexer(values.cat.categories.astype(str)), -1)
+            return lookup[values.cat.codes.to_numpy()]
+        return index.get_indexer(values.astype(str))
+
+    def __getstate__(self) -> Dict:
+        state = dict(self.__dict__)
+        state.pop("_indexes", None)
+        return state
+
+
+def loss_labels(df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    (labelled mask, IsLoss labels of the labelled rows).
+    """
+    profit = df[TARGET_SOURCE]
+    labelled = profit.notna().to_numpy()
+    return labelled, (profit[labelled].to_numpy(dtype="float64") < 0).astype("int8")
+
+
+@dataclass
+class LossRiskModel:
+    """
+    A trained loss-risk classifier: the fitted encoder and SGDClassifier,
+    with the version it was saved under.
+    """
+
+    encoder: FeatureEncoder
+    estimator: object
+    version: str
+    params: Dict = field(default_factory=dict)
+
+    input_columns = NUMERIC_FEATURES + CATEGORICAL_FEATURES + [TARGET_SOURCE]
+
+    def predict_proba(self, df: pd.DataFrame) -> np.ndarray:
+        """
+        P(IsLoss) for every row of `df`.
+        """
+        return self.estimator.predict_proba(self.encoder.transform(df))[:, 1]
+
+    def labelled(self, df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        (features, labels) of the rows of `df` that have a Profit.
+        """
+        mask, y = loss_labels(df)
+        return self.encoder.transform(df[mask]), y
+
+    @classmethod
+    def load(cls, path: str) -> "LossRiskModel":
+        with open(path, "rb") as fp:
+            return pickle.load(fp)
+
+
+def latest_model_info(model_dir: str) -> Optional[Dict]:
+    """
+    Contents of <model_dir>/latest.json (version, path, ...), or None when
+    no model has been trained yet.
+    """
+    path = os.path.join(model_dir, "latest.json")
+    if not os.path.exists(path):
+        return None
+    with open(path) as fp:
+        return json.load(fp)
+
+
+def _validation_splitter(config: ModelTrainerConfig) -> DataSplitter:
+    return DataSplitter(DataSplitConfig(test_size=config.validation_size, salt=config.validation_salt))
+
+
+def _training_chunks(config: ModelTrainerConfig) -> Iterator[Tuple[pd.DataFrame, np.ndarray]]:
+    """
+    Chunks of the training artifact, each with its validation-row mask.
+    """
+    splitter = _validation_splitter(config)
+    columns = ["SalesID"] + LossRiskModel.input_columns
+    for chunk in iter_artifact(config.train_data_path, config.chunksize, columns=columns, schema=get_schema()):
+        yield chunk, splitter.is_test(chunk)
+
+
+# ==========================
+# CANDIDATE TRAINING (WORKER)
+# ==========================
+def _train_candidate(
+    params: Dict, encoder: FeatureEncoder, class_weight: Dict[int, float], config: ModelTrainerConfig
+) -> Dict:
+    """
+    Trains one SGDClassifier for `params` out of core: every epoch streams
+    the training artifact chunk by chunk into partial_fit, skipping the
+    validation rows, which are scored in a final pass. Module-level so it
+    can run on a process pool; each worker reads the artifact itself.
+    """
+    from sklearn.linear_model import SGDClassifier
+
+    started = time.perf_counter()
+    rng = np.random.default_rng(config.random_state)
+    estimator = SGDClassifier(
+        loss="log_loss", class_weight=class_weight, random_state=config.random_state, **params
+    )
+
+    rows = 0
+    for _ in range(config.epochs):
+        for chunk, is_validation in _training_chunks(config):
+            mask, y = loss_labels(chunk[~is_validation])
+            if not len(y):
+                continue
+            X = encoder.transform(chunk[~is_validation][mask])
+            # Chunks follow file order; shuffle within each one for SGD
+            order = rng.permutation(len(y))
+            estimator.partial_fit(X[order], y[order], classes=np.array([0, 1]))
+            rows += len(y)
+
+    metrics = BinaryMetrics()
+    for chunk, is_validation in _training_chunks(config):
+        mask, y = loss_labels(chunk[is_validation])
+        if len(y):
+            metrics.update(y, estimator.predict_proba(encoder.transform(chunk[is_validation][mask]))[:, 1])
+
+    return {
+        "params": params,
+        "estimator": estimator,
+        "validation": metrics.result(),
+        "rows_trained": rows,
+        "seconds": round(time.perf_counter() - started, 3),
+        "peak_rss_mb": round(max_rss_mb(), 1),
+    }
+
+
+# ==========================
+# TRAINER
+# ==========================
+class ModelTrainer:
+    """
+    Trains the loss-risk model (P(Profit < 0) from discount, quantity,
+    sales amount, ship mode and region) without loading the training data
+    into memory:
+
+    1. one streaming pass fits the FeatureEncoder and counts the classes;
+    2. every param_grid candidate is trained with SGDClassifier.partial_fit
+       over the streamed chunks, candidates in parallel on a process pool;
+    3. the candidate with the best validation metric is saved under a new
+       version, and latest.json is pointed at it.
+    """
+
+    def __init__(self, config: ModelTrainerConfig = ModelTrainerConfig()):
+        self.config = config
+
+    def fit_encoder(self) -> Tuple[FeatureEncoder, Dict[int, float]]:
+        """
+        Fitted encoder and balanced class weights, from a single pass over
+        the rows the candidates train on (the validation rows are skipped).
+        """
+        encoder = FeatureEncoder()
+        counts = np.zeros(2, dtype="int64")
+        for chunk, is_validation in _training_chunks(self.config):
+            train = chunk[~is_validation]
+            mask, y = loss_labels(train)
+            encoder.partial_fit(train[mask])
+            counts += np.bincount(y, minlength=2)
+
+        if not counts.all():
+            raise ValueError(f"Training data needs both classes, got counts {counts.tolist()}")
+        # sklearn's "balanced" weights; not accepted by partial_fit directly
+        class_weight = {label: float(counts.sum() / (2 * count)) for label, count in enumerate(counts)}
+        logger.info(f"Encoder fitted on {encoder.count} rows, class counts {counts.tolist()}")
+        return encoder, class_weight
+
+    def candidates(self) -> List[Dict]:
+        grid = self.config.param_grid
+        return [dict(zip(grid, values)) for values in itertools.product(*grid.values())]
+
+    def search(self, encoder: FeatureEncoder, class_weight: Dict[int, float]) -> List[Dict]:
+        """
+        Trains every candidate; returns their results in candidate order.
+        """
+        candidates = self.candidates()
+        workers = min(self.config.workers or os.cpu_count() or 1, len(candidates))
+        if workers <= 1:
+            results = [_train_candidate(params, encoder, class_weight, self.config) for params in candidates]
+        else:
+            with ProcessPoolExecutor(max_workers=workers, **worker_logging()) as pool:
+                futures = [
+                    pool.submit(_train_candidate, params, encoder, class_weight, self.config) for params in candidates
+                ]
+                results = [future.result() for future in futures]
+
+        for result in results:
+            logger.info(
+                f"Candidate {result['params']}: {self.config.selection_metric}="
+                f"{result['validation'][self.config.selection_metric]:.4f} in {result['seconds']}s",
+                extra={"seconds": result["seconds"], "peak_rss_mb": result["peak_rss_mb"]},
+            )
+        return results
+
+    def _best(self, results: List[Dict]) -> Dict:
+        metric = self.config.selection_metric
+        lower_is_better = metric in ("log_loss", "brier")
+
+        def score(result: Dict) -> float:
+            value = result["validation"][metric]
+            if np.isnan(value):
+                return -np.inf
+            return -value if lower_is_better else value
+
+        return max(results, key=score)
+
+    def train(self) -> LossRiskModel:
+        try:
+            logger.info("Starting model training")
+            started = time.perf_counter()
+
+            encoder, class_weight = self.fit_encoder()
+            results = self.search(encoder, class_weight)
+            best = self._best(results)
+
+            model = LossRiskModel(encoder=encoder, estimator=best["estimator"], version="", params=best["params"])
+            model.version = self._version(model)
+            seconds = round(time.perf_counter() - started, 3)
+            # Own peak plus the largest finished worker
+            peak_rss_mb = round(float(np.fmax(max_rss_mb(), max_rss_mb(children=True))), 1)
+            self.save(model, {"validation": best["validation"], "seconds": seconds, "peak_rss_mb": peak_rss_mb})
+
+            logger.info(
+                f"Model {model.version} trained in {seconds}s with {best['params']}",
+                extra={"seconds": seconds, "peak_rss_mb": peak_rss_mb, "candidates": len(results)},
+            )
+            return model
+
+        except Exception as e:
+            logger.exception("Model training failed")
+            raise CustomException(e, sys)
+
+    @staticmethod
+    def _version(model: LossRiskModel) -> str:
+        digest = hashlib.sha256(pickle.dumps((model.encoder, model.estimator))).hexdigest()[:8]
+        return f"{datetime.now():%Y%m%d_%H%M%S}_{digest}"
+
+    def save(self, model: LossRiskModel, info: Dict) -> str:
+        """
+        Writes the model to model_<version>.pkl, then switches latest.json
+        to it (both via rename, so readers never see a partial file).
+        """
+        os.makedirs(self.config.model_dir, exist_ok=True)
+        path = os.path.join(self.config.model_dir, f"model_{model.version}.pkl")
+        with open(f"{path}.tmp", "wb") as fp:
+            pickle.dump(model, fp, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(f"{path}.tmp", path)
+
+        latest = os.path.join(self.config.model_dir, "latest.json")
+        entry = {
+            "version": model.version,
+            "path": path,
+            "trained_at": datetime.now().isoformat(),
+            "params": model.params,
+            "features": model.encoder.feature_names,
+            **info,
+        }
+        with open(f"{latest}.tmp", "w") as fp:
+            json.dump(entry, fp, indent=2, default=float)
+        os.replace(f"{latest}.tmp", latest)
+        logger.info(f"Model saved at {path}")
+        return path
@@ -0,0 +1,181 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.DMARTProject.loggers.logger import worker_logging
+
+
+@dataclass
+class PlotConfig:
+    dpi: int = 300
+    # Any matplotlib output format: png, svg, pdf, ...
+    fmt: str = "png"
+    bins: int = 30
+    # Resolution of the binned grid the KDE curves are computed on
+    kde_grid_points: int = 512
+    # Figures rendered on a process pool; None: one worker per core,
+    # 1: render in-process
+    workers: Optional[int] = None
+    # Start method of the rendering pool. Not "fork": the pool may be started
+    # from a worker thread (concurrent ETL branches, DAG stages), and a forked
+    # child inherits whatever locks the other threads held at that moment
+    start_method: str = "spawn"
+
+
+@dataclass
+class FigureSpec:
+    """
+    Pre-aggregated data for one figure. Only these small arrays are sent to
+    the rendering workers, never the rows themselves.
+    """
+
+    name: str
+    kind: str
+    figsize: tuple
+    panels: List[Dict] = field(default_factory=list)
+
+
+# ==========================
+# AGGREGATION (NUMPY)
+# ==========================
+def count_panel(series: pd.Series, title: str) -> Dict:
+    counts = series.value_counts(sort=False).sort_index()
+    return {"labels": [str(label) for label in counts.index], "counts": counts.to_numpy(), "title": title}
+
+
+def binned_kde(values: np.ndarray, lo: float, hi: float, grid_points: int) -> np.ndarray:
+    """
+    Gaussian KDE (Scott's bandwidth) evaluated on a regular grid over
+    [lo, hi]: the values are binned onto the grid and the counts are
+    convolved with a sampled Gaussian kernel, so the cost is one pass over
+    the data plus O(grid) instead of O(rows x grid). Returns counts per
+    grid step (sums to len(values)).
+    """
+    counts, _ = np.histogram(values, bins=grid_points, range=(lo, hi))
+    step = (hi - lo) / grid_points
+    bandwidth = values.std() * len(values) ** (-1 / 5)
+    if step <= 0 or bandwidth <= 0:
+        return counts.astype("float64")
+
+    sigma = bandwidth / step
+    radius = min(int(np.ceil(4 * sigma)), grid_points)
+    offsets = np.arange(-radius, radius + 1)
+    kernel = np.exp(-0.5 * (offsets / sigma) ** 2)
+    # The grid-aligned window of the full convolution; mode="same" returns
+    # the kernel's length when it is longer than the grid
+    return np.convolve(counts, kernel / kernel.sum())[radius : radius + grid_points]
+
+
+def histogram_panel(series: pd.Series, title: str, config: PlotConfig) -> Dict:
+    values = series.to_numpy(dtype="float64", na_value=np.nan)
+    values = values[~np.isnan(values)]
+    lo, hi = (float(values.min()), float(values.max())) if len(values) else (0.0, 1.0)
+    if lo == hi:
+        lo, hi = lo - 0.5, hi + 0.5
+
+    counts, edges = np.histogram(values, bins=config.bins, range=(lo, hi))
+    kde = binned_kde(values, lo, hi, config.kde_grid_points) if len(values) > 1 else None
+    grid = np.linspace(lo, hi, config.kde_grid_points + 1)
+    return {
+        "counts": counts,
+        "edges": edges,
+        # Rescaled from per-grid-step to per-histogram-bin counts
+        "kde_x": (grid[:-1] + grid[1:]) / 2,
+        "kde_y": None if kde is None else kde * (config.kde_grid_points / config.bins),
+        "title": title,
+        "xlabel": series.name,
+    }
+
+
+def core_figure_specs(df: pd.DataFrame, correlation: pd.DataFrame, config: PlotConfig) -> List[FigureSpec]:
+    return [
+        FigureSpec(
+            name="univariate_countplots",
+            kind="counts",
+            figsize=(12, 4),
+            panels=[
+                count_panel(df["ShipMode"], "Ship Mode Counts"),
+                count_panel(df["FeedbackProvided"], "Feedback Provided Counts"),
+            ],
+        ),
+        FigureSpec(
+            name="univariate_distributions",
+            kind="histograms",
+            figsize=(15, 4),
+            panels=[
+                histogram_panel(df["SalesAmount"], "Sales Distribution", config),
+                histogram_panel(df["Profit"], "Profit Distribution", config),
+                histogram_panel(df["Discount"], "Discount Distribution", config),
+            ],
+        ),
+        FigureSpec(
+            name="correlation_matrix",
+            kind="heatmap",
+            figsize=(8, 6),
+            panels=[{"matrix": correlation, "title": "Correlation Matrix"}],
+        ),
+    ]
+
+
+# ==========================
+# RENDERING (WORKERS)
+# ==========================
+def render_figure(spec: FigureSpec, path: str, dpi: int) -> str:
+    """
+    Draws one FigureSpec to `path`. Runs in a worker process.
+    """
+    import matplotlib
+
+    # Non-interactive backend: no display, no GUI event loop
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    if spec.kind == "heatmap":
+        fig, ax = plt.subplots(figsize=spec.figsize)
+        sns.heatmap(spec.panels[0]["matrix"], annot=True, cmap="coolwarm", ax=ax)
+        axes = [ax]
+    else:
+        fig, axes = plt.subplots(1, len(spec.panels), figsize=spec.figsize)
+
+    for ax, panel in zip(axes, spec.panels):
+        if spec.kind == "counts":
+            colors = sns.color_palette(n_colors=len(panel["labels"]))
+            ax.bar(panel["labels"], panel["counts"], color=colors)
+            ax.set_ylabel("count")
+        elif spec.kind == "histograms":
+            ax.stairs(panel["counts"], panel["edges"], fill=True, alpha=0.5, color="C0")
+            ax.stairs(panel["counts"], panel["edges"], color="C0")
+            if panel["kde_y"] is not None:
+                ax.plot(panel["kde_x"], panel["kde_y"], color="C0")
+            ax.set_xlabel(panel["xlabel"])
+            ax.set_ylabel("Count")
+        if "title" in panel:
+            ax.set_title(panel["title"])
+
+    plt.tight_layout()
+    fig.savefig(path, dpi=dpi)
+    plt.close(fig)
+    return path
+
+
+def render_figures(specs: List[FigureSpec], directory: str, config: PlotConfig) -> List[str]:
+    """
+    Renders independent figures in parallel and returns the file paths.
+    """
+    os.makedirs(directory, exist_ok=True)
+    paths = [os.path.join(directory, f"{spec.name}.{config.fmt}") for spec in specs]
+
+    workers = min(config.workers or os.cpu_count() or 1, len(specs))
+    if workers <= 1:
+        return [render_figure(spec, path, config.dpi) for spec, path in zip(specs, paths)]
+
+    context = multiprocessing.get_context(config.start_method)
+    with ProcessPoolExecutor(max_workers=workers, **worker_logging(context)) as pool:
+        futures = [pool.submit(render_figure, spec, path, config.dpi) for spec, path in zip(specs, paths)]
+        return [future.result() for future in futures]
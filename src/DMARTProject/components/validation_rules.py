@@ -0,0 +1,202 @@
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from config import TableSchema
+
+
+@dataclass(frozen=True)
+class ColumnRule:
+    """
+    Declarative checks for one column.
+    dtype: "numeric", "bool" or "datetime" (datetime columns are parsed).
+    min_value / max_value: allowed range; nulls are left to `not_null`.
+    allowed_values: domain of a categorical column.
+    """
+
+    column: str
+    not_null: bool = False
+    dtype: Optional[str] = None
+    min_value: Optional[float] = None
+    max_value: Optional[float] = None
+    min_inclusive: bool = True
+    max_inclusive: bool = True
+    allowed_values: Optional[Tuple] = None
+
+    def describe_range(self) -> str:
+        bounds = []
+        if self.min_value is not None:
+            bounds.append(f"{'>=' if self.min_inclusive else '>'} {self.min_value}")
+        if self.max_value is not None:
+            bounds.append(f"{'<=' if self.max_inclusive else '<'} {self.max_value}")
+        return f"{self.column} must be {' and '.join(bounds)}"
+
+
+@dataclass
+class ValidationReport:
+    row_count: int
+    # Rule name ("<column>:not_null", "<column>:range", ...) -> violating rows
+    violations: Dict[str, int] = field(default_factory=dict)
+    # Human-readable message per violated rule
+    messages: Dict[str, str] = field(default_factory=dict)
+    # Frame-level failures (schema, dtype) that make row checks meaningless
+    errors: List[str] = field(default_factory=list)
+    # True for rows violating at least one row-level rule
+    row_mask: Optional[np.ndarray] = None
+
+    @property
+    def passed(self) -> bool:
+        return not self.errors and not any(self.violations.values())
+
+    @property
+    def invalid_rows(self) -> int:
+        return int(self.row_mask.sum()) if self.row_mask is not None else 0
+
+    def summary(self) -> str:
+        parts = list(self.errors)
+        parts += [f"{self.messages[name]} ({count} rows)" for name, count in self.violations.items() if count]
+        return "; ".join(parts)
+
+    def merge(self, other: "ValidationReport") -> "ValidationReport":
+        """
+        Combines reports of two chunks/partitions of the same table.
+        """
+        violations = dict(self.violations)
+        for name, count in other.violations.items():
+            violations[name] = violations.get(name, 0) + count
+
+        masks = [m for m in (self.row_mask, other.row_mask) if m is not None]
+        return ValidationReport(
+            row_count=self.row_count + other.row_count,
+            violations=violations,
+            messages={**self.messages, **other.messages},
+            errors=self.errors + [e for e in other.errors if e not in self.errors],
+            row_mask=np.concatenate(masks) if masks else None,
+        )
+
+
+_RULE_DTYPES = {
+    "int32": "numeric",
+    "int64": "numeric",
+    "float32": "numeric",
+    "float64": "numeric",
+    "bool": "bool",
+    "datetime": "datetime",
+}
+
+
+def rules_from_schema(schema: TableSchema) -> List[ColumnRule]:
+    """
+    One ColumnRule per column of a config.py schema.
+    """
+    return [
+        ColumnRule(
+            column=spec.name,
+            not_null=not spec.nullable,
+            dtype=_RULE_DTYPES.get(spec.dtype),
+            min_value=spec.min_value,
+            max_value=spec.max_value,
+            min_inclusive=spec.min_inclusive,
+            max_inclusive=spec.max_inclusive,
+            allowed_values=spec.domain,
+        )
+        for spec in schema.columns
+    ]
+
+
+class RuleEngine:
+    """
+    Evaluates schema, dtype, null, domain and range rules in one pass over
+    the frame. Every column is materialized once; its null mask is shared by
+    all of its checks, and all row-level violations are OR-ed into one mask.
+    """
+
+    def __init__(self, expected_columns: Iterable[str], rules: Iterable[ColumnRule]):
+        self.expected_columns = set(expected_columns)
+        self.rules = list(rules)
+
+    @classmethod
+    def from_schema(cls, schema: TableSchema) -> "RuleEngine":
+        return cls(schema.column_names, rules_from_schema(schema))
+
+    def _check_schema(self, df: pd.DataFrame, report: ValidationReport):
+        actual_columns = set(df.columns)
+        missing_cols = self.expected_columns - actual_columns
+        extra_cols = actual_columns - self.expected_columns
+
+        if missing_cols:
+            report.errors.append(f"Missing columns: {missing_cols}")
+        if extra_cols:
+            report.errors.append(f"Unexpected columns: {extra_cols}")
+
+    @staticmethod
+    def _is_bool(series: pd.Series) -> bool:
+        # A null leaves a bool column as object (or "boolean"); the null
+        # itself is a row-level not_null violation
+        return pd.api.types.is_bool_dtype(series) or pd.api.types.infer_dtype(series, skipna=True) == "boolean"
+
+    def _check_dtype(self, df: pd.DataFrame, rule: ColumnRule, report: ValidationReport):
+        series = df[rule.column]
+        if rule.dtype == "numeric" and not pd.api.types.is_numeric_dtype(series):
+            report.errors.append(f"{rule.column} must be numeric")
+        elif rule.dtype == "bool" and not self._is_bool(series):
+            report.errors.append(f"{rule.column} must be boolean")
+
+    def evaluate(self, df: pd.DataFrame) -> ValidationReport:
+        """
+        Validates `df`. Datetime columns are parsed in place; values that
+        cannot be parsed are counted under "<column>:dtype".
+        """
+        report = ValidationReport(row_count=len(df))
+        self._check_schema(df, report)
+        if report.errors:
+            return report
+
+        row_mask = np.zeros(len(df), dtype=bool)
+
+        for rule in self.rules:
+            self._check_dtype(df, rule, report)
+            series = df[rule.column]
+            null_mask = series.isna().to_numpy()
+
+            if rule.not_null:
+                name = f"{rule.column}:not_null"
+                report.violations[name] = int(null_mask.sum())
+                report.messages[name] = f"Unexpected nulls in {rule.column}"
+                row_mask |= null_mask
+
+            if rule.dtype == "datetime" and not pd.api.types.is_datetime64_any_dtype(series):
+                parsed = pd.to_datetime(series, errors="coerce")
+                unparsed = parsed.isna().to_numpy() & ~null_mask
+                name = f"{rule.column}:dtype"
+                report.violations[name] = int(unparsed.sum())
+                report.messages[name] = f"{rule.column} must be a valid date"
+                row_mask |= unparsed
+                df[rule.column] = parsed
+
+            if rule.allowed_values is not None:
+                outside = ~series.isin(rule.allowed_values).to_numpy() & ~null_mask
+                name = f"{rule.column}:domain"
+                report.violations[name] = int(outside.sum())
+                report.messages[name] = f"{rule.column} must be one of {list(rule.allowed_values)}"
+                row_mask |= outside
+
+            if (rule.min_value is not None or rule.max_value is not None) and pd.api.types.is_numeric_dtype(series):
+                # NaN compares False, so nulls never count as range violations
+                values = series.to_numpy(dtype="float64", na_value=np.nan)
+                out_of_range = np.zeros(len(values), dtype=bool)
+                with np.errstate(invalid="ignore"):
+                    if rule.min_value is not None:
+                        out_of_range |= (values < rule.min_value) if rule.min_inclusive else (values <= rule.min_value)
+                    if rule.max_value is not None:
+                        out_of_range |= (values > rule.max_value) if rule.max_inclusive else (values >= rule.max_value)
+
+                name = f"{rule.column}:range"
+                report.violations[name] = int(out_of_range.sum())
+                report.messages[name] = rule.describe_range()
+                row_mask |= out_of_range
+
+        report.row_mask = row_mask
+        return report
@@ -1,23 +1,338 @@
+"""
+Project logging: non-blocking, structured, rotating.
+
+Records are put on an in-memory queue by a QueueHandler and written by a
+QueueListener on a background thread, so a stage never waits on the log
+file. Each record is one JSON line carrying the active stage and run ID
+(see log_context) plus any structured fields passed via `extra`, e.g.
+
+    logger.info("Chunk written", extra={"rows": len(chunk), "seconds": 0.12})
+
+Nothing touches the filesystem and no thread is started until the first
+record is emitted.
+
+Process-pool workers send their records back to the parent process,
+which writes and rotates the one log file (see worker_logging).
+"""
+import atexit
+import contextvars
+import copy
+import json
 import logging
+import logging.handlers
 import os
-from datetime import datetime
+import queue
+import random
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+
+@dataclass
+class LoggingConfig:
+    log_dir: str = os.path.join(os.getcwd(), "logs")
+    file_name: str = "dmart_project.log"
+    level: str = os.getenv("DMART_LOG_LEVEL", "INFO")
+    # "json" (one object per line) or "text"
+    fmt: str = os.getenv("DMART_LOG_FORMAT", "json")
+    # Size-based rotation; set rotate_when (e.g. "midnight", "H") for
+    # time-based rotation instead
+    max_bytes: int = 50 * 1024 ** 2
+    rotate_when: Optional[str] = None
+    backup_count: int = 10
+    # DEBUG records per call site: at most `debug_rate_limit` per
+    # `debug_rate_window` seconds, of which a `debug_sample_rate` share is kept
+    debug_rate_limit: int = 20
+    debug_rate_window: float = 1.0
+    debug_sample_rate: float = 1.0
+
+    @property
+    def path(self) -> str:
+        return os.path.join(self.log_dir, self.file_name)
+
+
+TEXT_FORMAT = "[%(asctime)s] %(levelname)s - %(message)s"
+
+# Attributes every LogRecord has; anything else on a record came from `extra`
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+
+# ==========================
+# CONTEXT (STAGE, RUN ID)
+# ==========================
+_context: contextvars.ContextVar[Dict] = contextvars.ContextVar("dmart_log_context", default={})
+
+
+@contextmanager
+def log_context(**fields) -> Iterator[None]:
+    """
+    Adds `fields` (e.g. stage="cleaning", run_id=...) to every record logged
+    inside the block by this thread or task.
+    """
+    token = _context.set({**_context.get(), **fields})
+    try:
+        yield
+    finally:
+        _context.reset(token)
+
+
+class ContextFilter(logging.Filter):
+    def filter(self, record: logging.LogRecord) -> bool:
+        for key, value in _context.get().items():
+            if not hasattr(record, key):
+                setattr(record, key, value)
+        return True
+
+
+class DebugRateLimitFilter(logging.Filter):
+    """
+    Samples and rate-limits DEBUG records per call site (file, line), so a
+    debug statement in a per-chunk or per-row loop cannot flood the queue.
+    The first record let through after a suppressed burst carries the
+    number of dropped records as `suppressed`.
+    """
+
+    def __init__(self, limit: int, window: float, sample_rate: float):
+        super().__init__()
+        self.limit = limit
+        self.window = window
+        self.sample_rate = sample_rate
+        # (pathname, lineno) -> [window start, emitted, suppressed]
+        self._sites: Dict[Tuple[str, int], list] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.DEBUG:
+            return True
+
+        now = time.monotonic()
+        site = self._sites.get((record.pathname, record.lineno))
+        if site is None or now - site[0] >= self.window:
+            suppressed = site[2] if site else 0
+            site = self._sites[(record.pathname, record.lineno)] = [now, 0, suppressed]
+
+        if site[1] >= self.limit or (self.sample_rate < 1.0 and random.random() >= self.sample_rate):
+            site[2] += 1
+            return False
+
+        site[1] += 1
+        if site[2]:
+            record.suppressed = site[2]
+            site[2] = 0
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "thread": record.threadName,
+            "pid": record.process,
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS:
+                entry[key] = value
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+# ==========================
+# QUEUE HANDLER / LISTENER
+# ==========================
+class LazyFileHandler(logging.handlers.RotatingFileHandler):
+    """
+    Size-rotating file handler that opens its file (and creates the
+    directory) on the first emitted record.
+    """
+
+    def __init__(self, filename: str, max_bytes: int = 0, backup_count: int = 0):
+        super().__init__(filename, maxBytes=max_bytes, backupCount=backup_count, delay=True)
+
+    def _open(self):
+        os.makedirs(os.path.dirname(self.baseFilename), exist_ok=True)
+        return super()._open()
+
+
+class LazyTimedFileHandler(logging.handlers.TimedRotatingFileHandler):
+    def __init__(self, filename: str, when: str, backup_count: int = 0):
+        super().__init__(filename, when=when, backupCount=backup_count, delay=True)
+
+    def _open(self):
+        os.makedirs(os.path.dirname(self.baseFilename), exist_ok=True)
+        return super()._open()
+
+
+def _plain_record(record: logging.LogRecord) -> logging.LogRecord:
+    # Keep the message and traceback as plain text for the JSON formatter
+    # (and for pickling to another process), and leave `extra` fields on
+    # the record
+    record = copy.copy(record)
+    record.msg = record.getMessage()
+    record.args = None
+    if record.exc_info:
+        record.exc_text = logging.Formatter().formatException(record.exc_info)
+    record.exc_info = None
+    return record
+
+
+class AsyncQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler whose listener thread is started on the first record (and
+    again in a forked worker process, which does not inherit the thread).
+    Records of process-pool workers arrive on worker queues, drained into
+    the same file by listener threads of this process.
+    """
+
+    def __init__(self, target: logging.Handler):
+        super().__init__(queue.SimpleQueue())
+        self.target = target
+        self._listener: Optional[logging.handlers.QueueListener] = None
+        self._listener_pid: Optional[int] = None
+        self._start_lock = threading.Lock()
+        # multiprocessing start method -> (queue, listener)
+        self._worker_queues: Dict[str, Tuple[Any, logging.handlers.QueueListener]] = {}
+
+    def _ensure_listener(self):
+        if self._listener_pid == os.getpid():
+            return
+        with self._start_lock:
+            if self._listener_pid != os.getpid():
+                self.queue = queue.SimpleQueue()
+                self._listener = logging.handlers.QueueListener(self.queue, self.target, respect_handler_level=True)
+                self._listener.start()
+                self._listener_pid = os.getpid()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return _plain_record(record)
+
+    def emit(self, record: logging.LogRecord):
+        self._ensure_listener()
+        super().emit(record)
+
+    def worker_queue(self, context) -> Any:
+        """
+        Queue of `context` (a multiprocessing context) that worker processes
+        put their records on; started on first use.
+        """
+        method = context.get_start_method()
+        with self._start_lock:
+            if method not in self._worker_queues:
+                worker_queue = context.Queue()
+                listener = logging.handlers.QueueListener(worker_queue, self.target, respect_handler_level=True)
+                listener.start()
+                self._worker_queues[method] = (worker_queue, listener)
+            return self._worker_queues[method][0]
+
+    def stop(self):
+        """
+        Drains the queues and stops the listener threads.
+        """
+        with self._start_lock:
+            if self._listener is not None and self._listener_pid == os.getpid():
+                self._listener.stop()
+            self._listener = None
+            self._listener_pid = None
+            for _, listener in self._worker_queues.values():
+                listener.stop()
+            self._worker_queues = {}
+        self.target.close()
+
+
+class WorkerQueueHandler(logging.handlers.QueueHandler):
+    """
+    Installed in process-pool workers: puts records on the parent's worker
+    queue. multiprocessing flushes the queue before the worker exits.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return _plain_record(record)
+
+
+_handler: Optional[AsyncQueueHandler] = None
+
+
+def configure_logging(config: LoggingConfig = LoggingConfig()) -> AsyncQueueHandler:
+    """
+    Installs the queue handler on the root logger, replacing the one from
+    an earlier call. Called with the defaults at import.
+    """
+    global _handler
+
+    if config.rotate_when:
+        target = LazyTimedFileHandler(config.path, config.rotate_when, config.backup_count)
+    else:
+        target = LazyFileHandler(config.path, config.max_bytes, config.backup_count)
+    target.setFormatter(JsonFormatter() if config.fmt == "json" else logging.Formatter(TEXT_FORMAT))
+
+    handler = AsyncQueueHandler(target)
+    handler.addFilter(ContextFilter())
+    handler.addFilter(DebugRateLimitFilter(config.debug_rate_limit, config.debug_rate_window, config.debug_sample_rate))
+
+    root = logging.getLogger()
+    if _handler is not None:
+        root.removeHandler(_handler)
+        _handler.stop()
+    root.addHandler(handler)
+    root.setLevel(config.level.upper())
+    _handler = handler
+    return handler
+
+
+def _init_worker_logging(worker_queue: Any, level: int, context: Dict):
+    global _handler
+
+    root = logging.getLogger()
+    # A forked worker inherits the parent's handler, but not its listener
+    # thread; left in place it would start its own and write the file too
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    _handler = None
+
+    handler = WorkerQueueHandler(worker_queue)
+    handler.addFilter(ContextFilter())
+    root.addHandler(handler)
+    root.setLevel(level)
+    # Stage and run ID of the code that started the pool
+    _context.set(context)
+
+
+def worker_logging(mp_context=None) -> Dict:
+    """
+    ProcessPoolExecutor arguments that send the workers' records to this
+    process's log file, e.g.
+
+        ProcessPoolExecutor(max_workers=4, **worker_logging())
+
+    `mp_context` defaults to the platform's default start method.
+    """
+    import multiprocessing
+
+    context = mp_context or multiprocessing.get_context()
+    if _handler is None:
+        return {"mp_context": context}
+    return {
+        "mp_context": context,
+        "initializer": _init_worker_logging,
+        "initargs": (_handler.worker_queue(context), logging.getLogger().level, dict(_context.get())),
+    }
 
-# Log file name
-LOG_FILE = f"dmart_project_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
 
-# Logs directory (ONLY directory)
-logs_dir = os.path.join(os.getcwd(), "logs")
-os.makedirs(logs_dir, exist_ok=True)
+def shutdown_logging():
+    """
+    Flushes queued records to the log file; registered to run at exit.
+    """
+    if _handler is not None:
+        _handler.stop()
 
-# Full log file path
-LOG_FILE_PATH = os.path.join(logs_dir, LOG_FILE)
 
-# Logging configuration
-logging.basicConfig(
-    filename=LOG_FILE_PATH,
-    format="[%(asctime)s] %(levelname)s - %(message)s",
-    level=logging.INFO
-)
+configure_logging()
+atexit.register(shutdown_logging)
 
 # ✅ THIS IS MANDATORY
 logger = logging.getLogger(__name__)
@@ -0,0 +1,204 @@
+import sys
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+from src.DMARTProject.components.analysis_stats import AnalysisStatsConfig
+from src.DMARTProject.components.data_cleaning import DataCleaning
+from src.DMARTProject.components.data_ingestion_pipeline import DataIngestionPipeline
+from src.DMARTProject.components.data_transformation import DataTransformation
+from src.DMARTProject.components.data_validation import DataValidation, DataValidationConfig
+from src.DMARTProject.components.deduplication import DeduplicationConfig
+from src.DMARTProject.components.kpi_cube import KPICubeConfig
+from src.DMARTProject.components.plot_rendering import PlotConfig
+from src.DMARTProject.pipelines.etl_pipeline import ETLPipeline, ETLPipelineConfig
+from src.DMARTProject.utils.dag import DAGConfig, DAGRunner, Stage
+from src.DMARTProject.utils.result_cache import ResultCacheConfig
+from src.DMARTProject.loggers.logger import logger
+from src.exception import CustomException
+
+
+@dataclass
+class DAGPipelineConfig:
+    etl: ETLPipelineConfig = field(default_factory=ETLPipelineConfig)
+    dag: DAGConfig = field(default_factory=DAGConfig)
+    # Stages to run (with their dependencies); None runs all of them
+    targets: Optional[List[str]] = None
+
+
+class DAGPipeline(ETLPipeline):
+    """
+    The ETL pipeline as a stage graph run by utils/dag.py:
+
+        ingestion -> validation -> cleaning -+-> transformation
+                                             +-> analysis
+                                             +-> kpi_cube (if build_kpi_cube)
+                                             +-> persistence -> stored_procedure
+
+    Ingestion always re-reads the source; every later stage is skipped when
+    its inputs and settings are unchanged since the last successful run.
+    The branches after cleaning run concurrently, and a rerun after a
+    failure continues at the failed stage.
+    """
+
+    def __init__(self, config: DAGPipelineConfig = DAGPipelineConfig()):
+        super().__init__(config.etl)
+        self.pipeline_config = config
+        # (delta, replaced rows) of this run's ingestion for the analysis
+        # and KPI cube stages; a full rebuild when ingestion is reused
+        # from an earlier run
+        self._delta = (None, 0)
+        # Raw data version of this run's ingestion, for the analysis cache keys
+        self._data_version: Optional[str] = None
+        # This run's ingestion, whose watermark is committed once persistence is done
+        self._extracted: Optional[DataIngestionPipeline] = None
+
+    def stages(self) -> List[Stage]:
+        """
+        The stage graph. Each stage gets the settings it uses as params, so
+        they are part of its cache key.
+        """
+        etl = self.config
+        parallel = {"workers": etl.parallel_workers, "partition_by": etl.partition_by}
+        stages = [
+            Stage(
+                "ingestion",
+                self._ingestion,
+                params={"incremental": etl.incremental, "export_csv": etl.export_csv},
+                volatile=True,
+            ),
+            Stage(
+                "validation",
+                self._validation,
+                inputs=("ingestion",),
+                params={"on_error": etl.validation_on_error, "checkpoint": etl.checkpoint, **parallel},
+            ),
+            Stage("cleaning", self._cleaning, inputs=("validation",), params=parallel),
+            Stage("transformation", self._transformation, inputs=("cleaning",), params={"checkpoint": etl.checkpoint}),
+            Stage(
+                "analysis",
+                self._analysis,
+                inputs=("cleaning",),
+                params={"stats_config": etl.analysis_stats, "cache_config": etl.analysis_cache, "plots": etl.plots},
+            ),
+            Stage(
+                "persistence",
+                self._persistence,
+                inputs=("cleaning",),
+                params={
+                    "database_url": etl.database_url,
+                    "table_name": etl.cleaned_table,
+                    "mode": etl.persist_mode,
+                    "key": etl.merge_key,
+                    "export_csv": etl.export_csv,
+                    "dedup": self._dedup_config,
+                },
+            ),
+            Stage(
+                "stored_procedure",
+                self._stored_procedure,
+                inputs=("persistence",),
+                params={"database_url": etl.database_url, "sp_name": etl.stored_procedure},
+            ),
+        ]
+        if etl.build_kpi_cube:
+            stages.append(
+                Stage(
+                    "kpi_cube",
+                    self._kpi_cube,
+                    inputs=("cleaning",),
+                    params={"cube_config": etl.kpi_cube, "database_url": etl.database_url},
+                )
+            )
+        return stages
+
+    # ==========================
+    # STAGES
+    # ==========================
+    def _ingestion(self, incremental: bool, export_csv: bool) -> pd.DataFrame:
+        ingestion = DataIngestionPipeline(export_csv=export_csv)
+        raw_df = ingestion.extract(incremental=incremental)
+        ingestion.split(raw_df)
+        self._delta = (self._incremental_delta(ingestion, raw_df), ingestion.last_replaced)
+        self._extracted = ingestion
+        self._data_version = ingestion.last_version
+        self._memory_report(raw_df, "ingestion")
+        return raw_df
+
+    def _validation(
+        self,
+        ingestion: pd.DataFrame,
+        on_error: str,
+        checkpoint: bool,
+        workers: Optional[int],
+        partition_by: str,
+    ) -> pd.DataFrame:
+        validator = DataValidation(DataValidationConfig(on_error=on_error))
+        parallel = self._parallel_config(workers, partition_by)
+        return validator.validate(ingestion, checkpoint=checkpoint, parallel=parallel)
+
+    def _cleaning(self, validation: pd.DataFrame, workers: Optional[int], partition_by: str) -> pd.DataFrame:
+        cleaning = DataCleaning(validation)
+        parallel = self._parallel_config(workers, partition_by)
+        if parallel is not None:
+            cleaned_df = cleaning.clean_parallel(parallel)
+        else:
+            cleaned_df = cleaning.clean_data()
+        self._memory_report(cleaned_df, "cleaning")
+        return cleaned_df
+
+    def _transformation(self, cleaning: pd.DataFrame, checkpoint: bool) -> pd.DataFrame:
+        return DataTransformation().transform(cleaning, checkpoint=checkpoint)
+
+    # The stages after cleaning run the same steps as the ETL branches
+    def _analysis(
+        self,
+        cleaning: pd.DataFrame,
+        stats_config: AnalysisStatsConfig,
+        cache_config: Optional[ResultCacheConfig],
+        plots: PlotConfig,
+    ) -> Dict:
+        return self._run_analysis(cleaning, *self._delta, stats_config, cache_config, plots, self._data_version)
+
+    def _kpi_cube(self, cleaning: pd.DataFrame, cube_config: KPICubeConfig, database_url: Optional[str]) -> pd.DataFrame:
+        return self._run_kpi_cube(cleaning, self._delta[0], cube_config, database_url)
+
+    def _persistence(
+        self,
+        cleaning: pd.DataFrame,
+        database_url: Optional[str],
+        table_name: str,
+        mode: str,
+        key: str,
+        export_csv: bool,
+        dedup: Optional[DeduplicationConfig],
+    ) -> Dict:
+        self._save_cleaned(cleaning, export_csv)
+        return self._load_cleaned(cleaning, database_url, table_name, mode, key, dedup)
+
+    def _stored_procedure(self, persistence: Dict, database_url: Optional[str], sp_name: str) -> str:
+        self._call_stored_procedure(database_url, sp_name)
+        return sp_name
+
+    # ==========================
+    # RUN
+    # ==========================
+    def run(self) -> Dict[str, str]:
+        """
+        Runs the stage graph; returns {stage: "ran" | "skipped"}.
+        """
+        try:
+            runner = DAGRunner(self.stages(), self.pipeline_config.dag, self.instrumentation)
+            statuses = runner.run(self.pipeline_config.targets)
+            # A resumed run reuses the failed run's extract and leaves the
+            # watermark behind; the next run re-extracts those rows, which
+            # merge as unchanged
+            if self._extracted is not None and "persistence" in statuses:
+                self._extracted.commit_watermark()
+            logger.info(f"DAG pipeline completed: {statuses}")
+            return statuses
+
+        except Exception as e:
+            logger.exception("DAG pipeline failed")
+            raise CustomException(e, sys)
@@ -0,0 +1,480 @@
+import json
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+from src.DMARTProject.components.data_ingestion_pipeline import DataIngestionPipeline
+from src.DMARTProject.components.data_validation import DataValidation, DataValidationConfig
+from src.DMARTProject.components.data_cleaning import DataCleaning
+from src.DMARTProject.components.analysis_stats import AnalysisStats, AnalysisStatsConfig
+from src.DMARTProject.components.data_analysis import DataAnalysis
+from src.DMARTProject.components.datapersistence import DataPersistence
+from src.DMARTProject.components.deduplication import DeduplicationConfig, Deduplicator
+from src.DMARTProject.components.kpi_cube import KPICube, KPICubeConfig
+from src.DMARTProject.components.plot_rendering import PlotConfig
+from src.DMARTProject.utils.artifacts import artifact_path, write_artifact
+from src.DMARTProject.utils.common import enable_copy_on_write, memory_report
+from src.DMARTProject.utils.dag import content_hash
+from src.DMARTProject.utils.instrumentation import Instrumentation, InstrumentationConfig
+from src.DMARTProject.utils.parallel import ParallelConfig
+from src.DMARTProject.utils.result_cache import ResultCache, ResultCacheConfig
+from src.DMARTProject.loggers.logger import logger
+from src.exception import CustomException
+
+
+@dataclass
+class ETLPipelineConfig:
+    # None: resolved from the environment by utils/connection.py
+    database_url: Optional[str] = None
+    cleaned_table: str = "DMART_Cleaned"
+    stored_procedure: str = "sp_InsertSalesData"
+    # "replace" reloads the table, "merge" upserts changed rows on merge_key
+    persist_mode: str = "replace"
+    merge_key: str = "SalesID"
+    incremental: bool = False
+    export_csv: bool = False
+    # Write intermediate (validated) artifacts to disk
+    checkpoint: bool = False
+    # "raise" or "quarantine" invalid rows (see DataValidationConfig)
+    validation_on_error: str = "raise"
+    streaming_chunksize: Optional[int] = None
+    # Log the in-memory size of each stage's output
+    memory_report: bool = True
+    # Run validation/cleaning partitioned on a process pool
+    # (None: single process; 0: one worker per core)
+    parallel_workers: Optional[int] = None
+    # "rows" or "month" (OrderDate), see utils/parallel.py
+    partition_by: str = "rows"
+    # Drop rows already loaded by earlier chunks/runs (persistent fingerprints);
+    # the history is reset when persist_mode="replace" reloads the table
+    deduplicate: bool = False
+    dedup: DeduplicationConfig = field(default_factory=DeduplicationConfig)
+    # Dashboard aggregates (components/kpi_cube.py), refreshed every run
+    build_kpi_cube: bool = True
+    kpi_cube: KPICubeConfig = field(default_factory=KPICubeConfig)
+    # Running EDA statistics, updated with only the delta rows on incremental runs
+    analysis_stats: AnalysisStatsConfig = field(default_factory=AnalysisStatsConfig)
+    # On-disk cache of EDA results/plots; None recomputes them every run
+    analysis_cache: Optional[ResultCacheConfig] = field(default_factory=ResultCacheConfig)
+    # Input key and outputs of the last analysis branch; the whole branch
+    # (stats, EDA, KPI cube) is skipped while both are unchanged.
+    # None always runs it
+    analysis_state_path: Optional[str] = "artifacts/analysis/last_run.json"
+    # EDA plot resolution, format and rendering workers
+    plots: PlotConfig = field(default_factory=PlotConfig)
+    # Per-stage timing/memory/IO records (JSON lines, Prometheus, cProfile)
+    instrumentation: InstrumentationConfig = field(default_factory=InstrumentationConfig)
+    # Overlap the analysis branch (EDA, KPI cube) with the persistence
+    # branch (artifacts, SQL load, stored procedure) after cleaning
+    concurrent_branches: bool = False
+
+
+class ETLPipeline:
+    """
+    Wires ingestion -> validation -> cleaning -> analysis -> persistence.
+    Each stage receives the previous stage's DataFrame by reference; disk is
+    only touched for the raw/cleaned artifacts and for checkpoints.
+    """
+
+    def __init__(self, config: ETLPipelineConfig):
+        self.config = config
+        enable_copy_on_write()
+        self.instrumentation = Instrumentation(config.instrumentation)
+        self.parallel = self._parallel_config(config.parallel_workers, config.partition_by)
+
+    @staticmethod
+    def _parallel_config(workers: Optional[int], partition_by: str) -> Optional[ParallelConfig]:
+        if workers is None:
+            return None
+        return ParallelConfig(workers=workers or None, partition_by=partition_by)
+
+    @property
+    def _dedup_config(self) -> Optional[DeduplicationConfig]:
+        # None when deduplication is off
+        return self.config.dedup if self.config.deduplicate else None
+
+    @staticmethod
+    def _deduplicator(dedup: Optional[DeduplicationConfig], mode: str) -> Optional[Deduplicator]:
+        if dedup is None:
+            return None
+        # A replace load rebuilds the history, swapped in on commit()
+        return Deduplicator(dedup, replace=mode == "replace")
+
+    def _analysis_stats(
+        self,
+        cleaned_df: pd.DataFrame,
+        delta_df: Optional[pd.DataFrame],
+        replaced: int,
+        stats_config: AnalysisStatsConfig,
+    ) -> AnalysisStats:
+        """
+        Running stats of `cleaned_df`. An incremental run folds only the
+        cleaned rows of the ingestion delta into the saved stats. They are
+        rebuilt instead after a full load (`delta_df` None), when the delta
+        replaced rows that were already counted (min/max and the sketches
+        cannot take the old versions back out) or when the saved stats do
+        not add up to the cleaned frame.
+        """
+        accuracy = stats_config.quantile_accuracy
+        stats = None
+        if delta_df is not None:
+            stats = AnalysisStats.load(stats_config.stats_path)
+            if stats is not None and replaced:
+                logger.info(f"Delta replaced {replaced} existing rows; rebuilding analysis stats")
+                stats = None
+
+        if stats is not None:
+            # Delta rows are identified by SalesID, as in the ingestion merge
+            added = stats.update(cleaned_df[cleaned_df["SalesID"].isin(delta_df["SalesID"])])
+            if stats.row_count == len(cleaned_df):
+                logger.info(f"Analysis stats updated with {added} delta rows")
+                return stats
+            logger.warning(
+                f"Saved analysis stats cover {stats.row_count - added} rows, expected "
+                f"{len(cleaned_df) - added}; rebuilding"
+            )
+
+        return AnalysisStats.from_frame(cleaned_df, accuracy=accuracy)
+
+    @staticmethod
+    def _incremental_delta(ingestion: DataIngestionPipeline, raw_df: pd.DataFrame) -> Optional[pd.DataFrame]:
+        # None after a full load, where the delta is the whole frame
+        delta_df = ingestion.last_delta
+        return delta_df if len(delta_df) < len(raw_df) else None
+
+    def _memory_report(self, df: pd.DataFrame, stage: str):
+        if self.config.memory_report:
+            memory_report(df, stage)
+
+    # ===============================
+    # STEPS AFTER CLEANING
+    # ===============================
+    # Shared by the branches below and the DAGPipeline stages, which pass
+    # the settings they are keyed on. `delta_df` is the ingestion delta of
+    # an incremental run, None after a full load.
+    def _run_analysis(
+        self,
+        cleaned_df: pd.DataFrame,
+        delta_df: Optional[pd.DataFrame],
+        replaced: int,
+        stats_config: AnalysisStatsConfig,
+        cache_config: Optional[ResultCacheConfig],
+        plots: PlotConfig,
+        data_version: Optional[str] = None,
+    ) -> Dict:
+        stats = self._analysis_stats(cleaned_df, delta_df, replaced, stats_config)
+        stats.save(stats_config.stats_path)
+
+        cache = ResultCache(cache_config) if cache_config else None
+        analyzer = DataAnalysis(cleaned_df, stats=stats, cache=cache, plot_config=plots, data_version=data_version)
+        metrics = analyzer.basic_metrics()
+        logger.info(f"EDA Metrics: {metrics}")
+        plots = analyzer.save_core_plots()
+        logger.info("EDA artifacts saved")
+        return {"metrics": metrics, "plots": plots}
+
+    def _run_kpi_cube(
+        self,
+        cleaned_df: pd.DataFrame,
+        delta_df: Optional[pd.DataFrame],
+        cube_config: KPICubeConfig,
+        database_url: Optional[str],
+    ) -> pd.DataFrame:
+        cube = KPICube(cube_config, database_url)
+        if delta_df is not None:
+            # Incremental run: only the months touched by the delta change
+            cube.refresh(cleaned_df, KPICube.periods_of(delta_df))
+        else:
+            cube.build(cleaned_df)
+        cube.save()
+        return cube.cube
+
+    def _save_cleaned(self, cleaned_df: pd.DataFrame, export_csv: bool) -> str:
+        cleaned_path = write_artifact(cleaned_df, artifact_path("artifacts", "cleaned_data"))
+        logger.info(f"Cleaned data saved at {cleaned_path}")
+
+        if export_csv:
+            csv_path = write_artifact(cleaned_df, artifact_path("artifacts", "cleaned_data", "csv"))
+            logger.info(f"Cleaned data exported to {csv_path}")
+        return cleaned_path
+
+    def _load_cleaned(
+        self,
+        cleaned_df: pd.DataFrame,
+        database_url: Optional[str],
+        table_name: str,
+        mode: str,
+        key: str,
+        dedup: Optional[DeduplicationConfig],
+    ) -> Dict:
+        # Only rows not loaded by earlier runs go to SQL
+        new_df = cleaned_df
+        deduplicator = self._deduplicator(dedup, mode)
+        if deduplicator is not None:
+            new_df = deduplicator.filter(cleaned_df)
+
+        stats = DataPersistence(database_url).write_to_sql(new_df, table_name=table_name, mode=mode, key=key)
+        logger.info("Cleaned data written to SQL table")
+        if deduplicator is not None:
+            deduplicator.commit()
+            deduplicator.close()
+        return stats
+
+    def _call_stored_procedure(self, database_url: Optional[str], sp_name: str):
+        DataPersistence(database_url).call_stored_procedure(sp_name)
+        logger.info("Stored procedure executed successfully")
+
+    def _analysis_key(self, cleaned_df: pd.DataFrame, data_version: Optional[str] = None) -> str:
+        # The cleaned data plus every setting that shapes the branch outputs.
+        # The cleaned data is derived from the raw data, so the raw data
+        # version from ingestion identifies it without hashing every row
+        config = self.config
+        return ResultCache.make_key(
+            data_version or content_hash(cleaned_df),
+            config.analysis_stats,
+            config.plots,
+            config.build_kpi_cube and (config.kpi_cube, config.database_url),
+        )
+
+    def _analysis_unchanged(self, key: str) -> bool:
+        path = self.config.analysis_state_path
+        if path is None or not os.path.exists(path):
+            return False
+        with open(path) as fp:
+            state = json.load(fp)
+        # Deleted outputs are rebuilt even for unchanged data
+        return state["key"] == key and all(os.path.exists(output) for output in state["outputs"])
+
+    def _record_analysis(self, key: str, outputs: List[str]):
+        path = self.config.analysis_state_path
+        if path is None:
+            return
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as fp:
+            json.dump({"key": key, "outputs": outputs}, fp, indent=2)
+        os.replace(tmp_path, path)
+
+    # ===============================
+    # BRANCHES AFTER CLEANING
+    # ===============================
+    def _analysis_branch(
+        self,
+        cleaned_df: pd.DataFrame,
+        delta_df: Optional[pd.DataFrame] = None,
+        replaced: int = 0,
+        data_version: Optional[str] = None,
+    ):
+        """
+        CPU-bound: EDA stats, metrics and plots, then the KPI cube.
+        Skipped as a whole when the cleaned data and settings are the same
+        as in the last completed run.
+        """
+        stage = self.instrumentation.stage
+        key = self._analysis_key(cleaned_df, data_version)
+        if self._analysis_unchanged(key):
+            logger.info("Cleaned data unchanged: analysis stats, EDA and KPI cube are up to date")
+            return
+
+        # ===============================
+        # STEP 4: DATA ANALYSIS
+        # ===============================
+        with stage("analysis", rows_in=len(cleaned_df)):
+            config = self.config
+            result = self._run_analysis(
+                cleaned_df, delta_df, replaced, config.analysis_stats, config.analysis_cache, config.plots, data_version
+            )
+        outputs = [self.config.analysis_stats.stats_path] + result["plots"]
+
+        # ===============================
+        # STEP 4b: KPI CUBE
+        # ===============================
+        if self.config.build_kpi_cube:
+            with stage("kpi_cube", rows_in=len(cleaned_df)) as metrics:
+                cube = self._run_kpi_cube(cleaned_df, delta_df, self.config.kpi_cube, self.config.database_url)
+                metrics.rows_out = len(cube)
+            outputs.append(self.config.kpi_cube.cube_path)
+
+        self._record_analysis(key, outputs)
+
+    def _persistence_branch(self, cleaned_df: pd.DataFrame):
+        """
+        I/O-bound: cleaned artifact (and CSV export), SQL load and the
+        stored procedure.
+        """
+        stage = self.instrumentation.stage
+        config = self.config
+
+        # ===============================
+        # STEP 5: SAVE CLEANED DATA
+        # STEP 6: WRITE TO SQL
+        # ===============================
+        with stage("persistence", rows_in=len(cleaned_df)) as metrics:
+            self._save_cleaned(cleaned_df, config.export_csv)
+            stats = self._load_cleaned(
+                cleaned_df,
+                config.database_url,
+                config.cleaned_table,
+                config.persist_mode,
+                config.merge_key,
+                self._dedup_config,
+            )
+            metrics.rows_out = stats["rows"]
+
+        with stage("stored_procedure"):
+            self._call_stored_procedure(config.database_url, config.stored_procedure)
+
+    def _run_branches_concurrently(
+        self,
+        cleaned_df: pd.DataFrame,
+        delta_df: Optional[pd.DataFrame] = None,
+        replaced: int = 0,
+        data_version: Optional[str] = None,
+    ):
+        """
+        Runs the analysis and persistence branches at the same time; both
+        only read `cleaned_df`. Threads suffice: the SQL load, file writes
+        and stored procedure wait on I/O with the GIL released, and plot
+        rendering already runs on its own process pool. If a branch fails,
+        the other one is still allowed to finish (no half-written load),
+        then the first failure is raised.
+
+        The overlapping stages record wall time only; CPU, peak RSS and IO
+        are recorded for the two branches together as the "branches" stage.
+        """
+        branches = self.instrumentation.concurrent("branches", rows_in=len(cleaned_df))
+        with branches, ThreadPoolExecutor(max_workers=2, thread_name_prefix="etl-branch") as pool:
+            futures = {
+                pool.submit(self._analysis_branch, cleaned_df, delta_df, replaced, data_version): "analysis",
+                pool.submit(self._persistence_branch, cleaned_df): "persistence",
+            }
+            errors = []
+            for future in as_completed(futures):
+                try:
+                    future.result()
+                    logger.info(f"{futures[future].capitalize()} branch completed")
+                except Exception as e:
+                    logger.exception(f"{futures[future].capitalize()} branch failed")
+                    errors.append(e)
+
+        if errors:
+            raise errors[0]
+
+    def run(self) -> pd.DataFrame:
+        try:
+            stage = self.instrumentation.stage
+
+            # ===============================
+            # STEP 1: DATA INGESTION
+            # ===============================
+            with stage("ingestion") as metrics:
+                ingestion = DataIngestionPipeline(export_csv=self.config.export_csv)
+                raw_df = ingestion.extract(incremental=self.config.incremental)
+                ingestion.split(raw_df)
+                metrics.rows_out = len(raw_df)
+            logger.info("Data ingestion completed")
+            self._memory_report(raw_df, "ingestion")
+            delta_df = self._incremental_delta(ingestion, raw_df)
+
+            # ===============================
+            # STEP 2: DATA VALIDATION (CONFIG-DRIVEN)
+            # ===============================
+            with stage("validation", rows_in=len(raw_df)) as metrics:
+                validator = DataValidation(DataValidationConfig(on_error=self.config.validation_on_error))
+                validated_df = validator.validate(
+                    raw_df,
+                    checkpoint=self.config.checkpoint,
+                    parallel=self.parallel,
+                )
+                metrics.rows_out = len(validated_df)
+            logger.info("Data validation completed")
+            self._memory_report(validated_df, "validation")
+
+            # ===============================
+            # STEP 3: DATA CLEANING
+            # ===============================
+            with stage("cleaning", rows_in=len(validated_df)) as metrics:
+                cleaning = DataCleaning(validated_df)
+                if self.parallel is not None:
+                    cleaned_df = cleaning.clean_parallel(self.parallel)
+                else:
+                    cleaned_df = cleaning.clean_data()
+                metrics.rows_out = len(cleaned_df)
+            logger.info("Data cleaning completed")
+            self._memory_report(cleaned_df, "cleaning")
+
+            if self.config.concurrent_branches:
+                self._run_branches_concurrently(cleaned_df, delta_df, ingestion.last_replaced, ingestion.last_version)
+            else:
+                self._analysis_branch(cleaned_df, delta_df, ingestion.last_replaced, ingestion.last_version)
+                self._persistence_branch(cleaned_df)
+
+            # Only now are the extracted rows persisted
+            ingestion.commit_watermark()
+            return cleaned_df
+
+        except Exception as e:
+            logger.exception("ETL pipeline failed")
+            raise CustomException(e, sys)
+
+    def run_streaming(self) -> int:
+        """
+        Chunked run: ingestion -> validation -> cleaning -> SQL.
+        Each stage consumes the previous one as a generator, so only one chunk
+        is held in memory at a time. Returns the number of rows written.
+        """
+        try:
+            # The stages run interleaved chunk by chunk, so they are
+            # measured together
+            with self.instrumentation.stage("streaming") as metrics:
+                ingestion = DataIngestionPipeline()
+                chunks = ingestion.initiate_streaming_ingestion(self.config.streaming_chunksize)
+                validator = DataValidation(DataValidationConfig(on_error=self.config.validation_on_error))
+                chunks = validator.validate_chunks(chunks)
+                chunks = DataCleaning.clean_chunks(chunks)
+                # A streaming run reloads everything, so the cube is rebuilt chunk by chunk
+                cube = None
+                if self.config.build_kpi_cube:
+                    cube = KPICube(self.config.kpi_cube, self.config.database_url)
+                    chunks = cube.add_chunks(chunks)
+
+                # EDA over the stream: running stats are built chunk by chunk
+                analysis_stats = AnalysisStats(accuracy=self.config.analysis_stats.quantile_accuracy)
+                chunks = analysis_stats.add_chunks(chunks)
+
+                # Cleaning only dedups within a chunk; this also covers
+                # duplicates across chunks and earlier runs
+                deduplicator = self._deduplicator(self._dedup_config, self.config.persist_mode)
+                if deduplicator is not None:
+                    chunks = deduplicator.filter_chunks(chunks)
+
+                persistence = DataPersistence(self.config.database_url)
+                stats = persistence.write_chunks(
+                    chunks,
+                    table_name=self.config.cleaned_table,
+                    mode=self.config.persist_mode,
+                    key=self.config.merge_key,
+                )
+                logger.info(f"Streamed {stats['rows']} cleaned rows to SQL table")
+                if cube is not None and cube.cube is not None:
+                    cube.save()
+                analysis_stats.save(self.config.analysis_stats.stats_path)
+                logger.info(f"EDA Metrics: {DataAnalysis(stats=analysis_stats).basic_metrics()}")
+                if deduplicator is not None:
+                    deduplicator.commit()
+                    deduplicator.close()
+                metrics.rows_out = stats["rows"]
+
+            with self.instrumentation.stage("stored_procedure"):
+                persistence.call_stored_procedure(self.config.stored_procedure)
+            logger.info("Stored procedure executed successfully")
+
+            return stats["rows"]
+
+        except Exception as e:
+            logger.exception("Streaming ETL pipeline failed")
+            raise CustomException(e, sys)
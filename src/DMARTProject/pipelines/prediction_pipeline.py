@@ -0,0 +1,237 @@
+import os
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from src.DMARTProject.components.datapersistence import DataPersistence
+from src.DMARTProject.components.model_trainer import (
+    CATEGORICAL_FEATURES,
+    NUMERIC_FEATURES,
+    LossRiskModel,
+    latest_model_info,
+)
+from src.DMARTProject.utils.artifacts import iter_artifact, open_artifact_writer
+from src.DMARTProject.utils.instrumentation import Instrumentation, InstrumentationConfig
+from src.DMARTProject.utils.schema import get_schema
+from src.DMARTProject.loggers.logger import logger
+from src.exception import CustomException
+
+
+@dataclass
+class PredictionPipelineConfig:
+    model_dir: str = "artifacts/model"
+    # Scored by run(); score_frame() takes an in-memory frame instead,
+    # e.g. DataIngestionPipeline.last_delta after an incremental extract
+    input_path: str = "artifacts/raw_data.parquet"
+    # Rows per vectorized scoring batch and per output write
+    batch_size: int = 250_000
+    # Predictions artifact; None skips it
+    output_path: Optional[str] = "artifacts/predictions.parquet"
+    # SQL table the predictions are bulk-loaded into; None skips it
+    output_table: Optional[str] = None
+    database_url: Optional[str] = None
+    # "replace", "append" or "merge" (upsert on SalesID, for daily deltas)
+    persist_mode: str = "merge"
+    threshold: float = 0.5
+    instrumentation: InstrumentationConfig = field(default_factory=InstrumentationConfig)
+
+
+# ==========================
+# MODEL CACHE
+# ==========================
+@dataclass
+class _CachedModel:
+    model: LossRiskModel
+    # latest.json modification time the entry was validated against
+    mtime_ns: int
+
+
+_model_cache: Dict[str, _CachedModel] = {}
+_model_cache_lock = threading.Lock()
+
+
+def load_model(model_dir: str) -> LossRiskModel:
+    """
+    The current model of `model_dir`, unpickled once per process and
+    version. While latest.json is unchanged a call costs a single stat();
+    when training publishes a new version, the next call loads it.
+    """
+    key = os.path.abspath(model_dir)
+    latest = os.path.join(key, "latest.json")
+    try:
+        mtime_ns = os.stat(latest).st_mtime_ns
+    except FileNotFoundError:
+        raise FileNotFoundError(f"No trained model in {model_dir}; run the training pipeline first")
+
+    cached = _model_cache.get(key)
+    if cached is not None and cached.mtime_ns == mtime_ns:
+        return cached.model
+
+    with _model_cache_lock:
+        cached = _model_cache.get(key)
+        if cached is not None and cached.mtime_ns == mtime_ns:
+            return cached.model
+
+        info = latest_model_info(key)
+        if cached is not None and cached.model.version == info["version"]:
+            model = cached.model
+        else:
+            model = LossRiskModel.load(info["path"])
+            logger.info(f"Loaded model {model.version} from {info['path']}")
+        _model_cache[key] = _CachedModel(model, mtime_ns)
+        return model
+
+
+def clear_model_cache():
+    with _model_cache_lock:
+        _model_cache.clear()
+
+
+def loss_probability(model: LossRiskModel, df: pd.DataFrame) -> np.ndarray:
+    """
+    P(IsLoss) for every row of `df`, vectorized over the whole batch.
+    For the log-loss SGDClassifier this is sigmoid(X . w + b); computing it
+    directly skips sklearn's per-call input validation, which dominates
+    the latency of small batches. Same result as model.predict_proba.
+    """
+    X = model.encoder.transform(df)
+    z = X @ model.estimator.coef_[0] + model.estimator.intercept_[0]
+    # sigmoid(z) without overflow for large |z|
+    return np.exp(-np.logaddexp(0.0, -z))
+
+
+# ==========================
+# PIPELINE
+# ==========================
+class PredictionPipeline:
+    """
+    Scores sales rows with the current loss-risk model:
+
+    - batch mode (run / score_frame): the input is scored in batches of
+      batch_size rows, each in a few vectorized NumPy operations, and the
+      predictions are streamed batch by batch to the output artifact
+      and/or bulk-loaded into a SQL table;
+    - latency mode (predict): a small on-demand batch (a frame or a list
+      of records) is scored in-process and returned, with no I/O.
+
+    The model is taken from the process-wide cache (load_model), so it is
+    read from disk once per version. A batch run uses the same version
+    for all its rows.
+    """
+
+    OUTPUT_COLUMNS = ["SalesID", "LossProbability", "PredictedLoss", "ModelVersion"]
+
+    def __init__(self, config: PredictionPipelineConfig = PredictionPipelineConfig()):
+        self.config = config
+        self.instrumentation = Instrumentation(config.instrumentation)
+        self.schema = get_schema()
+
+    @property
+    def model(self) -> LossRiskModel:
+        return load_model(self.config.model_dir)
+
+    def _score(self, model: LossRiskModel, df: pd.DataFrame) -> pd.DataFrame:
+        proba = loss_probability(model, df)
+        return pd.DataFrame(
+            {
+                # On-demand records without a SalesID are identified by their index
+                "SalesID": df["SalesID"].to_numpy() if "SalesID" in df.columns else df.index.to_numpy(),
+                "LossProbability": proba.astype("float32"),
+                "PredictedLoss": proba >= self.config.threshold,
+                # A filled array; broadcasting the scalar is about twice as slow
+                "ModelVersion": np.full(len(df), model.version, dtype=object),
+            },
+            columns=self.OUTPUT_COLUMNS,
+        )
+
+    # ==========================
+    # LATENCY MODE
+    # ==========================
+    def predict(self, rows: Union[pd.DataFrame, List[Dict]]) -> pd.DataFrame:
+        """
+        Scores a small on-demand batch and returns the predictions.
+        """
+        df = rows if isinstance(rows, pd.DataFrame) else pd.DataFrame.from_records(rows)
+        return self._score(self.model, df)
+
+    # ==========================
+    # BATCH MODE
+    # ==========================
+    def _batches(self, df: pd.DataFrame) -> Iterator[pd.DataFrame]:
+        for start in range(0, len(df), self.config.batch_size):
+            yield df.iloc[start : start + self.config.batch_size]
+
+    def score_chunks(self, chunks: Iterable[pd.DataFrame], model: Optional[LossRiskModel] = None) -> Iterator[pd.DataFrame]:
+        """
+        Predictions for every chunk, one output frame per input chunk.
+        """
+        model = model or self.model
+        for chunk in chunks:
+            if len(chunk):
+                yield self._score(model, chunk)
+
+    def _write_artifact(self, predictions: Iterable[pd.DataFrame]) -> Iterator[pd.DataFrame]:
+        # Passes the batches through, so the SQL load can consume the same stream
+        with open_artifact_writer(self.config.output_path) as writer:
+            for batch in predictions:
+                writer.write(batch)
+                yield batch
+
+    def run(self, chunks: Optional[Iterable[pd.DataFrame]] = None) -> Dict:
+        """
+        Scores `chunks` (default: the input_path artifact, streamed in
+        batch_size rows) and writes the predictions. Returns throughput
+        stats (rows, seconds, rows_per_sec) and the model version.
+        """
+        try:
+            logger.info("Prediction pipeline started")
+            model = self.model
+            if chunks is None:
+                chunks = iter_artifact(
+                    self.config.input_path,
+                    chunksize=self.config.batch_size,
+                    columns=["SalesID"] + NUMERIC_FEATURES + CATEGORICAL_FEATURES,
+                    schema=self.schema,
+                )
+
+            with self.instrumentation.stage("prediction") as metrics:
+                started = time.perf_counter()
+                predictions = self.score_chunks(chunks, model)
+                if self.config.output_path:
+                    predictions = self._write_artifact(predictions)
+
+                if self.config.output_table:
+                    stats = DataPersistence(self.config.database_url).write_chunks(
+                        predictions, self.config.output_table, mode=self.config.persist_mode, key="SalesID"
+                    )
+                    rows = stats["rows"]
+                else:
+                    rows = sum(len(batch) for batch in predictions)
+                seconds = time.perf_counter() - started
+                metrics.rows_in = metrics.rows_out = rows
+
+            result = {
+                "model_version": model.version,
+                "rows": rows,
+                "seconds": round(seconds, 4),
+                "rows_per_sec": round(rows / seconds, 1) if seconds > 0 else None,
+                "output_path": self.config.output_path,
+                "output_table": self.config.output_table,
+            }
+            logger.info(f"Scored {rows} rows with model {model.version}", extra=result)
+            return result
+
+        except Exception as e:
+            logger.exception("Prediction pipeline failed")
+            raise CustomException(e, sys)
+
+    def score_frame(self, df: pd.DataFrame) -> Dict:
+        """
+        Batch-scores an in-memory frame, e.g. the daily delta.
+        """
+        return self.run(self._batches(df))
@@ -0,0 +1,46 @@
+import sys
+from dataclasses import dataclass, field
+from typing import Dict
+
+from src.DMARTProject.components.model_evaluation import ModelEvaluation, ModelEvaluationConfig
+from src.DMARTProject.components.model_trainer import ModelTrainer, ModelTrainerConfig
+from src.DMARTProject.utils.instrumentation import Instrumentation, InstrumentationConfig
+from src.DMARTProject.loggers.logger import logger
+from src.exception import CustomException
+
+
+@dataclass
+class TrainingPipelineConfig:
+    trainer: ModelTrainerConfig = field(default_factory=ModelTrainerConfig)
+    evaluation: ModelEvaluationConfig = field(default_factory=ModelEvaluationConfig)
+    # Training time and peak memory per run are recorded as stage metrics
+    instrumentation: InstrumentationConfig = field(default_factory=InstrumentationConfig)
+
+
+class TrainingPipeline:
+    """
+    Trains the loss-risk model on the train artifact written by ingestion
+    and evaluates it on the test artifact, both streamed chunk by chunk.
+    """
+
+    def __init__(self, config: TrainingPipelineConfig = TrainingPipelineConfig()):
+        self.config = config
+        self.instrumentation = Instrumentation(config.instrumentation)
+
+    def run(self) -> Dict:
+        try:
+            logger.info("Training pipeline started")
+
+            with self.instrumentation.stage("model_training"):
+                model = ModelTrainer(self.config.trainer).train()
+
+            with self.instrumentation.stage("model_evaluation") as metrics:
+                result = ModelEvaluation(self.config.evaluation).evaluate(model)
+                metrics.rows_in = result["rows"]
+
+            logger.info(f"Training pipeline completed: model {model.version}")
+            return result
+
+        except Exception as e:
+            logger.exception("Training pipeline failed")
+            raise CustomException(e, sys)
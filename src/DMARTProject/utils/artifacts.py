@@ -0,0 +1,336 @@
+import os
+from typing import Dict, Iterator, List, Optional
+
+import pandas as pd
+
+from src.DMARTProject.utils.schema import apply_schema, read_csv_kwargs
+
+
+class ArtifactFormat:
+    """
+    Base class for the on-disk format of stage artifacts.
+    Subclasses implement whole-frame read/write and a chunked writer.
+    """
+
+    name = ""
+    extension = ""
+
+    def write(self, df: pd.DataFrame, path: str):
+        raise NotImplementedError
+
+    def read(self, path: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        raise NotImplementedError
+
+    def open_writer(self, path: str) -> "ArtifactWriter":
+        raise NotImplementedError
+
+    def iter_chunks(self, path: str, chunksize: int, columns: Optional[List[str]] = None) -> Iterator[pd.DataFrame]:
+        raise NotImplementedError
+
+
+class ArtifactWriter:
+    """
+    Appends DataFrame chunks to a single artifact file.
+    Use as a context manager so the file is finalized on exit.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.rows_written = 0
+
+    def write(self, chunk: pd.DataFrame):
+        self._write(chunk)
+        self.rows_written += len(chunk)
+
+    def _write(self, chunk: pd.DataFrame):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def _stable_schema(schema, keep_dictionaries: bool):
+    """
+    Arrow schema that every chunk can be cast to. Category columns get an
+    int32 dictionary index (chunks differ in cardinality), or are decoded to
+    plain values when the format cannot change dictionaries between batches.
+    """
+    import pyarrow as pa
+
+    fields = []
+    for field in schema:
+        if pa.types.is_dictionary(field.type):
+            value_type = field.type.value_type
+            new_type = pa.dictionary(pa.int32(), value_type) if keep_dictionaries else value_type
+            field = field.with_type(new_type)
+        fields.append(field)
+    return pa.schema(fields, metadata=schema.metadata)
+
+
+# ==========================
+# PARQUET
+# ==========================
+class _ParquetWriter(ArtifactWriter):
+    def __init__(self, path: str, compression: str):
+        super().__init__(path)
+        self.compression = compression
+        self._writer = None
+        self._schema = None
+
+    def _write(self, chunk: pd.DataFrame):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        table = pa.Table.from_pandas(chunk, preserve_index=False)
+        if self._writer is None:
+            self._schema = _stable_schema(table.schema, keep_dictionaries=True)
+            self._writer = pq.ParquetWriter(self.path, self._schema, compression=self.compression)
+        self._writer.write_table(table.cast(self._schema))
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+
+
+class ParquetFormat(ArtifactFormat):
+    name = "parquet"
+    extension = ".parquet"
+
+    def __init__(self, compression: str = "zstd"):
+        self.compression = compression
+
+    def write(self, df: pd.DataFrame, path: str):
+        df.to_parquet(path, engine="pyarrow", compression=self.compression, index=False)
+
+    def read(self, path: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        return pd.read_parquet(path, engine="pyarrow", columns=columns, memory_map=True)
+
+    def open_writer(self, path: str) -> ArtifactWriter:
+        return _ParquetWriter(path, self.compression)
+
+    def iter_chunks(self, path: str, chunksize: int, columns: Optional[List[str]] = None) -> Iterator[pd.DataFrame]:
+        import pyarrow.parquet as pq
+
+        parquet_file = pq.ParquetFile(path, memory_map=True)
+        for batch in parquet_file.iter_batches(batch_size=chunksize, columns=columns):
+            yield batch.to_pandas()
+
+
+# ==========================
+# ARROW IPC (FEATHER V2)
+# ==========================
+class _ArrowIPCWriter(ArtifactWriter):
+    def __init__(self, path: str, compression: str):
+        super().__init__(path)
+        self.compression = compression
+        self._writer = None
+        self._schema = None
+
+    def _write(self, chunk: pd.DataFrame):
+        import pyarrow as pa
+
+        table = pa.Table.from_pandas(chunk, preserve_index=False)
+        if self._writer is None:
+            # IPC files cannot replace dictionaries between record batches
+            self._schema = _stable_schema(table.schema, keep_dictionaries=False)
+            options = pa.ipc.IpcWriteOptions(compression=self.compression)
+            self._writer = pa.ipc.new_file(self.path, self._schema, options=options)
+        self._writer.write_table(table.cast(self._schema))
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+
+
+class ArrowIPCFormat(ArtifactFormat):
+    name = "arrow"
+    extension = ".arrow"
+
+    def __init__(self, compression: str = "zstd"):
+        self.compression = compression
+
+    def write(self, df: pd.DataFrame, path: str):
+        import pyarrow.feather as feather
+
+        feather.write_feather(df.reset_index(drop=True), path, compression=self.compression)
+
+    def read(self, path: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        import pyarrow.feather as feather
+
+        return feather.read_feather(path, columns=columns, memory_map=True)
+
+    def open_writer(self, path: str) -> ArtifactWriter:
+        return _ArrowIPCWriter(path, self.compression)
+
+    def iter_chunks(self, path: str, chunksize: int, columns: Optional[List[str]] = None) -> Iterator[pd.DataFrame]:
+        import pyarrow as pa
+
+        with pa.memory_map(path) as source:
+            reader = pa.ipc.open_file(source)
+            for i in range(reader.num_record_batches):
+                batch = reader.get_batch(i)
+                if columns is not None:
+                    batch = batch.select(columns)
+                # Record batches are as large as the chunks they were written from
+                for part in pa.Table.from_batches([batch]).to_batches(max_chunksize=chunksize):
+                    yield part.to_pandas()
+
+
+# ==========================
+# CSV (EXPORT ONLY)
+# ==========================
+class _CsvWriter(ArtifactWriter):
+    def _write(self, chunk: pd.DataFrame):
+        first = self.rows_written == 0
+        chunk.to_csv(self.path, mode="w" if first else "a", header=first, index=False)
+
+
+class CsvFormat(ArtifactFormat):
+    """
+    Plain-text export. Does not preserve dtypes; use for hand-off to
+    external tools, not between pipeline stages.
+    """
+
+    name = "csv"
+    extension = ".csv"
+
+    def write(self, df: pd.DataFrame, path: str):
+        df.to_csv(path, index=False)
+
+    def read(self, path: str, columns: Optional[List[str]] = None, **read_kwargs) -> pd.DataFrame:
+        read_kwargs.setdefault("usecols", columns)
+        return pd.read_csv(path, **read_kwargs)
+
+    def open_writer(self, path: str) -> ArtifactWriter:
+        return _CsvWriter(path)
+
+    def iter_chunks(
+        self, path: str, chunksize: int, columns: Optional[List[str]] = None, **read_kwargs
+    ) -> Iterator[pd.DataFrame]:
+        read_kwargs.setdefault("usecols", columns)
+        yield from pd.read_csv(path, chunksize=chunksize, **read_kwargs)
+
+
+ARTIFACT_FORMATS: Dict[str, ArtifactFormat] = {
+    fmt.name: fmt for fmt in (ParquetFormat(), ArrowIPCFormat(), CsvFormat())
+}
+
+DEFAULT_ARTIFACT_FORMAT = "parquet"
+
+
+def get_format(fmt: Optional[str] = None) -> ArtifactFormat:
+    fmt = fmt or DEFAULT_ARTIFACT_FORMAT
+    if fmt not in ARTIFACT_FORMATS:
+        raise ValueError(f"Unknown artifact format '{fmt}'. Available: {list(ARTIFACT_FORMATS)}")
+    return ARTIFACT_FORMATS[fmt]
+
+
+def format_for_path(path: str) -> ArtifactFormat:
+    extension = os.path.splitext(path)[1].lower()
+    for fmt in ARTIFACT_FORMATS.values():
+        if fmt.extension == extension:
+            return fmt
+    raise ValueError(f"No artifact format registered for '{extension}' ({path})")
+
+
+def artifact_path(directory: str, name: str, fmt: Optional[str] = None) -> str:
+    """
+    Builds the path of artifact `name` in `directory` for the given format,
+    e.g. artifact_path("artifacts", "raw_data") -> artifacts/raw_data.parquet
+    """
+    return os.path.join(directory, f"{name}{get_format(fmt).extension}")
+
+
+def write_artifact(df: pd.DataFrame, path: str) -> str:
+    """
+    Writes `df` in the format implied by the file extension.
+    The file is written to a temporary path and moved into place, so readers
+    never see a partially written artifact.
+    """
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    format_for_path(path).write(df, tmp_path)
+    os.replace(tmp_path, path)
+    return path
+
+
+def _csv_read_kwargs(schema, columns: Optional[List[str]]) -> Dict:
+    """
+    read_csv_kwargs(schema) narrowed to `columns` (all schema columns when None).
+    """
+    kwargs = read_csv_kwargs(schema)
+    if columns is None:
+        return kwargs
+    wanted = set(columns)
+    unknown = wanted - set(kwargs["usecols"])
+    if unknown:
+        raise KeyError(f"Columns not in schema {schema.name}: {sorted(unknown)}")
+    return {
+        "usecols": [col for col in kwargs["usecols"] if col in wanted],
+        "dtype": {col: dtype for col, dtype in kwargs["dtype"].items() if col in wanted},
+        "parse_dates": [col for col in kwargs["parse_dates"] if col in wanted],
+    }
+
+
+def read_artifact(path: str, columns: Optional[List[str]] = None, schema=None) -> pd.DataFrame:
+    """
+    Reads an artifact in the format implied by its extension.
+    With a config.py `schema`, CSV files are parsed with the declared dtypes
+    instead of inferring them, and columnar files are cast to the schema.
+    """
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"Artifact not found: {path}")
+
+    fmt = format_for_path(path)
+    if schema is None:
+        return fmt.read(path, columns=columns)
+
+    if isinstance(fmt, CsvFormat):
+        df = fmt.read(path, **_csv_read_kwargs(schema, columns))
+        if columns is not None:
+            # usecols keeps file order; match the columnar formats
+            df = df[list(columns)]
+    else:
+        df = fmt.read(path, columns=columns)
+    return apply_schema(df, schema)
+
+
+def open_artifact_writer(path: str) -> ArtifactWriter:
+    """
+    Opens a chunked writer for `path`, e.g.
+
+        with open_artifact_writer("artifacts/raw_data.parquet") as writer:
+            for chunk in chunks:
+                writer.write(chunk)
+    """
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    return format_for_path(path).open_writer(path)
+
+
+def iter_artifact(
+    path: str, chunksize: int = 100_000, columns: Optional[List[str]] = None, schema=None
+) -> Iterator[pd.DataFrame]:
+    """
+    Reads an artifact chunk by chunk (at most `chunksize` rows each), so
+    files larger than memory can be streamed. With a config.py `schema`,
+    every chunk is cast to the declared dtypes.
+    """
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"Artifact not found: {path}")
+
+    fmt = format_for_path(path)
+    if isinstance(fmt, CsvFormat) and schema is not None:
+        chunks = fmt.iter_chunks(path, chunksize, **_csv_read_kwargs(schema, columns))
+    else:
+        chunks = fmt.iter_chunks(path, chunksize, columns=columns)
+
+    for chunk in chunks:
+        if columns is not None:
+            chunk = chunk[list(columns)]
+        yield chunk if schema is None else apply_schema(chunk, schema)
@@ -1,5 +1,11 @@
 import os
 from pathlib import Path
+from typing import Dict
+
+import pandas as pd
+
+from src.DMARTProject.loggers.logger import logger
+
 
 def create_directories(path: str, verbose: bool = True):
     """
@@ -8,7 +14,45 @@ def create_directories(path: str, verbose: bool = True):
     try:
         os.makedirs(path, exist_ok=True)
         if verbose:
-            print(f"Directory created or already exists at: {path}")
+            logger.info(f"Directory created or already exists at: {path}")
     except Exception as e:
         raise e
-    
+
+
+def as_dataframe(data) -> pd.DataFrame:
+    """
+    Accepts a pandas DataFrame or a pyarrow Table and returns a DataFrame.
+    DataFrames are returned as-is (no copy).
+    """
+    if isinstance(data, pd.DataFrame):
+        return data
+    if hasattr(data, "to_pandas"):
+        return data.to_pandas()
+    raise TypeError(f"Expected a DataFrame or Arrow table, got {type(data).__name__}")
+
+
+def memory_report(df: pd.DataFrame, stage: str) -> Dict:
+    """
+    Logs and returns the in-memory size of `df` after `stage`.
+    """
+    usage = df.memory_usage(deep=True)
+    report = {
+        "stage": stage,
+        "rows": len(df),
+        "total_mb": round(usage.sum() / 1024 ** 2, 3),
+        "largest_columns_mb": {
+            col: round(size / 1024 ** 2, 3)
+            for col, size in usage.drop("Index").nlargest(3).items()
+        },
+    }
+    logger.info(f"Memory after {stage}: {report}")
+    return report
+
+
+def enable_copy_on_write():
+    """
+    Turns on pandas copy-on-write (always on from pandas 3.0), so shallow
+    copies and filtered frames share data until one of them is modified.
+    """
+    if int(pd.__version__.split(".")[0]) < 3:
+        pd.set_option("mode.copy_on_write", True)
@@ -0,0 +1,100 @@
+import atexit
+import os
+import threading
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Dict, Optional
+
+# SQLAlchemy and python-dotenv are imported on first use, so importing the
+# package stays cheap for steps that never touch the database
+if TYPE_CHECKING:
+    from sqlalchemy.engine import Engine
+
+
+@dataclass
+class EngineConfig:
+    pool_size: int = 5
+    max_overflow: int = 10
+    # Test connections on checkout so stale ones are replaced transparently
+    pool_pre_ping: bool = True
+    pool_recycle: int = 1800
+    fast_executemany: bool = True
+
+
+_engines: Dict[str, "Engine"] = {}
+_engines_lock = threading.Lock()
+
+
+def build_database_url() -> str:
+    """
+    Database URL from the environment (.env): DATABASE_URL if set, otherwise
+    an MSSQL trusted-connection URL built from DB_SERVER, DB_DATABASE, DB_DRIVER.
+    """
+    from dotenv import load_dotenv
+
+    load_dotenv()
+
+    database_url = os.getenv("DATABASE_URL")
+    if database_url:
+        return database_url
+
+    db_server = os.getenv("DB_SERVER")
+    db_database = os.getenv("DB_DATABASE")
+    db_driver = os.getenv("DB_DRIVER")
+
+    if not all([db_server, db_database, db_driver]):
+        raise ValueError(
+            "Missing DB environment variables. "
+            "Set DATABASE_URL, or DB_SERVER, DB_DATABASE, DB_DRIVER in .env"
+        )
+
+    return (
+        f"mssql+pyodbc://@{db_server}/{db_database}"
+        f"?driver={db_driver.replace(' ', '+')}"
+        f"&trusted_connection=yes"
+    )
+
+
+def get_engine(database_url: Optional[str] = None, config: EngineConfig = EngineConfig()) -> "Engine":
+    """
+    Returns the shared, pooled engine for `database_url` (default: from the
+    environment), creating it on first use. Engines are thread-safe and are
+    reused by every component in the process.
+    """
+    from sqlalchemy import create_engine
+    from sqlalchemy.engine import make_url
+
+    database_url = database_url or build_database_url()
+
+    with _engines_lock:
+        engine = _engines.get(database_url)
+        if engine is None:
+            url = make_url(database_url)
+            kwargs = {
+                "pool_pre_ping": config.pool_pre_ping,
+                "pool_recycle": config.pool_recycle,
+            }
+            if url.get_backend_name() != "sqlite":
+                kwargs["pool_size"] = config.pool_size
+                kwargs["max_overflow"] = config.max_overflow
+            if url.get_backend_name() == "mssql" and url.get_driver_name() == "pyodbc":
+                # Send parameter batches as arrays instead of one round trip per row
+                kwargs["fast_executemany"] = config.fast_executemany
+
+            engine = create_engine(url, **kwargs)
+            _engines[database_url] = engine
+
+        return engine
+
+
+def dispose_engines():
+    """
+    Closes all pooled connections, e.g. after forking; registered to run
+    at exit.
+    """
+    with _engines_lock:
+        for engine in _engines.values():
+            engine.dispose()
+        _engines.clear()
+
+
+atexit.register(dispose_engines)
@@ -0,0 +1,327 @@
+import hashlib
+import inspect
+import json
+import os
+import pickle
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from src.DMARTProject.loggers.logger import logger
+from src.DMARTProject.utils.artifacts import read_artifact, write_artifact
+from src.DMARTProject.utils.instrumentation import Instrumentation
+
+
+@dataclass
+class DAGConfig:
+    # Stage state (state.json) and stage outputs are kept here
+    state_dir: str = "artifacts/dag"
+    # Ready stages run concurrently on a thread pool; 1 runs them one by one
+    max_workers: Optional[int] = None
+    # Stages to rerun even when their inputs are unchanged
+    force: Tuple[str, ...] = ()
+    # After a failed run, also reuse the volatile stages that completed in it,
+    # so the rerun continues from the failed stage
+    resume: bool = True
+
+
+@dataclass
+class Stage:
+    """
+    One pipeline step. `func` is called with the outputs of the `inputs`
+    stages as keyword arguments (by stage name) and returns the stage output.
+    """
+
+    name: str
+    func: Callable[..., Any]
+    inputs: Tuple[str, ...] = ()
+    # Settings that change the output; part of the stage key
+    params: Dict[str, Any] = field(default_factory=dict)
+    # Always rerun (sources reading external data); downstream stages still
+    # skip when its output hash is unchanged
+    volatile: bool = False
+
+
+def content_hash(value: Any) -> str:
+    """
+    Hash of a stage output: row hashes, columns and dtypes for DataFrames,
+    the pickled bytes for anything else.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    if isinstance(value, pd.DataFrame):
+        digest.update(repr([(str(col), str(dtype)) for col, dtype in value.dtypes.items()]).encode())
+        digest.update(pd.util.hash_pandas_object(value, index=False).to_numpy().tobytes())
+    else:
+        digest.update(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+    return digest.hexdigest()
+
+
+def _code_hash(func: Callable) -> str:
+    # Editing a stage's code invalidates its cached output
+    try:
+        source = inspect.getsource(func)
+    except (OSError, TypeError):
+        source = getattr(func, "__qualname__", repr(func))
+    return hashlib.blake2b(source.encode(), digest_size=16).hexdigest()
+
+
+class DAGRunner:
+    """
+    Runs stages in dependency order with content-hashed caching:
+
+    - a stage's key hashes its code, params and the output hashes of its
+      inputs; when the key matches the last successful run, the stage is
+      skipped and its stored output is reused (loaded only if a downstream
+      stage actually runs);
+    - stages whose inputs are all available run concurrently;
+    - state is saved after every stage, so a rerun after a failure picks
+      up at the failed stage.
+
+    Stage metrics are recorded per executed stage. With more than one
+    worker, stages overlap and record wall time only; CPU, peak RSS and IO
+    are recorded for the whole run as the "dag" stage.
+    """
+
+    def __init__(
+        self,
+        stages: Sequence[Stage],
+        config: DAGConfig = DAGConfig(),
+        instrumentation: Optional[Instrumentation] = None,
+    ):
+        self.stages: Dict[str, Stage] = {}
+        for stage in stages:
+            if stage.name in self.stages:
+                raise ValueError(f"Duplicate stage name: {stage.name}")
+            self.stages[stage.name] = stage
+        for stage in stages:
+            missing = set(stage.inputs) - set(self.stages)
+            if missing:
+                raise ValueError(f"Stage {stage.name} depends on unknown stages: {sorted(missing)}")
+
+        self.config = config
+        self.instrumentation = instrumentation or Instrumentation()
+        self.state_path = os.path.join(config.state_dir, "state.json")
+        self.state = self._load_state()
+        self._outputs: Dict[str, Any] = {}
+        self._resumable_runs: set = set()
+        self._lock = threading.Lock()
+
+    # ==========================
+    # STATE
+    # ==========================
+    def _load_state(self) -> Dict:
+        if not os.path.exists(self.state_path):
+            return {"run": {}, "stages": {}}
+        with open(self.state_path) as fp:
+            return json.load(fp)
+
+    def _save_state(self):
+        # Called under self._lock
+        os.makedirs(self.config.state_dir, exist_ok=True)
+        tmp_path = f"{self.state_path}.tmp"
+        with open(tmp_path, "w") as fp:
+            json.dump(self.state, fp, indent=2, default=str)
+        os.replace(tmp_path, self.state_path)
+
+    def _output_path(self, name: str, value: Any) -> str:
+        # Plain DataFrames as Parquet; anything else (or indexed frames) pickled
+        if isinstance(value, pd.DataFrame) and isinstance(value.index, pd.RangeIndex):
+            return os.path.join(self.config.state_dir, "outputs", f"{name}.parquet")
+        return os.path.join(self.config.state_dir, "outputs", f"{name}.pkl")
+
+    def _store_output(self, name: str, value: Any) -> str:
+        path = self._output_path(name, value)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        if path.endswith(".parquet"):
+            write_artifact(value, path)
+        else:
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, "wb") as fp:
+                pickle.dump(value, fp, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        return path
+
+    def output(self, name: str) -> Any:
+        """
+        Output of stage `name` from this run, or loaded from its last
+        successful run.
+        """
+        with self._lock:
+            if name not in self._outputs:
+                path = self.state["stages"][name]["output_path"]
+                if path.endswith(".parquet"):
+                    self._outputs[name] = read_artifact(path)
+                else:
+                    with open(path, "rb") as fp:
+                        self._outputs[name] = pickle.load(fp)
+            return self._outputs[name]
+
+    # ==========================
+    # PLANNING
+    # ==========================
+    def _required(self, targets: Optional[Sequence[str]]) -> List[str]:
+        """
+        Stages needed for `targets` (all stages when None), in a
+        deterministic topological order.
+        """
+        wanted = set()
+        stack = list(targets or self.stages)
+        while stack:
+            name = stack.pop()
+            if name not in self.stages:
+                raise KeyError(f"Unknown stage: {name}")
+            if name not in wanted:
+                wanted.add(name)
+                stack.extend(self.stages[name].inputs)
+
+        order, visiting, visited = [], set(), set()
+
+        def visit(name: str):
+            if name in visited:
+                return
+            if name in visiting:
+                raise ValueError(f"Cycle in pipeline at stage {name}")
+            visiting.add(name)
+            for dep in self.stages[name].inputs:
+                visit(dep)
+            visiting.discard(name)
+            visited.add(name)
+            order.append(name)
+
+        for name in self.stages:
+            if name in wanted:
+                visit(name)
+        return order
+
+    def _key(self, stage: Stage, output_hashes: Dict[str, str]) -> str:
+        parts = {
+            "code": _code_hash(stage.func),
+            "params": repr(sorted(stage.params.items())),
+            "inputs": [(name, output_hashes[name]) for name in stage.inputs],
+        }
+        return hashlib.sha256(json.dumps(parts, sort_keys=True).encode()).hexdigest()
+
+    def _reusable(self, stage: Stage, key: str) -> bool:
+        entry = self.state["stages"].get(stage.name)
+        if stage.name in self.config.force or not entry or entry.get("status") != "done":
+            return False
+        if entry.get("key") != key or not os.path.exists(entry.get("output_path", "")):
+            return False
+        if stage.volatile:
+            # Sources are re-read, except when resuming the run that failed
+            return entry.get("run_id") in self._resumable_runs
+        return True
+
+    # ==========================
+    # EXECUTION
+    # ==========================
+    def _execute(self, stage: Stage, key: str, run_id: str) -> str:
+        inputs = {name: self.output(name) for name in stage.inputs}
+        first = next(iter(inputs.values()), None)
+        rows_in = len(first) if isinstance(first, pd.DataFrame) else None
+
+        with self.instrumentation.stage(stage.name, rows_in=rows_in) as metrics:
+            value = stage.func(**inputs, **stage.params)
+            if isinstance(value, pd.DataFrame):
+                metrics.rows_out = len(value)
+            output_hash = content_hash(value)
+            path = self._store_output(stage.name, value)
+
+        with self._lock:
+            self._outputs[stage.name] = value
+            self.state["stages"][stage.name] = {
+                "status": "done",
+                "key": key,
+                "output_hash": output_hash,
+                "output_path": path,
+                "run_id": run_id,
+                "finished_at": datetime.now().isoformat(),
+            }
+            self._save_state()
+        return output_hash
+
+    def _record_failure(self, name: str, run_id: str, error: BaseException):
+        with self._lock:
+            entry = self.state["stages"].setdefault(name, {})
+            entry.update(status="failed", run_id=run_id, error=repr(error), finished_at=datetime.now().isoformat())
+            self._save_state()
+
+    def run(self, targets: Optional[Sequence[str]] = None) -> Dict[str, str]:
+        """
+        Runs (or skips) every stage needed for `targets` and returns
+        {stage: "ran" | "skipped"}. The first stage failure stops new
+        stages from starting; stages already running finish and are saved,
+        then the failure is raised.
+        """
+        order = self._required(targets)
+        run_id = self.instrumentation.run_id
+        workers = self.config.max_workers or min(len(order), os.cpu_count() or 1, 8) or 1
+
+        statuses: Dict[str, str] = {}
+        output_hashes: Dict[str, str] = {}
+        pending = list(order)
+        running: Dict[Future, str] = {}
+        failure: Optional[BaseException] = None
+
+        with self._lock:
+            previous = self.state.get("run", {})
+            run = {"run_id": run_id, "status": "running", "started_at": datetime.now().isoformat()}
+            if self.config.resume and previous.get("status") == "failed":
+                # Resuming: the failed run (and the run it resumed, if any)
+                # counts as the same run for volatile stages
+                run["resumed_from"] = previous.get("resumed_from") or previous["run_id"]
+                self._resumable_runs = {previous["run_id"], run["resumed_from"]}
+                logger.info(f"Resuming failed run {previous['run_id']}")
+            self.state["run"] = run
+            self._save_state()
+
+        # Process-wide metrics cannot be split between overlapping stages
+        block = self.instrumentation.concurrent("dag") if workers > 1 else nullcontext()
+        with block, ThreadPoolExecutor(max_workers=workers) as pool:
+            while pending or running:
+                # Schedule every stage whose inputs are available; skipped
+                # stages make their dependents available immediately
+                progressed = failure is None
+                while progressed:
+                    progressed = False
+                    for name in list(pending):
+                        stage = self.stages[name]
+                        if not all(dep in output_hashes for dep in stage.inputs):
+                            continue
+                        pending.remove(name)
+                        key = self._key(stage, output_hashes)
+                        if self._reusable(stage, key):
+                            output_hashes[name] = self.state["stages"][name]["output_hash"]
+                            statuses[name] = "skipped"
+                            logger.info(f"Stage {name} unchanged, skipped")
+                            progressed = True
+                        else:
+                            logger.info(f"Stage {name} started")
+                            running[pool.submit(self._execute, stage, key, run_id)] = name
+
+                if not running:
+                    break
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    try:
+                        output_hashes[name] = future.result()
+                        statuses[name] = "ran"
+                        logger.info(f"Stage {name} completed")
+                    except Exception as e:
+                        logger.exception(f"Stage {name} failed")
+                        self._record_failure(name, run_id, e)
+                        failure = failure or e
+
+        with self._lock:
+            self.state["run"].update(status="failed" if failure else "succeeded", finished_at=datetime.now().isoformat())
+            self._save_state()
+
+        if failure is not None:
+            raise failure
+        return statuses
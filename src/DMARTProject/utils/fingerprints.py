@@ -0,0 +1,201 @@
+import os
+from typing import Optional
+
+import numpy as np
+
+
+def _contains_sorted(sorted_hashes: np.ndarray, hashes: np.ndarray) -> np.ndarray:
+    if not len(sorted_hashes):
+        return np.zeros(len(hashes), dtype=bool)
+    pos = np.searchsorted(sorted_hashes, hashes)
+    pos[pos == len(sorted_hashes)] = 0
+    return sorted_hashes[pos] == hashes
+
+
+class FingerprintStore:
+    """
+    Persistent set of 64-bit row fingerprints (uint64).
+    Additions are buffered until commit(), so a failed run does not mark
+    rows as seen that never reached the target.
+    """
+
+    def contains(self, hashes: np.ndarray) -> np.ndarray:
+        raise NotImplementedError
+
+    def add(self, hashes: np.ndarray):
+        raise NotImplementedError
+
+    def commit(self):
+        raise NotImplementedError
+
+    def clear(self):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+    def __len__(self) -> int:
+        raise NotImplementedError
+
+
+class ArrayFingerprintStore(FingerprintStore):
+    """
+    Sorted uint64 array saved as .npy (8 bytes per fingerprint) and
+    memory-mapped on load. New fingerprints go to a small sorted buffer, so
+    lookups stay binary searches and adding a chunk does not touch the
+    file; commit() merges the buffer in and rewrites the whole file once.
+
+    The file cannot be replaced or removed while it is mapped (Windows), so
+    commit(), clear() and close() release the mapping first.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._hashes = np.load(path, mmap_mode="r") if os.path.exists(path) else np.empty(0, dtype=np.uint64)
+        self._pending = np.empty(0, dtype=np.uint64)
+
+    def contains(self, hashes: np.ndarray) -> np.ndarray:
+        return _contains_sorted(self._hashes, hashes) | _contains_sorted(self._pending, hashes)
+
+    def add(self, hashes: np.ndarray):
+        self._pending = np.union1d(self._pending, hashes.astype(np.uint64, copy=False))
+
+    def commit(self):
+        if not len(self._pending):
+            return
+        merged = np.union1d(self._hashes, self._pending)
+        self._release()
+
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = f"{self.path}.tmp.npy"
+        np.save(tmp_path, merged)
+        os.replace(tmp_path, self.path)
+
+        self._hashes = np.load(self.path, mmap_mode="r")
+        self._pending = np.empty(0, dtype=np.uint64)
+
+    def _release(self):
+        # Dropping the last reference unmaps the file
+        self._hashes = np.empty(0, dtype=np.uint64)
+
+    def clear(self):
+        self._release()
+        self._pending = np.empty(0, dtype=np.uint64)
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def close(self):
+        # Uncommitted fingerprints are dropped
+        self._release()
+        self._pending = np.empty(0, dtype=np.uint64)
+
+    def __len__(self) -> int:
+        return len(self._hashes) + len(self._pending)
+
+
+class SqliteFingerprintStore(FingerprintStore):
+    """
+    Disk-backed store for histories too large to keep in memory: a SQLite
+    table keyed on the fingerprint. Lookups join a batch of probes against
+    the primary key index; additions stay in an open transaction until commit().
+    """
+
+    def __init__(self, path: str, batch_size: int = 100_000):
+        self.path = path
+        self.batch_size = batch_size
+        import sqlite3
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS fingerprints (hash INTEGER PRIMARY KEY) WITHOUT ROWID")
+        self._conn.execute("CREATE TEMP TABLE IF NOT EXISTS probe (pos INTEGER, hash INTEGER)")
+        self._conn.commit()
+
+    @staticmethod
+    def _signed(hashes: np.ndarray) -> np.ndarray:
+        # SQLite integers are signed 64-bit
+        return hashes.astype(np.uint64, copy=False).view(np.int64)
+
+    def contains(self, hashes: np.ndarray) -> np.ndarray:
+        found = np.zeros(len(hashes), dtype=bool)
+        signed = self._signed(hashes)
+        for start in range(0, len(signed), self.batch_size):
+            batch = signed[start:start + self.batch_size]
+            self._conn.execute("DELETE FROM probe")
+            self._conn.executemany(
+                "INSERT INTO probe (pos, hash) VALUES (?, ?)",
+                zip(range(start, start + len(batch)), batch.tolist()),
+            )
+            rows = self._conn.execute(
+                "SELECT probe.pos FROM probe JOIN fingerprints ON fingerprints.hash = probe.hash"
+            ).fetchall()
+            if rows:
+                found[np.fromiter((pos for pos, in rows), dtype=np.int64, count=len(rows))] = True
+        return found
+
+    def add(self, hashes: np.ndarray):
+        self._conn.executemany(
+            "INSERT OR IGNORE INTO fingerprints (hash) VALUES (?)",
+            ((h,) for h in self._signed(hashes).tolist()),
+        )
+
+    def commit(self):
+        self._conn.commit()
+
+    def clear(self):
+        self._conn.execute("DELETE FROM fingerprints")
+        self._conn.commit()
+
+    def close(self):
+        self._conn.close()
+
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM fingerprints").fetchone()[0]
+
+
+def staging_path(path: str) -> str:
+    """
+    Path of the store built next to `path` during a full reload, e.g.
+    fingerprints.npy -> fingerprints.staging.npy
+    """
+    root, extension = os.path.splitext(path)
+    return f"{root}.staging{extension}"
+
+
+def remove_store(path: str):
+    # SQLite stores may leave -wal/-shm files next to the database
+    for file in (path, f"{path}-wal", f"{path}-shm"):
+        if os.path.exists(file):
+            os.remove(file)
+
+
+def promote_store(staging: str, path: str):
+    """
+    Moves a closed staging store into place as the store at `path`; stores
+    open on `path` must be closed first. A staging store that was never written (no rows) empties the history.
+    """
+    remove_store(f"{path}-wal")
+    remove_store(f"{path}-shm")
+    if os.path.exists(staging):
+        os.replace(staging, path)
+    else:
+        remove_store(path)
+
+
+FINGERPRINT_BACKENDS = {
+    "array": ArrayFingerprintStore,
+    "sqlite": SqliteFingerprintStore,
+}
+
+
+def open_fingerprint_store(path: str, backend: Optional[str] = None) -> FingerprintStore:
+    """
+    Opens the store at `path`; the backend defaults to the file extension
+    (.npy -> array, .sqlite/.db -> sqlite).
+    """
+    if backend is None:
+        backend = "sqlite" if path.endswith((".sqlite", ".db")) else "array"
+    if backend not in FINGERPRINT_BACKENDS:
+        raise ValueError(f"Unknown fingerprint backend '{backend}'. Available: {list(FINGERPRINT_BACKENDS)}")
+    return FINGERPRINT_BACKENDS[backend](path)
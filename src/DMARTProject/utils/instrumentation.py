@@ -0,0 +1,224 @@
+import cProfile
+import json
+import os
+import sys
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional
+
+from src.DMARTProject.loggers.logger import log_context, logger
+
+
+@dataclass
+class InstrumentationConfig:
+    # One JSON record per stage and run is appended here
+    metrics_path: str = "artifacts/metrics/stage_metrics.jsonl"
+    # Prometheus node_exporter textfile, rewritten after every stage
+    prometheus_path: Optional[str] = None
+    # cProfile dump per stage (<run_id>_<stage>.prof)
+    profile_dir: Optional[str] = None
+
+
+@dataclass
+class StageMetrics:
+    stage: str
+    run_id: str
+    started_at: str
+    rows_in: Optional[int] = None
+    rows_out: Optional[int] = None
+    wall_seconds: float = 0.0
+    # The figures below are process-wide, so they are None for stages that
+    # ran alongside others; see Instrumentation.concurrent()
+    # User + system time of this process and of finished worker processes
+    cpu_seconds: Optional[float] = 0.0
+    peak_rss_mb: Optional[float] = 0.0
+    # Read/written through syscalls (files and database sockets)
+    bytes_read: Optional[int] = 0
+    bytes_written: Optional[int] = 0
+
+
+def _cpu_seconds() -> float:
+    t = os.times()
+    return t.user + t.system + t.children_user + t.children_system
+
+
+def _io_counters() -> Dict[str, int]:
+    # Linux only; zeros elsewhere
+    try:
+        with open("/proc/self/io") as fp:
+            counters = dict(line.split(": ") for line in fp.read().splitlines())
+        return {"read": int(counters["rchar"]), "written": int(counters["wchar"])}
+    except (OSError, KeyError, ValueError):
+        return {"read": 0, "written": 0}
+
+
+def _reset_peak_rss() -> bool:
+    # Writing 5 to clear_refs resets VmHWM (Linux >= 4.0), giving a per-stage peak
+    try:
+        with open("/proc/self/clear_refs", "w") as fp:
+            fp.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def _peak_rss_mb(reset_ok: bool) -> float:
+    if reset_ok:
+        try:
+            with open("/proc/self/status") as fp:
+                for line in fp:
+                    if line.startswith("VmHWM:"):
+                        return int(line.split()[1]) / 1024
+        except OSError:
+            pass
+    return max_rss_mb()
+
+
+def max_rss_mb(children: bool = False) -> float:
+    """
+    Peak RSS since process start in MB, of this process or (children=True)
+    of its largest finished child process; NaN where the platform has no
+    such counter.
+    """
+    try:
+        import resource
+    except ImportError:
+        # Windows: peak working set of this process, nothing for finished children
+        if children:
+            return float("nan")
+        try:
+            import psutil
+
+            return psutil.Process().memory_info().peak_wset / 1024**2
+        except (ImportError, AttributeError):
+            return float("nan")
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF)
+    # Bytes on macOS, KB on Linux
+    return usage.ru_maxrss / (1024**2 if sys.platform == "darwin" else 1024)
+
+
+class Instrumentation:
+    """
+    Records wall time, CPU time, peak RSS, rows in/out and bytes read/written
+    per pipeline stage, e.g.
+
+        with instrumentation.stage("cleaning", rows_in=len(df)) as metrics:
+            df = DataCleaning(df).clean_data()
+            metrics.rows_out = len(df)
+    """
+
+    def __init__(self, config: InstrumentationConfig = InstrumentationConfig(), run_id: Optional[str] = None):
+        self.config = config
+        self.run_id = run_id or f"{datetime.now():%Y%m%d_%H%M%S}_{uuid.uuid4().hex[:8]}"
+        self.records: List[StageMetrics] = []
+        # Stages may run concurrently (utils/dag.py)
+        self._lock = threading.Lock()
+        # Open concurrent() blocks
+        self._concurrent = 0
+
+    @contextmanager
+    def concurrent(self, name: str, rows_in: Optional[int] = None) -> Iterator[StageMetrics]:
+        """
+        A stage around stages that run at the same time, e.g.
+
+            with instrumentation.concurrent("branches"):
+                ...  # threads entering instrumentation.stage()
+
+        CPU time, peak RSS and IO are process-wide counters that the
+        overlapping stages cannot split between them, and resetting the
+        peak for one stage would clobber the others'. So they are recorded
+        for this block as a whole; the inner stages record wall time only.
+        """
+        with self.stage(name, rows_in=rows_in) as metrics:
+            with self._lock:
+                self._concurrent += 1
+            try:
+                yield metrics
+            finally:
+                with self._lock:
+                    self._concurrent -= 1
+
+    @contextmanager
+    def stage(self, name: str, rows_in: Optional[int] = None) -> Iterator[StageMetrics]:
+        metrics = StageMetrics(stage=name, run_id=self.run_id, started_at=datetime.now().isoformat(), rows_in=rows_in)
+        profiler = cProfile.Profile() if self.config.profile_dir else None
+        shared = self._concurrent > 0
+
+        reset_ok = not shared and _reset_peak_rss()
+        io_before = _io_counters()
+        cpu_before = _cpu_seconds()
+        wall_before = time.perf_counter()
+        if profiler:
+            profiler.enable()
+        try:
+            # Every record logged inside the stage carries its name and run ID
+            with log_context(stage=name, run_id=self.run_id):
+                yield metrics
+        finally:
+            if profiler:
+                profiler.disable()
+            metrics.wall_seconds = round(time.perf_counter() - wall_before, 4)
+            if shared:
+                metrics.cpu_seconds = metrics.peak_rss_mb = metrics.bytes_read = metrics.bytes_written = None
+            else:
+                metrics.cpu_seconds = round(_cpu_seconds() - cpu_before, 4)
+                metrics.peak_rss_mb = round(_peak_rss_mb(reset_ok), 1)
+                io_after = _io_counters()
+                metrics.bytes_read = io_after["read"] - io_before["read"]
+                metrics.bytes_written = io_after["written"] - io_before["written"]
+            self._emit(metrics, profiler)
+
+    def _emit(self, metrics: StageMetrics, profiler: Optional[cProfile.Profile]):
+        with self._lock:
+            self._emit_locked(metrics, profiler)
+
+    def _emit_locked(self, metrics: StageMetrics, profiler: Optional[cProfile.Profile]):
+        self.records.append(metrics)
+        record = json.dumps(asdict(metrics), default=str)
+        logger.info(
+            f"Stage {metrics.stage} finished in {metrics.wall_seconds}s",
+            extra={key: value for key, value in asdict(metrics).items() if key != "started_at"},
+        )
+
+        os.makedirs(os.path.dirname(self.config.metrics_path) or ".", exist_ok=True)
+        with open(self.config.metrics_path, "a") as fp:
+            fp.write(record + "\n")
+
+        if profiler:
+            os.makedirs(self.config.profile_dir, exist_ok=True)
+            profiler.dump_stats(os.path.join(self.config.profile_dir, f"{self.run_id}_{metrics.stage}.prof"))
+
+        if self.config.prometheus_path:
+            self.write_prometheus(self.config.prometheus_path)
+
+    def write_prometheus(self, path: str):
+        """
+        Writes the latest run's stage metrics in the Prometheus text format.
+        """
+        gauges = {
+            "wall_seconds": "Stage wall-clock time",
+            "cpu_seconds": "Stage CPU time",
+            "peak_rss_mb": "Stage peak resident set size (MB)",
+            "rows_in": "Rows received by the stage",
+            "rows_out": "Rows produced by the stage",
+            "bytes_read": "Bytes read by the stage",
+            "bytes_written": "Bytes written by the stage",
+        }
+        lines = []
+        for name, help_text in gauges.items():
+            metric = f"dmart_stage_{name}"
+            lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} gauge"]
+            for record in self.records:
+                value = getattr(record, name)
+                if value is not None:
+                    lines.append(f'{metric}{{stage="{record.stage}"}} {value}')
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as fp:
+            fp.write("\n".join(lines) + "\n")
+        os.replace(tmp_path, path)
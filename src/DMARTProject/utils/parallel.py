@@ -0,0 +1,90 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, List, Optional
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+from src.DMARTProject.loggers.logger import worker_logging
+
+
+@dataclass
+class ParallelConfig:
+    # None: one worker per CPU core
+    workers: Optional[int] = None
+    # "rows" splits into contiguous row ranges, "month" by OrderDate month
+    partition_by: str = "rows"
+    date_column: str = "OrderDate"
+    # Frames smaller than two partitions of this size run in-process
+    min_partition_rows: int = 50_000
+
+    def worker_count(self) -> int:
+        return self.workers or os.cpu_count() or 1
+
+
+def partition_frame(df: pd.DataFrame, config: ParallelConfig) -> List[pd.DataFrame]:
+    """
+    Splits `df` into at most config.worker_count() partitions of at least
+    config.min_partition_rows rows. Partitions keep the original index.
+    """
+    n = min(config.worker_count(), max(1, len(df) // config.min_partition_rows))
+    if n <= 1:
+        return [df]
+
+    if config.partition_by == "rows":
+        bounds = np.linspace(0, len(df), n + 1, dtype=int)
+        return [df.iloc[start:stop] for start, stop in zip(bounds[:-1], bounds[1:])]
+
+    if config.partition_by == "month":
+        months = pd.to_datetime(df[config.date_column], errors="coerce").dt.to_period("M")
+        # Whole months go to the least-loaded partition, largest first
+        sizes = months.value_counts(dropna=False)
+        loads = np.zeros(n, dtype=np.int64)
+        bucket_of = {}
+        for month, size in sizes.items():
+            bucket = int(loads.argmin())
+            bucket_of[month] = bucket
+            loads[bucket] += size
+        # Unparseable dates (NaT) go to the first partition
+        buckets = months.map(bucket_of).fillna(0).astype(int).to_numpy()
+        return [df[buckets == i] for i in range(n) if (buckets == i).any()]
+
+    raise ValueError(f"Unknown partition_by '{config.partition_by}'. Use 'rows' or 'month'")
+
+
+def concat_partitions(parts: List[pd.DataFrame]) -> pd.DataFrame:
+    """
+    Concatenates partition results. Category columns whose partitions built
+    different categories are recoded to their union first, so they stay
+    categorical instead of falling back to object.
+    """
+    if len(parts) == 1:
+        return parts[0]
+
+    parts = list(parts)
+    for col in parts[0].columns:
+        dtypes = [part[col].dtype for part in parts]
+        if not all(isinstance(dtype, pd.CategoricalDtype) for dtype in dtypes):
+            continue
+        if all(dtype == dtypes[0] for dtype in dtypes[1:]):
+            continue
+        categories = union_categoricals([part[col] for part in parts]).categories
+        parts = [part.assign(**{col: part[col].cat.set_categories(categories)}) for part in parts]
+
+    return pd.concat(parts)
+
+
+def run_partitioned(func: Callable, partitions: List[pd.DataFrame], config: ParallelConfig, *args) -> list:
+    """
+    Calls func(partition, *args) for every partition on a process pool and
+    returns the results in partition order. `func` must be a module-level
+    function so it can be pickled. A single partition runs in-process.
+    """
+    if len(partitions) == 1:
+        return [func(partitions[0], *args)]
+
+    with ProcessPoolExecutor(max_workers=min(config.worker_count(), len(partitions)), **worker_logging()) as pool:
+        futures = [pool.submit(func, part, *args) for part in partitions]
+        return [future.result() for future in futures]
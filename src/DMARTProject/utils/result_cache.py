@@ -0,0 +1,90 @@
+import hashlib
+import os
+import pickle
+from dataclasses import dataclass
+from typing import Any, Tuple
+
+from src.DMARTProject.loggers.logger import logger
+
+
+@dataclass
+class ResultCacheConfig:
+    cache_dir: str = "artifacts/cache/analysis"
+    # Least recently used entries are evicted beyond either limit
+    max_bytes: int = 256 * 1024 ** 2
+    max_entries: int = 512
+
+
+_MISSING = object()
+
+
+class ResultCache:
+    """
+    On-disk cache of pickled results, one file per key.
+    A hit refreshes the file's mtime, so eviction by oldest mtime is LRU.
+    """
+
+    def __init__(self, config: ResultCacheConfig = ResultCacheConfig()):
+        self.config = config
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(*parts) -> str:
+        return hashlib.sha256(repr(parts).encode()).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.config.cache_dir, f"{key}.pkl")
+
+    def get(self, key: str, default: Any = None) -> Any:
+        path = self._path(key)
+        try:
+            with open(path, "rb") as fp:
+                value = pickle.load(fp)
+        except FileNotFoundError:
+            self.misses += 1
+            return default
+        except (pickle.UnpicklingError, EOFError, AttributeError) as e:
+            logger.warning(f"Dropping unreadable cache entry {path}: {e}")
+            os.remove(path)
+            self.misses += 1
+            return default
+
+        os.utime(path)
+        self.hits += 1
+        return value
+
+    def lookup(self, key: str) -> Tuple[bool, Any]:
+        value = self.get(key, _MISSING)
+        return value is not _MISSING, value
+
+    def put(self, key: str, value: Any):
+        os.makedirs(self.config.cache_dir, exist_ok=True)
+        path = self._path(key)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as fp:
+            pickle.dump(value, fp, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+        self.evict()
+
+    def evict(self):
+        entries = []
+        with os.scandir(self.config.cache_dir) as it:
+            for entry in it:
+                if entry.name.endswith(".pkl"):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+        entries.sort()
+        total = sum(size for _, size, _ in entries)
+        while entries and (total > self.config.max_bytes or len(entries) > self.config.max_entries):
+            _, size, path = entries.pop(0)
+            os.remove(path)
+            total -= size
+
+    def clear(self):
+        if not os.path.isdir(self.config.cache_dir):
+            return
+        for name in os.listdir(self.config.cache_dir):
+            if name.endswith(".pkl"):
+                os.remove(os.path.join(self.config.cache_dir, name))
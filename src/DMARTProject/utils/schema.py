@@ -0,0 +1,110 @@
+from functools import lru_cache
+from typing import Dict
+
+import pandas as pd
+
+from config import SCHEMA_REGISTRY, ColumnSpec, TableSchema
+from src.DMARTProject.loggers.logger import logger
+
+
+DEFAULT_SCHEMA = "sales"
+
+
+def get_schema(name: str = DEFAULT_SCHEMA) -> TableSchema:
+    if name not in SCHEMA_REGISTRY:
+        raise KeyError(f"Unknown schema '{name}'. Registered: {list(SCHEMA_REGISTRY)}")
+    return SCHEMA_REGISTRY[name]
+
+
+def _pandas_dtype(spec: ColumnSpec):
+    if spec.dtype == "category":
+        return pd.CategoricalDtype(list(spec.domain)) if spec.domain else "category"
+    if spec.dtype == "datetime":
+        return "datetime64[ns]"
+    if spec.dtype == "string":
+        # Arrow-backed strings: compact buffers instead of Python objects
+        return "string[pyarrow]"
+    return spec.dtype
+
+
+@lru_cache(maxsize=None)
+def compile_dtypes(schema: TableSchema) -> Dict[str, object]:
+    """
+    Column -> pandas dtype map for `schema`, compiled once per schema.
+    """
+    return {spec.name: _pandas_dtype(spec) for spec in schema.columns}
+
+
+# Nullable counterparts used at parse time, so a stray null surfaces in
+# validation instead of failing the read; apply_schema narrows them afterwards
+_NULLABLE_DTYPES = {
+    "int32": "Int32",
+    "int64": "Int64",
+    "bool": "boolean",
+}
+
+
+def _read_dtype(spec: ColumnSpec, dtypes: Dict[str, object]):
+    # Category values are parsed with their own type and turned into
+    # categories by apply_schema, so CSV gives the same categories as SQL
+    if spec.dtype == "category" and spec.value_dtype:
+        return _NULLABLE_DTYPES.get(spec.value_dtype, spec.value_dtype)
+    return _NULLABLE_DTYPES.get(spec.dtype, dtypes[spec.name])
+
+
+def read_csv_kwargs(schema: TableSchema) -> Dict:
+    """
+    pd.read_csv arguments that parse every column with its declared dtype
+    instead of inferring it.
+    """
+    dtypes = compile_dtypes(schema)
+    datetime_cols = [spec.name for spec in schema.columns if spec.dtype == "datetime"]
+    return {
+        "usecols": schema.column_names,
+        "dtype": {
+            spec.name: _read_dtype(spec, dtypes)
+            for spec in schema.columns
+            if spec.name not in datetime_cols
+        },
+        "parse_dates": datetime_cols,
+    }
+
+
+def apply_schema(df: pd.DataFrame, schema: TableSchema) -> pd.DataFrame:
+    """
+    Casts the columns of `df` to the schema dtypes in place.
+    A column whose values do not fit its declared type (nulls in a
+    non-nullable int, unparseable dates, values outside the domain) is left
+    as-is, so validation can report the offending rows.
+    """
+    dtypes = compile_dtypes(schema)
+    for spec in schema.columns:
+        if spec.name not in df.columns:
+            continue
+        series = df[spec.name]
+        target = dtypes[spec.name]
+        if series.dtype == target:
+            continue
+
+        if not spec.nullable and series.isna().any():
+            logger.warning(f"{spec.name} has nulls; dtype left as {series.dtype}")
+            continue
+
+        if spec.domain and not series.dropna().isin(spec.domain).all():
+            logger.warning(f"{spec.name} has values outside its domain; dtype left as {series.dtype}")
+            continue
+
+        try:
+            if spec.dtype == "datetime":
+                df[spec.name] = pd.to_datetime(series, errors="raise").astype(target)
+            elif spec.dtype == "category" and spec.value_dtype:
+                # Nullable (Int64) read dtypes are narrowed first, so the
+                # categories have the same dtype on every read path
+                values = series if series.hasnans else series.astype(spec.value_dtype)
+                df[spec.name] = values.astype(target)
+            else:
+                df[spec.name] = series.astype(target)
+        except (ValueError, TypeError) as e:
+            logger.warning(f"Could not cast {spec.name} to {spec.dtype}: {e}")
+
+    return df
@@ -0,0 +1,56 @@
+import json
+import os
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+import pandas as pd
+
+
+@dataclass
+class WatermarkConfig:
+    watermark_path: str = "artifacts/watermarks.json"
+
+
+class WatermarkStore:
+    """
+    Persists the high-watermark (max SalesID / max OrderDate) reached by the
+    last successful ingestion run, one entry per source table.
+    """
+
+    def __init__(self, config: WatermarkConfig = WatermarkConfig()):
+        self.config = config
+
+    def _read_all(self) -> Dict[str, Dict]:
+        if not os.path.exists(self.config.watermark_path):
+            return {}
+        with open(self.config.watermark_path, "r") as fp:
+            return json.load(fp)
+
+    def get(self, table_name: str) -> Optional[Dict]:
+        return self._read_all().get(table_name)
+
+    def update(self, table_name: str, df: pd.DataFrame) -> Dict:
+        """
+        Records the watermark reached by `df` for `table_name`.
+        Never moves an existing watermark backwards.
+        """
+        current = self.get(table_name) or {}
+        watermark = dict(current)
+
+        if "SalesID" in df.columns and not df.empty:
+            watermark["SalesID"] = max(int(df["SalesID"].max()), current.get("SalesID", 0))
+
+        if "OrderDate" in df.columns and not df.empty:
+            max_date = pd.to_datetime(df["OrderDate"]).max().date().isoformat()
+            watermark["OrderDate"] = max(max_date, current.get("OrderDate", max_date))
+
+        watermarks = self._read_all()
+        watermarks[table_name] = watermark
+
+        os.makedirs(os.path.dirname(self.config.watermark_path) or ".", exist_ok=True)
+        tmp_path = f"{self.config.watermark_path}.tmp"
+        with open(tmp_path, "w") as fp:
+            json.dump(watermarks, fp, indent=2)
+        os.replace(tmp_path, self.config.watermark_path)
+
+        return watermark
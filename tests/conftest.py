@@ -0,0 +1,36 @@
+import pandas as pd
+import pytest
+
+from src.DMARTProject.loggers.logger import LoggingConfig, configure_logging
+
+
+@pytest.fixture(autouse=True)
+def workdir(tmp_path, monkeypatch):
+    """
+    Runs every test in its own directory, so artifacts/ and logs/ written
+    relative to the working directory stay out of the repository.
+    """
+    monkeypatch.chdir(tmp_path)
+    configure_logging(LoggingConfig(log_dir=str(tmp_path / "logs")))
+    return tmp_path
+
+
+@pytest.fixture
+def sales():
+    return pd.DataFrame(
+        {
+            "SalesID": [1, 2, 3],
+            "OrderID": ["A", "B", "C"],
+            "OrderDate": pd.to_datetime(["2024-01-01", "2024-01-02", "2024-02-01"]),
+            "ProductID": [10, 11, 10],
+            "CustomerID": [5, 6, 7],
+            "RegionID": [1, 2, 1],
+            "ShipMode": ["Economy", "Priority", "Economy"],
+            "Quantity": [1, 2, 3],
+            "Discount": [0.1, None, 0.0],
+            "SalesAmount": [10.0, 20.0, 30.0],
+            "Profit": [1.0, -2.0, None],
+            "LocationID": [100, 101, 100],
+            "FeedbackProvided": [True, False, True],
+        }
+    )
@@ -0,0 +1,138 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.DMARTProject.components.analysis_stats import AnalysisStats
+from src.DMARTProject.components.data_analysis import DataAnalysis
+from src.DMARTProject.components.kpi_cube import KPICubeConfig
+from src.DMARTProject.components.plot_rendering import PlotConfig
+from src.DMARTProject.pipelines import etl_pipeline
+from src.DMARTProject.pipelines.etl_pipeline import ETLPipeline, ETLPipelineConfig
+from src.DMARTProject.utils.result_cache import ResultCache, ResultCacheConfig
+
+
+def _frame(rows: int, seed: int = 0, start: int = 1) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    profit = rng.normal(5, 20, rows)
+    profit[rng.random(rows) < 0.05] = np.nan
+    return pd.DataFrame(
+        {
+            "SalesID": np.arange(start, start + rows),
+            "Quantity": rng.integers(1, 10, rows),
+            "Discount": rng.choice([0.0, 0.05, 0.2, 0.4, 0.6, 0.9], rows),
+            "SalesAmount": rng.gamma(2.0, 50.0, rows),
+            "Profit": profit,
+        }
+    )
+
+
+def _assert_same(stats: AnalysisStats, expected: AnalysisStats):
+    assert stats.row_count == expected.row_count
+    assert stats.loss_count == expected.loss_count
+    np.testing.assert_array_equal(stats.count, expected.count)
+    np.testing.assert_allclose(stats.mean, expected.mean)
+    np.testing.assert_allclose(stats.m2, expected.m2)
+    np.testing.assert_array_equal(stats.min, expected.min)
+    np.testing.assert_array_equal(stats.max, expected.max)
+    np.testing.assert_allclose(stats.comoment, expected.comoment)
+    np.testing.assert_array_equal(stats.bucket_count, expected.bucket_count)
+    np.testing.assert_allclose(stats.bucket_profit, expected.bucket_profit)
+    for sketch, other in zip(stats.sketches, expected.sketches):
+        assert sketch.quantile(0.5) == other.quantile(0.5)
+
+
+def test_shuffled_chunks_match_the_whole_frame():
+    df = _frame(5000)
+    shuffled = df.sample(frac=1, random_state=1, ignore_index=True)
+
+    stats = AnalysisStats()
+    chunks = (shuffled.iloc[start : start + 700] for start in range(0, len(shuffled), 700))
+    for _ in stats.add_chunks(chunks):
+        pass
+
+    _assert_same(stats, AnalysisStats.from_frame(df))
+
+
+@pytest.mark.parametrize("replace_existing", [False, True])
+def test_incremental_stats_follow_the_delta(replace_existing):
+    pipeline = ETLPipeline(ETLPipelineConfig(incremental=True))
+    path = pipeline.config.analysis_stats.stats_path
+    stored = _frame(1000)
+    AnalysisStats.from_frame(stored).save(path)
+
+    delta = _frame(50, seed=1, start=1001)
+    replaced = 0
+    if replace_existing:
+        # Edited versions of existing rows, with keys below the newest one
+        edited = _frame(20, seed=2, start=100)
+        delta = pd.concat([edited, delta], ignore_index=True)
+        stored = stored[~stored["SalesID"].isin(edited["SalesID"])]
+        replaced = len(edited)
+    merged = pd.concat([stored, delta]).sort_values("SalesID", ignore_index=True)
+
+    stats = pipeline._analysis_stats(merged, delta, replaced, pipeline.config.analysis_stats)
+
+    _assert_same(stats, AnalysisStats.from_frame(merged))
+
+
+def test_cached_results_follow_the_stats(sales):
+    cache = ResultCache(ResultCacheConfig(cache_dir="artifacts/cache"))
+    first = AnalysisStats.from_frame(sales)
+    second = AnalysisStats.from_frame(pd.concat([sales, sales]))
+
+    assert DataAnalysis(sales, stats=first, cache=cache).basic_metrics()["row_count"] == 3
+    # Same frame, other stats: not served from the first entry
+    assert DataAnalysis(sales, stats=second, cache=cache).basic_metrics()["row_count"] == 6
+
+
+def test_data_version_replaces_the_column_hashes(sales, monkeypatch):
+    cache = ResultCache(ResultCacheConfig(cache_dir="artifacts/cache"))
+    stats = AnalysisStats.from_frame(sales)
+    monkeypatch.setattr(pd.util, "hash_pandas_object", lambda *args, **kwargs: pytest.fail("hashed a column"))
+
+    DataAnalysis(sales, stats=stats, cache=cache, data_version="v1").basic_metrics()
+    DataAnalysis(sales, stats=stats, cache=cache, data_version="v1").basic_metrics()
+    assert (cache.hits, cache.misses) == (1, 1)
+    # A new version is a new entry
+    DataAnalysis(sales, stats=stats, cache=cache, data_version="v2").basic_metrics()
+    assert cache.misses == 2
+
+
+def test_analysis_branch_is_skipped_for_unchanged_data(sales, monkeypatch):
+    pipeline = ETLPipeline(
+        ETLPipelineConfig(kpi_cube=KPICubeConfig(table_name=None), plots=PlotConfig(dpi=20, workers=1))
+    )
+    pipeline._analysis_branch(sales)
+    assert os.path.exists(pipeline.config.kpi_cube.cube_path)
+
+    runs = []
+    run_analysis = pipeline._run_analysis
+    monkeypatch.setattr(pipeline, "_run_analysis", lambda *args: runs.append(args) or run_analysis(*args))
+    pipeline._analysis_branch(sales)
+    assert runs == []
+
+    # Deleted outputs and changed data both rerun the branch
+    os.remove(pipeline.config.analysis_stats.stats_path)
+    pipeline._analysis_branch(sales)
+    pipeline._analysis_branch(sales.assign(Quantity=sales["Quantity"] + 1))
+    assert len(runs) == 2
+
+
+def test_data_version_stands_in_for_the_cleaned_frame(sales, monkeypatch):
+    pipeline = ETLPipeline(
+        ETLPipelineConfig(build_kpi_cube=False, analysis_cache=None, plots=PlotConfig(dpi=20, workers=1))
+    )
+    hashed = []
+    monkeypatch.setattr(etl_pipeline, "content_hash", lambda value: hashed.append(value) or "hash")
+    runs = []
+    run_analysis = pipeline._run_analysis
+    monkeypatch.setattr(pipeline, "_run_analysis", lambda *args: runs.append(args) or run_analysis(*args))
+
+    pipeline._analysis_branch(sales, None, 0, "v1")
+    pipeline._analysis_branch(sales, None, 0, "v1")
+    pipeline._analysis_branch(sales, None, 0, "v2")
+
+    assert len(runs) == 2
+    assert hashed == []
@@ -0,0 +1,43 @@
+import pandas as pd
+import pytest
+
+from src.DMARTProject.utils.artifacts import iter_artifact, read_artifact, write_artifact
+from src.DMARTProject.utils.schema import get_schema
+
+
+@pytest.mark.parametrize("extension", ["parquet", "arrow", "csv"])
+def test_read_artifact_returns_requested_columns(sales, extension):
+    path = write_artifact(sales, f"artifacts/sales.{extension}")
+    columns = ["Profit", "SalesID", "OrderDate"]
+
+    df = read_artifact(path, columns=columns, schema=get_schema())
+
+    assert list(df.columns) == columns
+    assert pd.api.types.is_datetime64_any_dtype(df["OrderDate"])
+
+
+@pytest.mark.parametrize("extension", ["parquet", "arrow", "csv"])
+def test_iter_artifact_returns_requested_columns(sales, extension):
+    path = write_artifact(sales, f"artifacts/sales.{extension}")
+    columns = ["ShipMode", "SalesID"]
+
+    chunks = list(iter_artifact(path, chunksize=2, columns=columns, schema=get_schema()))
+
+    assert [len(chunk) for chunk in chunks] == [2, 1]
+    assert all(list(chunk.columns) == columns for chunk in chunks)
+
+
+def test_every_format_reads_the_same_dtypes_and_categories(sales):
+    schema = get_schema()
+    frames = {
+        extension: read_artifact(write_artifact(sales, f"artifacts/sales.{extension}"), schema=schema)
+        for extension in ("parquet", "arrow", "csv")
+    }
+    reference = frames["parquet"]
+    # ID categories are integers, as when read from SQL
+    assert pd.api.types.is_integer_dtype(reference["RegionID"].cat.categories)
+
+    for extension, df in frames.items():
+        pd.testing.assert_series_equal(df.dtypes, reference.dtypes, obj=extension)
+        for col in ("ProductID", "CustomerID", "RegionID", "LocationID", "ShipMode"):
+            pd.testing.assert_index_equal(df[col].cat.categories, reference[col].cat.categories, obj=f"{extension} {col}")
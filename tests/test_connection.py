@@ -0,0 +1,38 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.DMARTProject.components.datapersistence import DataPersistence
+from src.DMARTProject.utils.connection import dispose_engines, get_engine
+
+
+@pytest.fixture(autouse=True)
+def engines():
+    dispose_engines()
+    yield
+    dispose_engines()
+
+
+def test_one_engine_per_url():
+    engine = get_engine("sqlite:///a.db")
+
+    assert get_engine("sqlite:///a.db") is engine
+    assert get_engine("sqlite:///b.db") is not engine
+    assert DataPersistence("sqlite:///a.db").engine is engine
+    # Components created on several threads at once still share it
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        engines = set(pool.map(lambda _: id(get_engine("sqlite:///c.db")), range(16)))
+    assert len(engines) == 1
+
+
+def test_dispose_closes_the_pooled_connections():
+    engine = get_engine("sqlite:///a.db")
+    with engine.connect():
+        pass
+    pool = engine.pool
+    assert pool.checkedin() == 1
+
+    dispose_engines()
+
+    assert pool.checkedin() == 0
+    assert get_engine("sqlite:///a.db") is not engine
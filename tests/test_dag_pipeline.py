@@ -0,0 +1,62 @@
+import os
+from dataclasses import replace
+
+import pandas as pd
+
+from src.DMARTProject.components.kpi_cube import KPICube, KPICubeConfig
+from src.DMARTProject.components.plot_rendering import PlotConfig
+from src.DMARTProject.pipelines.dag_pipeline import DAGPipeline, DAGPipelineConfig
+from src.DMARTProject.pipelines.etl_pipeline import ETLPipelineConfig
+
+
+def _pipeline(**etl) -> DAGPipeline:
+    config = ETLPipelineConfig(
+        incremental=True,
+        kpi_cube=KPICubeConfig(table_name=None),
+        plots=PlotConfig(dpi=20, workers=1),
+        **etl,
+    )
+    return DAGPipeline(DAGPipelineConfig(etl=config))
+
+
+def test_kpi_stage_refreshes_only_the_delta_months(sales):
+    pipeline = _pipeline()
+    stored = KPICube(pipeline.config.kpi_cube)
+    stored.build(sales.assign(SalesAmount=sales["SalesAmount"] * 2))
+    stored.save()
+
+    # The February row is the delta; January keeps its stored slices
+    pipeline._delta = (sales.iloc[[2]], 0)
+    cube = pipeline._kpi_cube(sales, pipeline.config.kpi_cube, None)
+
+    january = cube[(cube["Year"] == 2024) & (cube["Month"] == 1)]
+    february = cube[(cube["Year"] == 2024) & (cube["Month"] == 2)]
+    assert january["TotalSales"].sum() == 60.0
+    assert february["TotalSales"].sum() == 30.0
+
+
+def test_analysis_stage_uses_the_result_cache(sales):
+    pipeline = _pipeline()
+    config = pipeline.config
+    result = pipeline._analysis(sales, config.analysis_stats, config.analysis_cache, config.plots)
+
+    assert result["metrics"]["row_count"] == len(sales)
+    assert os.listdir(pipeline.config.analysis_cache.cache_dir)
+
+
+def test_stages_run_with_the_settings_in_their_key(sales):
+    pipeline = _pipeline()
+    stages = {stage.name: stage for stage in pipeline.stages()}
+    assert "kpi_cube" not in {stage.name for stage in _pipeline(build_kpi_cube=False).stages()}
+
+    deduped = {stage.name: stage for stage in _pipeline(deduplicate=True).stages()}
+    assert deduped["persistence"].params != stages["persistence"].params
+    parallel = {stage.name: stage for stage in _pipeline(parallel_workers=2).stages()}
+    assert parallel["validation"].params != stages["validation"].params
+    assert parallel["cleaning"].params != stages["cleaning"].params
+
+    # The stage uses its params, not the pipeline config
+    stats_config = replace(pipeline.config.analysis_stats, stats_path="artifacts/other/stats.json")
+    pipeline._analysis(sales, stats_config, None, pipeline.config.plots)
+    assert os.path.exists("artifacts/other/stats.json")
+    assert not os.path.exists(pipeline.config.analysis_stats.stats_path)
@@ -0,0 +1,91 @@
+import pandas as pd
+import pytest
+
+from src.DMARTProject.components import data_ingestion_pipeline
+from src.DMARTProject.components.data_ingestion_pipeline import DataIngestionPipeline
+from src.DMARTProject.pipelines.etl_pipeline import ETLPipeline, ETLPipelineConfig
+from src.DMARTProject.utils.artifacts import write_artifact
+from src.DMARTProject.utils.dag import content_hash
+from src.DMARTProject.utils.watermark import WatermarkStore
+from src.exception import CustomException
+
+
+def test_merge_delta_reports_only_changed_rows(sales):
+    raw_path = write_artifact(sales, "artifacts/raw_data.parquet")
+    new_row = sales.iloc[[0]].assign(SalesID=4, Quantity=9)
+    edited = sales.iloc[[1]].assign(Quantity=5)
+    # Row 3 is re-extracted unchanged, as the OrderDate watermark does
+    delta = pd.concat([sales.iloc[[2]], edited, new_row], ignore_index=True)
+
+    ingestion = DataIngestionPipeline()
+    merged, changes = ingestion._merge_delta(raw_path, delta)
+
+    assert changes["SalesID"].tolist() == [2, 4]
+    assert ingestion.last_replaced == 1
+    assert merged["SalesID"].tolist() == [1, 2, 3, 4]
+    assert merged["Quantity"].tolist() == [1, 5, 3, 9]
+
+
+def test_watermark_waits_for_persistence(sales, monkeypatch):
+    loads = []
+
+    class Source:
+        table_name = "sales"
+
+        def load_data(self):
+            loads.append(None)
+            return sales.iloc[:2]
+
+        def load_incremental(self, watermark):
+            loads.append(watermark)
+            return sales[sales["SalesID"] > watermark["SalesID"]]
+
+    monkeypatch.setattr(data_ingestion_pipeline, "DataIngestion", Source)
+    pipeline = ETLPipeline(ETLPipelineConfig(incremental=True))
+    persisted = []
+    monkeypatch.setattr(pipeline, "_analysis_branch", lambda *args: None)
+    monkeypatch.setattr(pipeline, "_persistence_branch", lambda df: persisted.append(df["SalesID"].tolist()))
+    pipeline.run()
+    assert WatermarkStore().get("sales") == {"SalesID": 2, "OrderDate": "2024-01-02"}
+
+    def fail(df):
+        raise RuntimeError("target unavailable")
+
+    monkeypatch.setattr(pipeline, "_persistence_branch", fail)
+    with pytest.raises(CustomException):
+        pipeline.run()
+    assert WatermarkStore().get("sales") == {"SalesID": 2, "OrderDate": "2024-01-02"}
+
+    # The next run extracts the unpersisted row again
+    monkeypatch.setattr(pipeline, "_persistence_branch", lambda df: persisted.append(df["SalesID"].tolist()))
+    pipeline.run()
+    assert loads == [None, {"SalesID": 2, "OrderDate": "2024-01-02"}, {"SalesID": 2, "OrderDate": "2024-01-02"}]
+    assert persisted == [[1, 2], [1, 2, 3]]
+    assert WatermarkStore().get("sales") == {"SalesID": 3, "OrderDate": "2024-02-01"}
+
+
+def test_raw_data_version_follows_the_changes(sales, monkeypatch):
+    extracts = [sales.iloc[:2], sales.iloc[[1, 2]], sales.iloc[[2]], sales.iloc[[2]].assign(Quantity=7)]
+
+    class Source:
+        table_name = "sales"
+
+        def load_data(self):
+            return extracts.pop(0)
+
+        load_incremental = lambda self, watermark: self.load_data()
+
+    monkeypatch.setattr(data_ingestion_pipeline, "DataIngestion", Source)
+    ingestion = DataIngestionPipeline()
+    versions = []
+    for _ in range(len(extracts)):
+        ingestion.extract(incremental=True)
+        ingestion.commit_watermark()
+        versions.append(ingestion.last_version)
+
+    # Full load: the whole frame; a new row or an edit: a new version;
+    # only re-extracted rows: unchanged
+    assert versions[0] == content_hash(sales.iloc[:2])
+    assert versions[1] != versions[0]
+    assert versions[2] == versions[1]
+    assert versions[3] != versions[2]
@@ -0,0 +1,76 @@
+import numpy as np
+import pandas as pd
+
+from src.DMARTProject.components.data_split import DataSplitConfig, DataSplitter
+
+
+def _keys(rows: int) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    return pd.DataFrame(
+        {"SalesID": np.arange(1, rows + 1), "ShipMode": rng.choice(["Economy", "Priority", "Standard"], rows)}
+    )
+
+
+def test_hash_split_is_stable_across_chunks_order_and_loads():
+    df = _keys(20_000)
+    _, test = DataSplitter().split_frame(df)
+    expected = set(test["SalesID"])
+
+    # Shuffled, in chunks, through the same assignment
+    splitter = DataSplitter()
+    shuffled = df.sample(frac=1, random_state=3, ignore_index=True)
+    chunked = set()
+    for start in range(0, len(shuffled), 1_500):
+        chunk = shuffled.iloc[start : start + 1_500]
+        chunked |= set(chunk["SalesID"][splitter.is_test(chunk)])
+    assert chunked == expected
+
+    # An incremental load adds rows without moving the ones already split
+    _, grown = DataSplitter().split_frame(_keys(25_000))
+    assert set(grown["SalesID"][grown["SalesID"] <= 20_000]) == expected
+    assert abs(len(expected) / len(df) - 0.2) < 0.01
+
+
+def test_salt_reshuffles_the_split():
+    df = _keys(5_000)
+    default = DataSplitter().is_test(df)
+    salted = DataSplitter(DataSplitConfig(salt="other")).is_test(df)
+    assert (default != salted).any()
+
+
+def test_report_by_only_reports():
+    df = _keys(20_000)
+    splitter = DataSplitter(DataSplitConfig(report_by=("ShipMode",)))
+    _, test = splitter.split_frame(df)
+
+    assert set(test["SalesID"]) == set(DataSplitter().split_frame(df)[1]["SalesID"])
+    shares = splitter.report.group_shares()
+    assert sorted(shares["group"]) == [("Economy",), ("Priority",), ("Standard",)]
+    assert shares["train_rows"].sum() + shares["test_rows"].sum() == len(df)
+
+
+def test_stratified_hash_split_is_per_stratum_and_stable():
+    df = _keys(30_000)
+    config = DataSplitConfig(stratify=("ShipMode",))
+    splitter = DataSplitter(config)
+    _, test = splitter.split_frame(df)
+    expected = set(test["SalesID"])
+
+    # Its own assignment, reported per stratum
+    assert expected != set(DataSplitter().split_frame(df)[1]["SalesID"])
+    shares = splitter.report.group_shares()
+    assert sorted(shares["group"]) == [("Economy",), ("Priority",), ("Standard",)]
+    assert ((shares["test_share"] - 0.2).abs() < 0.015).all()
+
+    # Still decided row by row: same result chunk by chunk and in any order
+    shuffled = df.sample(frac=1, random_state=3, ignore_index=True)
+    chunked = set()
+    for start in range(0, len(shuffled), 2_000):
+        chunk = shuffled.iloc[start : start + 2_000]
+        chunked |= set(chunk["SalesID"][DataSplitter(config).is_test(chunk)])
+    assert chunked == expected
+
+    # A stratum split on its own keeps the same rows
+    economy = df[df["ShipMode"] == "Economy"]
+    alone = DataSplitter(config).is_test(economy)
+    np.testing.assert_array_equal(alone, economy["SalesID"].isin(expected).to_numpy())
@@ -0,0 +1,71 @@
+import logging
+
+import pandas as pd
+import pytest
+from sqlalchemy import inspect
+
+from src.DMARTProject.components.datapersistence import BulkLoadConfig, DataPersistence, sql_types_for
+
+
+def test_string_widths_do_not_depend_on_the_data():
+    short = pd.DataFrame({"OrderID": ["A"], "ShipMode": pd.Categorical(["Economy"]), "Note": ["x"]})
+    long = pd.DataFrame({"OrderID": ["A" * 500], "ShipMode": pd.Categorical(["Economy Plus"]), "Note": ["x" * 500]})
+
+    for df in (short, long):
+        types = sql_types_for(df)
+        # Undeclared width: unbounded, so later longer values still fit
+        assert types["OrderID"].length is None
+        assert types["Note"].length is None
+        # Category with a domain: sized to the longest allowed value
+        assert types["ShipMode"].length == len("Economy Plus")
+
+
+def test_merge_counts_inserted_updated_and_unchanged_rows(sales):
+    persistence = DataPersistence("sqlite:///merge.db")
+    first = persistence.merge_into(sales, "sales", key="SalesID")
+    assert (first["inserted"], first["updated"], first["unchanged"]) == (3, 0, 0)
+
+    # Row 1 unchanged, row 2 edited (including a NULL becoming a value), row 4 new
+    delta = pd.concat(
+        [sales.iloc[[0]], sales.iloc[[1]].assign(Discount=0.3), sales.iloc[[0]].assign(SalesID=4)],
+        ignore_index=True,
+    )
+    second = persistence.merge_into(delta, "sales", key="SalesID")
+    assert (second["inserted"], second["updated"], second["unchanged"]) == (1, 1, 1)
+
+    # Re-applying the same delta changes nothing
+    third = persistence.merge_into(delta, "sales", key="SalesID")
+    assert (third["inserted"], third["updated"], third["unchanged"]) == (0, 0, 3)
+
+    table = pd.read_sql("SELECT SalesID, Discount FROM sales ORDER BY SalesID", persistence.engine)
+    assert table["SalesID"].tolist() == [1, 2, 3, 4]
+    assert table["Discount"].tolist()[1] == 0.3
+
+
+@pytest.mark.parametrize("use_staging", [True, False])
+def test_replaced_table_is_indexed_on_the_key(sales, use_staging):
+    persistence = DataPersistence("sqlite:///replace.db", BulkLoadConfig(use_staging=use_staging))
+
+    # Twice: the second replace drops the first table and its index
+    for _ in range(2):
+        persistence.write_chunks([sales.iloc[:2], sales.iloc[2:]], "sales", mode="replace")
+        indexes = inspect(persistence.engine).get_indexes("sales")
+        assert [index["column_names"] for index in indexes] == [["SalesID"]]
+
+    # A later merge stages and indexes its own table alongside
+    persistence.merge_into(sales.assign(Quantity=9), "sales", key="SalesID")
+    assert len(pd.read_sql("SELECT * FROM sales WHERE Quantity = 9", persistence.engine)) == 3
+
+
+def test_empty_replace_is_not_silent(sales, caplog):
+    persistence = DataPersistence("sqlite:///replace.db")
+    persistence.write_chunks([sales], "sales", mode="replace")
+
+    with pytest.raises(ValueError, match="received no chunks"):
+        persistence.write_chunks(iter([]), "sales", mode="replace")
+    assert len(pd.read_sql("SELECT * FROM sales", persistence.engine)) == 3
+
+    with caplog.at_level(logging.WARNING):
+        persistence.write_chunks([sales.iloc[:0]], "sales", mode="replace")
+    assert "wrote 0 rows" in caplog.text
+    assert len(pd.read_sql("SELECT * FROM sales", persistence.engine)) == 0
@@ -0,0 +1,90 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.DMARTProject.components.deduplication import DeduplicationConfig, Deduplicator
+from src.DMARTProject.utils.artifacts import read_artifact, write_artifact
+from src.DMARTProject.utils.fingerprints import ArrayFingerprintStore
+from src.DMARTProject.utils.schema import get_schema
+
+
+def test_row_fingerprints_match_across_formats(sales):
+    schema = get_schema()
+    parquet = read_artifact(write_artifact(sales, "artifacts/sales.parquet"), schema=schema)
+    csv = read_artifact(write_artifact(sales, "artifacts/sales.csv"), schema=schema)
+    # IDs held as string categories, as CSV parsing used to produce them
+    text_ids = parquet.astype({col: "string" for col in ("ProductID", "CustomerID", "RegionID", "LocationID")})
+    text_ids = text_ids.astype({col: "category" for col in ("ProductID", "CustomerID", "RegionID", "LocationID")})
+
+    deduplicator = Deduplicator()
+    expected = deduplicator.fingerprints(parquet)
+
+    np.testing.assert_array_equal(deduplicator.fingerprints(csv), expected)
+    np.testing.assert_array_equal(deduplicator.fingerprints(text_ids), expected)
+    assert len(set(expected)) == len(sales)
+
+
+@pytest.mark.parametrize("path", ["artifacts/dedup/fingerprints.npy", "artifacts/dedup/fingerprints.sqlite"])
+def test_replace_keeps_history_until_commit(sales, path):
+    config = DeduplicationConfig(fingerprint_path=path)
+    first = Deduplicator(config)
+    first.filter(sales)
+    first.commit()
+    first.close()
+
+    # A reload that fails before commit() leaves the history untouched
+    failed = Deduplicator(config, replace=True)
+    assert len(failed.filter(sales)) == len(sales)
+    failed.close()
+    check = Deduplicator(config)
+    assert check.filter(sales).empty
+    check.close()
+
+    # A successful reload swaps in the rebuilt history
+    reload = Deduplicator(config, replace=True)
+    reload.filter(sales.iloc[:1])
+    reload.commit()
+    reload.close()
+    after = Deduplicator(config)
+    assert len(after.filter(sales)) == len(sales) - 1
+    after.close()
+
+
+def test_array_store_releases_its_mapping(sales, monkeypatch):
+    path = "artifacts/dedup/fingerprints.npy"
+    config = DeduplicationConfig(fingerprint_path=path)
+    first = Deduplicator(config)
+    first.filter(sales)
+    first.commit()
+    stores = [first.store]
+
+    # Like Windows: a file that is still memory-mapped cannot be replaced or removed
+    def guard(call):
+        def guarded(*args):
+            target = os.path.abspath(args[-1])
+            for store in stores:
+                if isinstance(store._hashes, np.memmap) and os.path.abspath(store._hashes.filename) == target:
+                    raise PermissionError(target)
+            return call(*args)
+
+        return guarded
+
+    monkeypatch.setattr(os, "replace", guard(os.replace))
+    monkeypatch.setattr(os, "remove", guard(os.remove))
+
+    first.filter(sales.assign(SalesID=sales["SalesID"] + 10))
+    first.commit()
+    assert len(first.store) == 2 * len(sales)
+    first.close()
+
+    reload = Deduplicator(config, replace=True)
+    stores.append(reload.store)
+    reload.filter(sales.iloc[:1])
+    reload.commit()
+    stores.append(reload.store)
+    reload.reset()
+    reload.close()
+    assert not os.path.exists(path)
+    assert len(ArrayFingerprintStore(path)) == 0
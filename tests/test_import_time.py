@@ -0,0 +1,20 @@
+import pytest
+
+from src.DMARTProject.benchmarks.import_time import ImportTimeConfig, measure
+
+
+@pytest.mark.parametrize(
+    "module",
+    [
+        *ImportTimeConfig.modules,
+        "src.DMARTProject.pipelines.dag_pipeline",
+        "src.DMARTProject.pipelines.prediction_pipeline",
+        "src.DMARTProject.pipelines.training_pipeline",
+    ],
+)
+def test_import_is_light_and_side_effect_free(module):
+    # The time budget is left to the benchmark; it depends on the machine
+    result = measure(module, ImportTimeConfig(repeat=1, budget_ms=float("inf")))
+
+    assert result.errors == []
+    assert "pandas" in result.packages
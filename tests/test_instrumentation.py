@@ -0,0 +1,41 @@
+import math
+import sys
+import threading
+
+from src.DMARTProject.utils.instrumentation import Instrumentation, InstrumentationConfig, max_rss_mb
+
+
+def test_concurrent_stages_record_wall_time_only():
+    instrumentation = Instrumentation(InstrumentationConfig(metrics_path="artifacts/metrics.jsonl"))
+
+    def branch(name):
+        with instrumentation.stage(name):
+            sum(range(100_000))
+
+    with instrumentation.concurrent("branches"):
+        threads = [threading.Thread(target=branch, args=(name,)) for name in ("analysis", "persistence")]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    with instrumentation.stage("after"):
+        pass
+
+    records = {record.stage: record for record in instrumentation.records}
+    for name in ("analysis", "persistence"):
+        assert records[name].wall_seconds > 0
+        assert records[name].cpu_seconds is None
+        assert records[name].peak_rss_mb is None
+        assert records[name].bytes_read is None
+    for name in ("branches", "after"):
+        assert records[name].cpu_seconds is not None
+        assert records[name].peak_rss_mb > 0
+
+
+def test_peak_rss_without_the_resource_module(monkeypatch):
+    assert max_rss_mb() > 0
+    # Windows has no resource module; psutil may be missing too
+    monkeypatch.setitem(sys.modules, "resource", None)
+    monkeypatch.setitem(sys.modules, "psutil", None)
+    assert math.isnan(max_rss_mb())
+    assert math.isnan(max_rss_mb(children=True))
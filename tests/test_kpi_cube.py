@@ -0,0 +1,82 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.DMARTProject.components.kpi_cube import KPICube, KPICubeConfig
+
+
+def _orders(rows: int, seed: int = 0, start: int = 1) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame(
+        {
+            "SalesID": np.arange(start, start + rows),
+            "OrderDate": pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 120, rows), unit="D"),
+            "ProductID": rng.integers(1, 4, rows),
+            "RegionID": rng.integers(1, 3, rows),
+            "ShipMode": rng.choice(["Economy", "Priority"], rows),
+            "Quantity": rng.integers(1, 10, rows),
+            "Discount": rng.choice([0.0, 0.1, 0.3], rows),
+            "SalesAmount": rng.gamma(2.0, 50.0, rows),
+            "Profit": rng.normal(5, 20, rows),
+        }
+    )
+
+
+def _cube() -> KPICube:
+    return KPICube(KPICubeConfig(cube_path="artifacts/kpi/kpi_cube.parquet", table_name=None))
+
+
+def _assert_same(cube: pd.DataFrame, expected: pd.DataFrame):
+    pd.testing.assert_frame_equal(cube, expected, check_exact=False)
+
+
+def test_build_and_rollup_match_the_rows(sales):
+    cube = _cube()
+    cube.build(sales)
+
+    kpis = cube.rollup().set_index(["Year", "Month"])
+    january = kpis.loc[(2024, 1)]
+    assert january["OrderCount"] == 2
+    assert january["TotalSales"] == 30.0
+    assert january["TotalProfit"] == -1.0
+    assert january["TotalQuantity"] == 3
+    assert january["AvgDiscountPct"] == 5.0
+    assert january["ProfitMarginPct"] == round(100 * -1.0 / 30.0, 2)
+    assert january["LossRate"] == 0.5
+    assert kpis.loc[(2024, 2), "OrderCount"] == 1
+
+    by_region = cube.rollup(["RegionID"]).set_index("RegionID")
+    assert by_region["TotalSales"].to_dict() == {1: 40.0, 2: 20.0}
+
+
+def test_refreshed_months_match_a_full_rebuild():
+    stored = _orders(2000)
+    cube = _cube()
+    cube.build(stored)
+    cube.save()
+
+    # New orders in the last month plus edits to a few older ones
+    edited = stored.sample(30, random_state=1).assign(Quantity=1, SalesAmount=1.0)
+    new = _orders(100, seed=1, start=2001).assign(OrderDate=pd.Timestamp("2024-04-20"))
+    delta = pd.concat([edited, new], ignore_index=True)
+    merged = pd.concat([stored, delta]).drop_duplicates("SalesID", keep="last")
+
+    refreshed = _cube().refresh(merged, KPICube.periods_of(delta))
+
+    _assert_same(refreshed, _cube().build(merged))
+
+
+@pytest.mark.parametrize("lost", ["new_month", "deleted_month"])
+def test_refresh_recomputes_months_the_cube_missed(lost):
+    rows = _orders(2000)
+    february = pd.to_datetime(rows["OrderDate"]).dt.month == 2
+    # The stored cube is behind the data: a delta never reached it, or it
+    # still holds a month the data no longer has
+    stale, current = (rows[~february], rows) if lost == "new_month" else (rows, rows[~february])
+    cube = _cube()
+    cube.build(stale)
+    cube.save()
+
+    refreshed = _cube().refresh(current, [])
+
+    _assert_same(refreshed, _cube().build(current))
@@ -0,0 +1,40 @@
+import json
+import logging
+import os
+
+import pandas as pd
+
+from src.DMARTProject.loggers.logger import AsyncQueueHandler, log_context, shutdown_logging
+from src.DMARTProject.utils.parallel import ParallelConfig, run_partitioned
+
+
+def _log_partition(part: pd.DataFrame) -> int:
+    logging.getLogger("worker").info("partition %d", part["n"].iloc[0])
+    return len(part)
+
+
+def test_worker_records_reach_the_parent_log(workdir, monkeypatch):
+    (handler,) = [h for h in logging.getLogger().handlers if isinstance(h, AsyncQueueHandler)]
+    file_handler = type(handler.target)
+    emit = file_handler.emit
+
+    def emit_with_writer(self, record):
+        record.writer = os.getpid()
+        emit(self, record)
+
+    # Forked workers inherit the patch, so a record they write shows their pid
+    monkeypatch.setattr(file_handler, "emit", emit_with_writer)
+    partitions = [pd.DataFrame({"n": [i]}) for i in range(4)]
+
+    with log_context(stage="cleaning"):
+        assert run_partitioned(_log_partition, partitions, ParallelConfig(workers=2)) == [1] * 4
+    shutdown_logging()
+
+    with open(workdir / "logs" / "dmart_project.log") as f:
+        entries = [json.loads(line) for line in f]
+    workers = [entry for entry in entries if entry["logger"] == "worker"]
+    assert sorted(entry["message"] for entry in workers) == [f"partition {i}" for i in range(4)]
+    assert {entry["stage"] for entry in workers} == {"cleaning"}
+    # Logged in the workers, written by this process
+    assert os.getpid() not in {entry["pid"] for entry in workers}
+    assert {entry["writer"] for entry in workers} == {os.getpid()}
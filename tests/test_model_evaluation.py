@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+from sklearn.metrics import (
+    accuracy_score,
+    average_precision_score,
+    brier_score_loss,
+    f1_score,
+    log_loss,
+    roc_auc_score,
+)
+
+from src.DMARTProject.components.model_evaluation import BinaryMetrics
+
+
+def _scores(rows: int, bins: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    y = rng.random(rows) < 0.3
+    # Informative scores, one value per histogram bin (bin centres)
+    raw = np.clip(rng.normal(0.35 + 0.3 * y, 0.2), 0, 1 - 1e-9)
+    proba = (np.floor(raw * bins) + 0.5) / bins
+    return y, proba
+
+
+def test_binary_metrics_match_sklearn():
+    y, proba = _scores(20_000, bins=200)
+    metrics = BinaryMetrics(threshold=0.5, bins=200)
+    for start in range(0, len(y), 3_000):
+        metrics.update(y[start : start + 3_000], proba[start : start + 3_000])
+    result = metrics.result()
+
+    predicted = proba >= 0.5
+    assert result["rows"] == len(y)
+    assert result["accuracy"] == pytest.approx(accuracy_score(y, predicted))
+    assert result["f1"] == pytest.approx(f1_score(y, predicted))
+    assert result["roc_auc"] == pytest.approx(roc_auc_score(y, proba))
+    assert result["average_precision"] == pytest.approx(average_precision_score(y, proba))
+    assert result["log_loss"] == pytest.approx(log_loss(y, proba))
+    assert result["brier"] == pytest.approx(brier_score_loss(y, proba))
+
+
+def test_binary_metrics_merge_matches_a_single_pass():
+    y, proba = _scores(10_000, bins=1000, seed=1)
+    whole = BinaryMetrics()
+    whole.update(y, proba)
+    first, second = BinaryMetrics(), BinaryMetrics()
+    first.update(y[:4_000], proba[:4_000])
+    second.update(y[4_000:], proba[4_000:])
+
+    merged, expected = first.merge(second).result(), whole.result()
+    assert merged.pop("confusion") == expected.pop("confusion")
+    assert merged == pytest.approx(expected)
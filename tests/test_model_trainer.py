@@ -0,0 +1,44 @@
+import numpy as np
+import pandas as pd
+
+from src.DMARTProject.components.model_trainer import (
+    FeatureEncoder,
+    ModelTrainer,
+    ModelTrainerConfig,
+    _validation_splitter,
+    loss_labels,
+)
+from src.DMARTProject.utils.artifacts import write_artifact
+
+
+def _orders(rows: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame(
+        {
+            "SalesID": np.arange(1, rows + 1),
+            "RegionID": rng.integers(1, 5, rows),
+            "ShipMode": rng.choice(["Economy", "Priority", "Immediate"], rows),
+            "Quantity": rng.integers(1, 10, rows),
+            "Discount": rng.choice([0.0, 0.1, 0.3, np.nan], rows),
+            "SalesAmount": rng.gamma(2.0, 50.0, rows).round(2),
+            "Profit": rng.normal(5, 20, rows).round(2),
+        }
+    )
+
+
+def test_encoder_is_fitted_without_the_validation_rows():
+    df = _orders(3000)
+    config = ModelTrainerConfig(train_data_path=write_artifact(df, "artifacts/train_data.parquet"), chunksize=700)
+    is_validation = _validation_splitter(config).is_test(df)
+    assert 0 < is_validation.sum() < len(df)
+
+    encoder, class_weight = ModelTrainer(config).fit_encoder()
+
+    train = df[~is_validation]
+    mask, y = loss_labels(train)
+    expected = FeatureEncoder().partial_fit(train[mask])
+    assert encoder.count == expected.count == mask.sum()
+    np.testing.assert_allclose(encoder.mean, expected.mean)
+    np.testing.assert_allclose(encoder.m2, expected.m2)
+    counts = np.bincount(y, minlength=2)
+    assert class_weight == {label: counts.sum() / (2 * count) for label, count in enumerate(counts)}
@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.DMARTProject.components.data_cleaning import DataCleaning
+from src.DMARTProject.components.data_validation import DataValidation, DataValidationConfig
+from src.DMARTProject.utils.parallel import ParallelConfig, partition_frame
+
+
+def _raw(rows: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame(
+        {
+            "SalesID": np.arange(1, rows + 1),
+            "OrderID": [f"O{i}" for i in range(rows)],
+            "OrderDate": pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 90, rows), unit="D"),
+            "ProductID": rng.integers(1, 20, rows),
+            "CustomerID": rng.integers(1, 50, rows),
+            "RegionID": rng.integers(1, 5, rows),
+            "ShipMode": rng.choice(["Economy", "Priority", "Immediate"], rows),
+            "Quantity": rng.integers(1, 10, rows),
+            "Discount": rng.choice([0.0, 0.1, 0.3, np.nan], rows),
+            "SalesAmount": rng.gamma(2.0, 50.0, rows).round(2),
+            "Profit": rng.normal(5, 20, rows).round(2),
+            "LocationID": rng.integers(100, 110, rows),
+            "FeedbackProvided": rng.random(rows) < 0.5,
+        }
+    )
+    # Copies of early rows near the end, i.e. in another partition
+    dupes = df.iloc[[3, 10, 11]]
+    return pd.concat([df, dupes], ignore_index=True)
+
+
+@pytest.mark.parametrize("partition_by", ["rows", "month"])
+def test_parallel_paths_match_the_serial_ones(partition_by):
+    raw = _raw(600)
+    # Invalid rows are quarantined the same way in both paths
+    raw.loc[[5, 400], "Quantity"] = 0
+    parallel = ParallelConfig(workers=3, partition_by=partition_by, min_partition_rows=100)
+    assert len(partition_frame(raw, parallel)) == 3
+
+    config = DataValidationConfig(on_error="quarantine")
+    serial_validator, parallel_validator = DataValidation(config), DataValidation(config)
+    validated = serial_validator.validate_frame(raw.copy())
+    validated_parallel = parallel_validator.validate_parallel(raw.copy(), parallel)
+    # Month partitions may list categories in another order; the values are the same
+    pd.testing.assert_frame_equal(validated_parallel, validated, check_categorical=False)
+    pd.testing.assert_frame_equal(
+        parallel_validator.quarantined, serial_validator.quarantined, check_categorical=False
+    )
+
+    cleaned = DataCleaning(validated).clean_data()
+    cleaned_parallel = DataCleaning(validated).clean_parallel(parallel)
+    pd.testing.assert_frame_equal(cleaned_parallel, cleaned, check_categorical=False)
+    assert len(cleaned) == 600 - 2
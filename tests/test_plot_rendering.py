@@ -0,0 +1,29 @@
+import os
+import threading
+
+import numpy as np
+import pytest
+
+from src.DMARTProject.components.analysis_stats import NUMERIC_COLS
+from src.DMARTProject.components.plot_rendering import PlotConfig, binned_kde, core_figure_specs, render_figures
+
+
+@pytest.mark.parametrize("rows", [3, 5000])
+def test_binned_kde_covers_the_grid(rows):
+    values = np.random.default_rng(0).normal(size=rows)
+    kde = binned_kde(values, values.min(), values.max(), grid_points=64)
+
+    assert kde.shape == (64,)
+    assert kde.max() > 0
+
+
+def test_render_pool_started_from_a_thread(sales, tmp_path):
+    config = PlotConfig(dpi=20, workers=2)
+    specs = core_figure_specs(sales, sales[NUMERIC_COLS].corr(), config)
+    result = []
+    thread = threading.Thread(target=lambda: result.extend(render_figures(specs, str(tmp_path / "eda"), config)))
+    thread.start()
+    thread.join(timeout=120)
+
+    assert len(result) == len(specs)
+    assert all(os.path.getsize(path) > 0 for path in result)
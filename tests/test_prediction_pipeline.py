@@ -0,0 +1,114 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.DMARTProject.components.datapersistence import DataPersistence
+from src.DMARTProject.components.model_trainer import LossRiskModel, ModelTrainer, ModelTrainerConfig
+from src.DMARTProject.pipelines import prediction_pipeline
+from src.DMARTProject.pipelines.prediction_pipeline import (
+    PredictionPipeline,
+    PredictionPipelineConfig,
+    load_model,
+    loss_probability,
+)
+from src.DMARTProject.utils.artifacts import read_artifact, write_artifact
+
+
+def _orders(rows: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    discount = rng.choice([0.0, 0.1, 0.3, 0.6], rows)
+    sales_amount = rng.gamma(2.0, 50.0, rows).round(2)
+    return pd.DataFrame(
+        {
+            "SalesID": np.arange(1, rows + 1),
+            "OrderID": [f"O{i}" for i in range(rows)],
+            "OrderDate": pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 90, rows), unit="D"),
+            "ProductID": rng.integers(1, 20, rows),
+            "CustomerID": rng.integers(1, 50, rows),
+            "RegionID": rng.integers(1, 5, rows),
+            "ShipMode": rng.choice(["Economy", "Priority", "Immediate"], rows),
+            "Quantity": rng.integers(1, 10, rows),
+            "Discount": discount,
+            # Deep discounts tend to lose money
+            "SalesAmount": sales_amount,
+            "Profit": (sales_amount * (0.2 - discount) + rng.normal(0, 5, rows)).round(2),
+            "LocationID": rng.integers(100, 110, rows),
+            "FeedbackProvided": rng.random(rows) < 0.5,
+        }
+    )
+
+
+def _train(alpha: float = 1e-4) -> LossRiskModel:
+    return ModelTrainer(
+        ModelTrainerConfig(
+            train_data_path=write_artifact(_orders(2000), "artifacts/train_data.parquet"),
+            epochs=1,
+            param_grid={"alpha": [alpha], "penalty": ["l2"]},
+            workers=1,
+        )
+    ).train()
+
+
+@pytest.fixture(autouse=True)
+def model_cache():
+    prediction_pipeline.clear_model_cache()
+    yield
+    prediction_pipeline.clear_model_cache()
+
+
+def test_loss_probability_matches_predict_proba():
+    model = _train()
+    df = _orders(500, seed=1)
+
+    expected = model.estimator.predict_proba(model.encoder.transform(df))[:, 1]
+    np.testing.assert_allclose(loss_probability(model, df), expected)
+
+
+def test_model_is_reloaded_after_a_new_version(monkeypatch):
+    first = _train()
+    loads = []
+    load = LossRiskModel.load
+    monkeypatch.setattr(LossRiskModel, "load", lambda path: loads.append(path) or load(path))
+
+    assert load_model("artifacts/model").version == first.version
+    assert load_model("artifacts/model").version == first.version
+    # latest.json rewritten for the same version: nothing to unpickle
+    latest = os.path.join("artifacts/model", "latest.json")
+    os.utime(latest, ns=(os.stat(latest).st_atime_ns, os.stat(latest).st_mtime_ns + 1_000_000))
+    assert load_model("artifacts/model").version == first.version
+    assert len(loads) == 1
+
+    second = _train(alpha=1e-3)
+    assert second.version != first.version
+    assert load_model("artifacts/model").version == second.version
+    assert len(loads) == 2
+
+
+@pytest.mark.parametrize("entry", ["run", "score_frame"])
+def test_every_row_is_written(entry):
+    model = _train()
+    df = _orders(1000, seed=2)
+    pipeline = PredictionPipeline(
+        PredictionPipelineConfig(
+            input_path=write_artifact(df, "artifacts/raw_data.parquet"),
+            batch_size=300,
+            output_table="predictions",
+            database_url="sqlite:///predictions.db",
+        )
+    )
+
+    result = pipeline.run() if entry == "run" else pipeline.score_frame(df)
+
+    assert result["rows"] == len(df)
+    predictions = read_artifact(pipeline.config.output_path)
+    assert predictions["SalesID"].tolist() == df["SalesID"].tolist()
+    # run() reads the artifact back as float32 features; float32 output
+    np.testing.assert_allclose(predictions["LossProbability"], model.predict_proba(df), atol=1e-5)
+    assert set(predictions["ModelVersion"]) == {model.version}
+
+    engine = DataPersistence(pipeline.config.database_url).engine
+    table = pd.read_sql("SELECT * FROM predictions ORDER BY SalesID", engine)
+    assert table["SalesID"].tolist() == df["SalesID"].tolist()
+    np.testing.assert_allclose(table["LossProbability"], predictions["LossProbability"], rtol=1e-6)
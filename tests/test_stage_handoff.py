@@ -0,0 +1,51 @@
+import os
+
+import pandas as pd
+import pytest
+
+from src.DMARTProject.components import data_ingestion_pipeline
+from src.DMARTProject.components.data_transformation import DataTransformation
+from src.DMARTProject.components.data_validation import DataValidation
+from src.DMARTProject.pipelines.etl_pipeline import ETLPipeline, ETLPipelineConfig
+from src.DMARTProject.utils.artifacts import write_artifact
+
+
+def test_in_memory_handoff_matches_the_artifacts(sales):
+    original = sales.copy()
+    validator = DataValidation()
+    write_artifact(sales, validator.config.raw_data_path)
+
+    validated = validator.validate(sales)
+    assert not os.path.exists(validator.config.validated_data_path)
+    pd.testing.assert_frame_equal(DataValidation().validate(checkpoint=True), validated)
+    assert os.path.exists(validator.config.validated_data_path)
+
+    transformation = DataTransformation()
+    transformed = transformation.transform(validated)
+    assert not os.path.exists(transformation.config.transformed_data_path)
+    pd.testing.assert_frame_equal(transformation.transform(), transformed)
+
+    # The stages work on shallow copies; the caller's frames are unchanged
+    pd.testing.assert_frame_equal(sales, original)
+    assert validated["Discount"].isna().any()
+
+
+@pytest.mark.parametrize("checkpoint", [False, True])
+def test_etl_run_with_and_without_checkpoints(sales, monkeypatch, checkpoint):
+    class Source:
+        table_name = "sales"
+
+        def load_data(self):
+            return sales
+
+    monkeypatch.setattr(data_ingestion_pipeline, "DataIngestion", Source)
+    pipeline = ETLPipeline(ETLPipelineConfig(checkpoint=checkpoint))
+    persisted = []
+    monkeypatch.setattr(pipeline, "_analysis_branch", lambda *args: None)
+    monkeypatch.setattr(pipeline, "_persistence_branch", persisted.append)
+
+    cleaned = pipeline.run()
+
+    assert persisted[0] is cleaned
+    assert cleaned["SalesID"].tolist() == [1, 2, 3]
+    assert os.path.exists(DataValidation().config.validated_data_path) == checkpoint
@@ -0,0 +1,95 @@
+import gc
+import weakref
+
+import numpy as np
+import pandas as pd
+
+from src.DMARTProject.components import data_ingestion_pipeline
+from src.DMARTProject.components.datapersistence import DataPersistence
+from src.DMARTProject.components.kpi_cube import KPICubeConfig
+from src.DMARTProject.pipelines.etl_pipeline import ETLPipeline, ETLPipelineConfig
+from src.DMARTProject.utils.schema import apply_schema, get_schema
+
+
+def _orders(rows: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame(
+        {
+            "SalesID": np.arange(1, rows + 1),
+            "OrderID": [f"O{i}" for i in range(rows)],
+            "OrderDate": pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 90, rows), unit="D"),
+            "ProductID": rng.integers(1, 20, rows),
+            "CustomerID": rng.integers(1, 50, rows),
+            "RegionID": rng.integers(1, 5, rows),
+            "ShipMode": rng.choice(["Economy", "Priority", "Immediate"], rows),
+            "Quantity": rng.integers(1, 10, rows),
+            "Discount": rng.choice([0.0, 0.1, 0.3, np.nan], rows),
+            "SalesAmount": rng.gamma(2.0, 50.0, rows).round(2),
+            "Profit": rng.normal(5, 20, rows).round(2),
+            "LocationID": rng.integers(100, 110, rows),
+            "FeedbackProvided": rng.random(rows) < 0.5,
+        }
+    )
+
+
+def _source(df: pd.DataFrame, streamed: list):
+    class Source:
+        table_name = "sales"
+
+        def load_data(self):
+            return apply_schema(df.copy(), get_schema())
+
+        def stream_data(self, chunksize=None):
+            for start in range(0, len(df), chunksize):
+                chunk = apply_schema(df.iloc[start : start + chunksize].copy(), get_schema())
+                streamed.append(weakref.ref(chunk))
+                yield chunk
+
+    return Source
+
+
+def _config(database_url: str, **overrides) -> ETLPipelineConfig:
+    return ETLPipelineConfig(database_url=database_url, kpi_cube=KPICubeConfig(table_name=None), **overrides)
+
+
+def _table(database_url: str) -> pd.DataFrame:
+    engine = DataPersistence(database_url).engine
+    return pd.read_sql("SELECT * FROM DMART_Cleaned ORDER BY SalesID", engine)
+
+
+def test_streaming_holds_one_chunk_at_a_time(monkeypatch):
+    streamed, live = [], []
+    monkeypatch.setattr(data_ingestion_pipeline, "DataIngestion", _source(_orders(3000), streamed))
+    monkeypatch.setattr(DataPersistence, "call_stored_procedure", lambda self, sp_name: None)
+    load = DataPersistence._load
+
+    def counting_load(self, chunk, *args, **kwargs):
+        gc.collect()
+        live.append(sum(ref() is not None for ref in streamed))
+        assert len(chunk) <= 250
+        return load(self, chunk, *args, **kwargs)
+
+    monkeypatch.setattr(DataPersistence, "_load", counting_load)
+
+    rows = ETLPipeline(_config("sqlite:///stream.db", streaming_chunksize=250)).run_streaming()
+
+    assert rows == 3000
+    assert len(streamed) == len(live) == 12
+    # The chunk being written, nothing accumulated from earlier ones
+    assert max(live) == 1
+
+
+def test_streaming_matches_a_single_pass(monkeypatch):
+    df = _orders(2000)
+    # Copies of early rows in later chunks, dropped with deduplicate=True
+    df = pd.concat([df, df.iloc[[3, 500, 1500]]], ignore_index=True)
+    monkeypatch.setattr(data_ingestion_pipeline, "DataIngestion", _source(df, []))
+    monkeypatch.setattr(DataPersistence, "call_stored_procedure", lambda self, sp_name: None)
+
+    pipeline = ETLPipeline(_config("sqlite:///batch.db", deduplicate=True))
+    monkeypatch.setattr(pipeline, "_analysis_branch", lambda *args: None)
+    pipeline.run()
+    streamed = ETLPipeline(_config("sqlite:///stream.db", deduplicate=True, streaming_chunksize=300)).run_streaming()
+
+    assert streamed == 2000
+    pd.testing.assert_frame_equal(_table("sqlite:///stream.db"), _table("sqlite:///batch.db"))
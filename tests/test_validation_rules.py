@@ -0,0 +1,105 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.DMARTProject.components.data_validation import DataValidation, DataValidationConfig
+from src.DMARTProject.components.validation_rules import RuleEngine
+from src.DMARTProject.utils.schema import get_schema
+
+
+def _sequential_checks(df: pd.DataFrame):
+    """
+    The checks DataValidation ran one after another before the rule engine;
+    raises on the first failure.
+    """
+    expected_columns = set(get_schema("sales").column_names)
+    if expected_columns - set(df.columns):
+        raise ValueError("Missing columns")
+    if set(df.columns) - expected_columns:
+        raise ValueError("Unexpected columns")
+
+    allowed_nulls = {"Discount", "Profit"}
+    if any(count > 0 and col not in allowed_nulls for col, count in df.isna().sum().items()):
+        raise ValueError("Unexpected nulls found")
+
+    pd.to_datetime(df["OrderDate"], errors="raise")
+    for col in ["Quantity", "Discount", "SalesAmount", "Profit"]:
+        if not pd.api.types.is_numeric_dtype(df[col]):
+            raise TypeError(f"{col} must be numeric")
+    if not pd.api.types.is_bool_dtype(df["FeedbackProvided"]):
+        raise TypeError("FeedbackProvided must be boolean")
+
+    if (df["Quantity"] <= 0).any():
+        raise ValueError("Quantity must be greater than 0")
+    if not ((df["Discount"].dropna() >= 0) & (df["Discount"].dropna() <= 1)).all():
+        raise ValueError("Discount must be between 0 and 1")
+    if (df["SalesAmount"] <= 0).any():
+        raise ValueError("SalesAmount must be greater than 0")
+
+
+def _sequential_passes(df: pd.DataFrame) -> bool:
+    try:
+        _sequential_checks(df.copy())
+        return True
+    except (ValueError, TypeError):
+        return False
+
+
+def _with(df: pd.DataFrame, column: str, row: int, value) -> pd.DataFrame:
+    # A null turns SQL integers into floats and booleans into objects
+    values = df[column].astype("float64" if pd.api.types.is_integer_dtype(df[column]) else object)
+    values.iloc[row] = value
+    return df.assign(**{column: values})
+
+
+VIOLATIONS = {
+    "clean": (lambda df: df, None),
+    "negative profit": (lambda df: df.assign(Profit=[-5.0, -2.0, None]), None),
+    "missing column": (lambda df: df.drop(columns="LocationID"), "error"),
+    "extra column": (lambda df: df.assign(Extra=1), "error"),
+    "null key": (lambda df: _with(df, "SalesID", 1, None), "SalesID:not_null"),
+    "null boolean": (lambda df: _with(df, "FeedbackProvided", 1, None), "FeedbackProvided:not_null"),
+    "bad date": (lambda df: df.assign(OrderDate=["2024-01-01", "not a date", "2024-02-01"]), "OrderDate:dtype"),
+    "text quantity": (lambda df: df.assign(Quantity=["1", "2", "3"]), "error"),
+    "text boolean": (lambda df: df.assign(FeedbackProvided=["yes", "no", "yes"]), "error"),
+    "zero quantity": (lambda df: df.assign(Quantity=[1, 0, 3]), "Quantity:range"),
+    "discount above 1": (lambda df: df.assign(Discount=[0.1, 1.5, None]), "Discount:range"),
+    "negative discount": (lambda df: df.assign(Discount=[-0.1, None, 0.0]), "Discount:range"),
+    "zero sales": (lambda df: df.assign(SalesAmount=[10.0, 0.0, 30.0]), "SalesAmount:range"),
+}
+
+
+@pytest.mark.parametrize("case", list(VIOLATIONS))
+def test_engine_agrees_with_the_sequential_checks(sales, case):
+    make, expected = VIOLATIONS[case]
+    df = make(sales)
+
+    report = RuleEngine.from_schema(get_schema("sales")).evaluate(df.copy())
+
+    assert report.passed == _sequential_passes(df)
+    if expected == "error":
+        assert report.errors
+    elif expected is not None:
+        assert not report.errors
+        assert {name for name, count in report.violations.items() if count} == {expected}
+        assert report.invalid_rows == 1
+
+
+def test_domain_rule_is_row_level(sales):
+    df = sales.assign(ShipMode=["Economy", "Teleport", "Priority"])
+    report = RuleEngine.from_schema(get_schema("sales")).evaluate(df)
+    assert not report.errors
+    assert report.violations["ShipMode:domain"] == 1
+
+
+def test_null_boolean_is_quarantined(sales):
+    df = _with(sales, "FeedbackProvided", 1, None)
+    validator = DataValidation(DataValidationConfig(on_error="quarantine"))
+
+    validated = validator.validate_frame(df)
+
+    assert validated["SalesID"].tolist() == [1, 3]
+    assert validated["FeedbackProvided"].dtype == np.dtype(bool)
+    assert validator.quarantined["SalesID"].tolist() == [2]
+    with pytest.raises(ValueError, match="Unexpected nulls in FeedbackProvided"):
+        DataValidation().validate_frame(_with(sales, "FeedbackProvided", 1, None))
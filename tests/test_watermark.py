@@ -0,0 +1,30 @@
+from datetime import date
+
+import pandas as pd
+
+from src.DMARTProject.components.data_ingestion import DataIngestion
+from src.DMARTProject.utils.watermark import WatermarkConfig, WatermarkStore
+
+
+def test_watermark_advances_and_never_moves_back(sales):
+    store = WatermarkStore(WatermarkConfig(watermark_path="artifacts/watermarks.json"))
+    assert store.get("sales") is None
+
+    assert store.update("sales", sales) == {"SalesID": 3, "OrderDate": "2024-02-01"}
+    # An older delta (or an empty one) keeps the stored high-water mark
+    assert store.update("sales", sales.iloc[:1]) == {"SalesID": 3, "OrderDate": "2024-02-01"}
+    assert store.update("sales", sales.iloc[:0]) == {"SalesID": 3, "OrderDate": "2024-02-01"}
+
+    newer = sales.iloc[[0]].assign(SalesID=10, OrderDate=pd.Timestamp("2024-03-05"))
+    store.update("sales", newer)
+    store.update("returns", sales.iloc[:1])
+    # Persisted per table
+    reopened = WatermarkStore(WatermarkConfig(watermark_path="artifacts/watermarks.json"))
+    assert reopened.get("sales") == {"SalesID": 10, "OrderDate": "2024-03-05"}
+    assert reopened.get("returns") == {"SalesID": 1, "OrderDate": "2024-01-01"}
+
+
+def test_watermark_filter_rereads_the_last_day():
+    where, params = DataIngestion._watermark_filter({"SalesID": 10, "OrderDate": "2024-03-05"})
+    assert where == "SalesID > :last_sales_id OR OrderDate >= :last_order_date"
+    assert params == {"last_sales_id": 10, "last_order_date": date(2024, 3, 5)}